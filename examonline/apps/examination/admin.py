@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import ExaminationInfo, ExamPaperInfo, ExamStudentsInfo
+from .models import ExaminationInfo, ExamPaperInfo, ExamStatistics, ExamStudentsInfo, GradingJob, ItemAnalysis
 
 
 # admin-시험정보 등록
@@ -51,3 +51,56 @@ class ExamStudentsInfoAdmin(admin.ModelAdmin):
     search_fields = ('exam',)
     # 페이지
     list_per_page = 20
+
+
+# admin-채점 작업 등록
+@admin.register(GradingJob)
+class GradingJobAdmin(admin.ModelAdmin):
+    # admin 헤더
+    list_display = (
+        'test_score',
+        'status',
+        'attempts',
+        'create_time',
+        'started_time',
+        'finished_time',
+    )
+    # 필터
+    list_filter = ('status',)
+    # 페이지
+    list_per_page = 20
+
+
+# admin-시험 성적 통계 등록
+@admin.register(ExamStatistics)
+class ExamStatisticsAdmin(admin.ModelAdmin):
+    # admin 헤더
+    list_display = (
+        'exam',
+        'paper',
+        'submitted_count',
+        'score_sum',
+        'pass_count',
+        'highest_score',
+        'lowest_score',
+        'edit_time',
+    )
+    # 페이지
+    list_per_page = 20
+
+
+# admin-문항 분석 등록
+@admin.register(ItemAnalysis)
+class ItemAnalysisAdmin(admin.ModelAdmin):
+    # admin 헤더
+    list_display = (
+        'exam',
+        'status',
+        'request_time',
+        'started_time',
+        'finished_time',
+    )
+    # 필터
+    list_filter = ('status',)
+    # 페이지
+    list_per_page = 20
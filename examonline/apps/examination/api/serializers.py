@@ -6,6 +6,7 @@ from django.utils import timezone
 from rest_framework import serializers
 
 from examination.models import ExaminationInfo, ExamPaperInfo, ExamStudentsInfo
+from testpaper.grading import FILL_IN_TYPES
 from testpaper.models import TestPaperInfo
 from user.models import StudentsInfo, SubjectInfo
 
@@ -119,6 +120,7 @@ class ExaminationDetailSerializer(serializers.ModelSerializer):
             'exam_state_display',
             'exam_type',
             'exam_type_display',
+            'shuffle_questions',
             'create_user_name',
             'create_time',
             'papers',
@@ -159,6 +161,7 @@ class ExaminationCreateSerializer(serializers.ModelSerializer):
             'start_time',
             'duration',
             'exam_type',
+            'shuffle_questions',
             'papers',
             'student_num',
             'exam_state',
@@ -221,7 +224,7 @@ class ExaminationUpdateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ExaminationInfo
-        fields = ['name', 'subject_id', 'start_time', 'duration', 'exam_type']
+        fields = ['name', 'subject_id', 'start_time', 'duration', 'exam_type', 'shuffle_questions']
 
     def validate(self, attrs):
         """비즈니스 로직 검증"""
@@ -300,7 +303,7 @@ class EnrolledStudentSerializer(serializers.ModelSerializer):
 # ==================== 시험 응시 관련 Serializers ====================
 
 from testpaper.models import TestScores, TestPaperTestQ
-from testquestion.models import TestQuestionInfo, OptionInfo
+from testquestion.models import OptionInfo
 
 
 class QuestionOptionSerializer(serializers.ModelSerializer):
@@ -314,17 +317,23 @@ class QuestionOptionSerializer(serializers.ModelSerializer):
 class ExamQuestionSerializer(serializers.ModelSerializer):
     """
     시험 문제 Serializer (학생용).
+    시험지-문제(TestPaperTestQ) 행을 직렬화하여 배점/순서를 추가 쿼리 없이 포함.
     정답 정보 제외.
     """
 
-    options = QuestionOptionSerializer(many=True, read_only=True, source='optioninfo_set')
     paper_question_id = serializers.IntegerField(source='id', read_only=True)
-    assigned_score = serializers.SerializerMethodField()
-    tq_type_display = serializers.CharField(source='get_tq_type_display', read_only=True)
-    tq_degree_display = serializers.CharField(source='get_tq_degree_display', read_only=True)
+    id = serializers.IntegerField(source='test_question.id', read_only=True)
+    name = serializers.CharField(source='test_question.name', read_only=True)
+    tq_type = serializers.CharField(source='test_question.tq_type', read_only=True)
+    tq_type_display = serializers.CharField(source='test_question.get_tq_type_display', read_only=True)
+    tq_degree = serializers.CharField(source='test_question.tq_degree', read_only=True)
+    tq_degree_display = serializers.CharField(source='test_question.get_tq_degree_display', read_only=True)
+    image = serializers.ImageField(source='test_question.image', read_only=True)
+    options = serializers.SerializerMethodField()
+    assigned_score = serializers.IntegerField(source='score', read_only=True)
 
     class Meta:
-        model = TestQuestionInfo
+        model = TestPaperTestQ
         fields = [
             'paper_question_id',
             'id',
@@ -336,18 +345,14 @@ class ExamQuestionSerializer(serializers.ModelSerializer):
             'image',
             'options',
             'assigned_score',
+            'order',
         ]
 
-    def get_assigned_score(self, obj):
-        """이 시험지에서의 배점"""
-        paper_id = self.context.get('paper_id')
-        if paper_id:
-            try:
-                pq = TestPaperTestQ.objects.get(test_paper_id=paper_id, test_question=obj)
-                return pq.score
-            except TestPaperTestQ.DoesNotExist:
-                return 0
-        return 0
+    def get_options(self, obj):
+        """선택지 (빈칸 채우기 문제의 옵션은 허용 정답이므로 제외)"""
+        if obj.test_question.tq_type in FILL_IN_TYPES:
+            return []
+        return QuestionOptionSerializer(obj.test_question.optioninfo_set.all(), many=True).data
 
 
 class ExamInfoSerializer(serializers.Serializer):
@@ -373,7 +378,7 @@ class AnswerItemSerializer(serializers.Serializer):
     """개별 답안 Serializer"""
 
     question_id = serializers.IntegerField(help_text='문제 ID')
-    answer = serializers.CharField(allow_blank=True, required=False, help_text='답안 (객관식: 옵션 ID, 주관식: 텍스트)')
+    answer = serializers.CharField(allow_blank=True, required=False, help_text='답안 (객관식: 옵션 ID, 복수 정답은 쉼표로 구분 / 빈칸 채우기: 텍스트)')
 
 
 class AnswerSubmissionSerializer(serializers.Serializer):
@@ -403,6 +408,9 @@ class ExamStatusSerializer(serializers.Serializer):
     submit_time = serializers.DateTimeField(allow_null=True)
     time_remaining = serializers.IntegerField(allow_null=True, help_text='남은 시간 (분)')
     draft_answers = serializers.JSONField(allow_null=True)
+    grading_status = serializers.ChoiceField(
+        choices=['grading', 'graded'], allow_null=True, help_text='채점 상태 (제출 전이면 null)'
+    )
     score = serializers.IntegerField(allow_null=True)
 
 
@@ -418,3 +426,19 @@ class SaveDraftSerializer(serializers.Serializer):
         if not isinstance(value, dict):
             raise serializers.ValidationError('answers는 객체(object) 형식이어야 합니다.')
         return value
+
+
+class DraftPatchSerializer(serializers.Serializer):
+    """
+    답안 부분 임시 저장용 Serializer.
+    변경된 문제의 답안만 전송하며 seq는 client에서 단조 증가시키는 순번.
+    """
+
+    answers = serializers.JSONField(help_text='변경된 문제의 답안 ({문제 ID: 답안})')
+    seq = serializers.IntegerField(min_value=1, help_text='client 순번 (이전 값보다 커야 반영)')
+
+    def validate_answers(self, value):
+        """답안 형식 검증"""
+        if not isinstance(value, dict) or not value:
+            raise serializers.ValidationError('answers는 비어 있지 않은 객체(object) 형식이어야 합니다.')
+        return value
@@ -9,16 +9,38 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from examination.models import ExaminationInfo, ExamPaperInfo, ExamStudentsInfo
-from testpaper.models import TestScores, TestPaperTestQ
-from testquestion.models import TestQuestionInfo, OptionInfo
+from core.api.idempotency import idempotent
+from core.api.responses import raw_json_response
+from examination.deadlines import auto_submit, submit_deadline
+from examination.drafts import (
+    buffer_draft,
+    current_draft_seq,
+    discard_draft,
+    get_buffered_draft,
+    is_write_behind,
+    patch_draft,
+)
+from examination.eligibility import is_enrolled
+from examination.models import ExaminationInfo
+from examination.payload import get_questions_payload, questions_version
+from examination.provisioning import assign_paper, ensure_attempt, start_attempt
+from examination.shuffle import exam_seed
+from examination.submissions import (
+    GRADED,
+    GRADING,
+    enqueue_submission,
+    grade_submission,
+    grading_status,
+    is_async_submit,
+)
+from testpaper.models import TestPaperInfo, TestScores
 
 from .serializers import (
     ExamInfoSerializer,
     AnswerSubmissionSerializer,
     ExamStatusSerializer,
     SaveDraftSerializer,
-    ExamQuestionSerializer,
+    DraftPatchSerializer,
 )
 
 
@@ -38,11 +60,66 @@ class ExamTakingViewSet(viewsets.ViewSet):
         except Exception:
             return None
 
+    def get_questions(self, exam, paper_id, student_info):
+        """
+        문제 목록 (payload 식별 문자열, JSON bytes 생성 함수).
+        무작위 배치 시험은 학생별 순서. 304 응답이면 bytes를 만들지 않음.
+        """
+        shuffle_seed = exam_seed(exam.id, student_info.id) if exam.shuffle_questions else None
+        return (
+            questions_version(exam.id, paper_id, shuffle_seed),
+            lambda: get_questions_payload(exam.id, paper_id, shuffle_seed),
+        )
+
+    def get_attempt_state(self, exam, test_score):
+        """응시 상태 (status/session 공통)"""
+        if not test_score:
+            return {
+                'is_started': False,
+                'is_submitted': False,
+                'start_time': None,
+                'submit_time': None,
+                'time_remaining': None,
+                'draft_answers': None,
+                'grading_status': None,
+                'score': None,
+            }
+
+        time_remaining = None
+        draft_answers = None
+        if test_score.start_time and not test_score.is_submitted:
+            now = timezone.now()
+            remaining_seconds = (exam.end_time - now).total_seconds()
+            time_remaining = max(0, int(remaining_seconds / 60))
+
+        if not test_score.is_submitted:
+            # write-behind 모드에서는 버퍼의 최신 임시 답안 우선
+            if is_write_behind():
+                draft_answers = get_buffered_draft(test_score.id)
+            if draft_answers is None:
+                draft_answers = test_score.detail_records
+
+        # 채점 전에는 점수 미공개
+        current_grading_status = grading_status(test_score)
+        return {
+            'is_started': test_score.start_time is not None,
+            'is_submitted': test_score.is_submitted,
+            'start_time': test_score.start_time,
+            'submit_time': test_score.submit_time,
+            'time_remaining': time_remaining,
+            'draft_answers': draft_answers,
+            'grading_status': current_grading_status,
+            'score': test_score.test_score if current_grading_status == GRADED else None,
+        }
+
     @action(detail=True, methods=['get'], url_path='info')
     def exam_info(self, request, pk=None):
         """
         시험 정보 및 문제 조회.
         GET /api/v1/taking/{exam_id}/info/
+
+        문제 목록은 시험지 버전별로 미리 렌더링된 payload 사용.
+        If-None-Match가 ETag와 일치하면 304 응답.
         """
         student_info = self.get_student_info(request.user)
         if not student_info:
@@ -54,26 +131,21 @@ class ExamTakingViewSet(viewsets.ViewSet):
             return Response({'detail': '시험을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
 
         # 응시 자격 확인
-        if not ExamStudentsInfo.objects.filter(exam=exam, student=student_info).exists():
+        if not is_enrolled(exam.id, student_info.id):
             return Response({'detail': '이 시험에 등록되지 않았습니다.'}, status=status.HTTP_403_FORBIDDEN)
 
-        # 시험지 조회
-        exam_papers = ExamPaperInfo.objects.filter(exam=exam).select_related('paper')
-        if not exam_papers.exists():
-            return Response({'detail': '시험지가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        # 첫 번째 시험지 사용 (추후 다중 시험지 지원 가능)
-        paper = exam_papers.first().paper
-
-        # 문제 조회
-        paper_questions = TestPaperTestQ.objects.filter(test_paper=paper).select_related(
-            'test_question'
-        ).prefetch_related('test_question__optioninfo_set').order_by('order')
+        # 응시 상태 확인
+        test_score = TestScores.objects.filter(exam=exam, user=student_info).select_related('test_paper').first()
 
-        questions = [pq.test_question for pq in paper_questions]
+        # 시험지 조회 (응시 기록에 기록된 시험지, 없으면 배정될 시험지)
+        if test_score and test_score.test_paper:
+            paper = test_score.test_paper
+        else:
+            paper_id = assign_paper(exam.id, student_info.id)
+            paper = TestPaperInfo.objects.filter(id=paper_id).first() if paper_id else None
+        if not paper:
+            return Response({'detail': '시험지가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 응시 상태 확인
-        test_score = TestScores.objects.filter(exam=exam, user=student_info).first()
         is_started = test_score is not None and test_score.start_time is not None
         is_submitted = test_score is not None and test_score.is_submitted
 
@@ -90,20 +162,21 @@ class ExamTakingViewSet(viewsets.ViewSet):
             'total_score': paper.total_score,
             'passing_score': paper.passing_score,
             'question_count': paper.question_count,
-            'questions': ExamQuestionSerializer(
-                questions, many=True, context={'paper_id': paper.id}
-            ).data,
             'is_started': is_started,
             'is_submitted': is_submitted,
         }
 
-        return Response(data, status=status.HTTP_200_OK)
+        # 문제 목록은 캐시된 JSON bytes를 그대로 결합 (ETag/If-None-Match 지원)
+        version, questions = self.get_questions(exam, paper.id, student_info)
+        return raw_json_response(request, data, {'questions': questions}, raw_version=version)
 
     @action(detail=True, methods=['post'])
     def start(self, request, pk=None):
         """
         시험 시작.
         POST /api/v1/taking/{exam_id}/start/
+
+        응시 기록이 미리 생성(arm_exams)되어 있으면 조건부 UPDATE 한 번으로 시작 처리.
         """
         student_info = self.get_student_info(request.user)
         if not student_info:
@@ -114,10 +187,6 @@ class ExamTakingViewSet(viewsets.ViewSet):
         except ExaminationInfo.DoesNotExist:
             return Response({'detail': '시험을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
 
-        # 응시 자격 확인
-        if not ExamStudentsInfo.objects.filter(exam=exam, student=student_info).exists():
-            return Response({'detail': '이 시험에 등록되지 않았습니다.'}, status=status.HTTP_403_FORBIDDEN)
-
         # 시험 시간 확인
         now = timezone.now()
         if now < exam.start_time:
@@ -126,6 +195,17 @@ class ExamTakingViewSet(viewsets.ViewSet):
         if now > exam.end_time:
             return Response({'detail': '시험 종료 시간이 지났습니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
+        # 미리 생성된 응시 기록 (등록 학생에게만 생성되므로 응시 자격 확인 불필요)
+        if start_attempt(exam, student_info, now):
+            return Response(
+                {'detail': '시험이 시작되었습니다.', 'start_time': now, 'end_time': exam.end_time},
+                status=status.HTTP_200_OK,
+            )
+
+        # 응시 자격 확인
+        if not is_enrolled(exam.id, student_info.id):
+            return Response({'detail': '이 시험에 등록되지 않았습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
         # 이미 시작한 경우
         existing_score = TestScores.objects.filter(exam=exam, user=student_info).first()
         if existing_score and existing_score.start_time:
@@ -139,41 +219,44 @@ class ExamTakingViewSet(viewsets.ViewSet):
                 status=status.HTTP_200_OK,
             )
 
-        # 시험지 조회
-        exam_paper = ExamPaperInfo.objects.filter(exam=exam).first()
-        if not exam_paper:
-            return Response({'detail': '시험지가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not existing_score:
+            # 시험지 배정
+            paper_id = assign_paper(exam.id, student_info.id)
+            if not paper_id:
+                return Response({'detail': '시험지가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 시험 시작 기록
-        with transaction.atomic():
-            if existing_score:
-                existing_score.start_time = now
-                existing_score.save()
-                test_score = existing_score
-            else:
-                test_score = TestScores.objects.create(
-                    exam=exam,
-                    user=student_info,
-                    test_paper=exam_paper.paper,
-                    start_time=now,
-                    test_score=0,
-                    detail_records={},
-                )
+            # 응시 기록 생성 (동시 요청이 와도 unique 제약으로 하나만 생성)
+            ensure_attempt(exam, student_info, paper_id)
+
+        # 시험 시작 기록 (동시 요청 중 하나만 성공)
+        if not start_attempt(exam, student_info, now):
+            existing_score = TestScores.objects.get(exam=exam, user=student_info)
+            return Response(
+                {
+                    'detail': '이미 시작한 시험입니다.',
+                    'start_time': existing_score.start_time,
+                },
+                status=status.HTTP_200_OK,
+            )
 
         return Response(
             {
                 'detail': '시험이 시작되었습니다.',
-                'start_time': test_score.start_time,
+                'start_time': now,
                 'end_time': exam.end_time,
             },
             status=status.HTTP_200_OK,
         )
 
     @action(detail=True, methods=['post'])
+    @idempotent('submit')
     def submit(self, request, pk=None):
         """
         답안 제출 및 자동 채점.
         POST /api/v1/taking/{exam_id}/submit/
+
+        비동기 제출 모드에서는 답안만 접수하고 202 응답 (채점 결과는 status로 확인).
+        Idempotency-Key 헤더로 재시도하면 재채점 없이 처음 응답 반환.
         """
         student_info = self.get_student_info(request.user)
         if not student_info:
@@ -189,76 +272,64 @@ class ExamTakingViewSet(viewsets.ViewSet):
 
         answers = serializer.validated_data['answers']
 
-        # 시험 기록 조회
-        test_score = TestScores.objects.filter(exam=exam, user=student_info).first()
-        if not test_score or not test_score.start_time:
-            return Response({'detail': '시험을 시작하지 않았습니다.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        if test_score.is_submitted:
-            return Response({'detail': '이미 제출한 시험입니다.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        # 제한 시간 확인
+        # 제출 마감(종료 시간 + 유예 시간) 이후 도착한 답안은 받지 않고
+        # sweep_exam_deadlines 명령과 같이 임시 답안으로 제출 처리 (마감 처리 실행 시점과 무관)
         now = timezone.now()
-        if now > exam.end_time:
-            # 자동 제출 처리
-            pass
-
-        # 자동 채점
-        total_score = 0
-        detailed_records = {}
-
-        for answer_item in answers:
-            question_id = answer_item['question_id']
-            user_answer = answer_item.get('answer', '')
-
-            try:
-                question = TestQuestionInfo.objects.get(id=question_id)
-                paper_question = TestPaperTestQ.objects.get(
-                    test_paper=test_score.test_paper, test_question=question
-                )
-                question_score = paper_question.score
-
-                # 채점
-                is_correct = False
-                if question.tq_type in ['xz', 'pd']:  # 객관식, OX
-                    try:
-                        correct_option = OptionInfo.objects.get(test_question=question, is_right=True)
-                        is_correct = str(user_answer) == str(correct_option.id)
-                    except OptionInfo.DoesNotExist:
-                        is_correct = False
-
-                earned_score = question_score if is_correct else 0
-                total_score += earned_score
-
-                detailed_records[str(question_id)] = {
-                    'answer': user_answer,
-                    'is_correct': is_correct,
-                    'score': earned_score,
-                    'max_score': question_score,
-                }
-
-            except (TestQuestionInfo.DoesNotExist, TestPaperTestQ.DoesNotExist):
-                continue
-
-        # 소요 시간 계산
-        time_used = int((now - test_score.start_time).total_seconds() / 60)
-
-        # 제출 기록
+        if now > submit_deadline(exam):
+            detail = '시험 종료 시간이 지났습니다.'
+            attempt_id = (
+                TestScores.objects.filter(exam=exam, user=student_info, start_time__isnull=False, is_submitted=False)
+                .values_list('id', flat=True)
+                .first()
+            )
+            if attempt_id and auto_submit([attempt_id]):
+                detail += ' 임시 저장된 답안으로 제출되었습니다.'
+            return Response({'detail': detail}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 응시 기록 행 잠금: 동시 제출은 직렬화되어 뒤의 요청은 '이미 제출' 응답
         with transaction.atomic():
-            test_score.test_score = total_score
-            test_score.detail_records = detailed_records
-            test_score.submit_time = now
-            test_score.is_submitted = True
-            test_score.time_used = time_used
-            test_score.save()
+            test_score = (
+                TestScores.objects.select_for_update(of=('self',))
+                .filter(exam=exam, user=student_info)
+                .select_related('test_paper')
+                .first()
+            )
+            if not test_score or not test_score.start_time:
+                return Response({'detail': '시험을 시작하지 않았습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+            if test_score.is_submitted:
+                return Response({'detail': '이미 제출한 시험입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+            if is_async_submit():
+                # 비동기 모드: 답안만 접수 (채점은 worker)
+                job = enqueue_submission(test_score, answers, now)
+            else:
+                # 자동 채점 (캐시된 정답표로 메모리에서 채점)
+                grade_submission(test_score, answers, now)
+
+        if is_write_behind():
+            discard_draft(test_score.id)
 
+        if is_async_submit():
+            return Response(
+                {
+                    'detail': '답안이 접수되었습니다.',
+                    'receipt_id': job.id,
+                    'grading_status': GRADING,
+                    'submit_time': test_score.submit_time,
+                    'time_used': test_score.time_used,
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        total_score = test_score.test_score
         return Response(
             {
                 'detail': '답안이 제출되었습니다.',
                 'score': total_score,
                 'total_possible': test_score.test_paper.total_score,
                 'passed': total_score >= test_score.test_paper.passing_score,
-                'time_used': time_used,
+                'time_used': test_score.time_used,
             },
             status=status.HTTP_200_OK,
         )
@@ -280,40 +351,11 @@ class ExamTakingViewSet(viewsets.ViewSet):
 
         test_score = TestScores.objects.filter(exam=exam, user=student_info).first()
 
-        if not test_score:
-            data = {
-                'exam_id': exam.id,
-                'exam_name': exam.name,
-                'is_started': False,
-                'is_submitted': False,
-                'start_time': None,
-                'submit_time': None,
-                'time_remaining': None,
-                'draft_answers': None,
-                'score': None,
-            }
-        else:
-            time_remaining = None
-            if test_score.start_time and not test_score.is_submitted:
-                now = timezone.now()
-                remaining_seconds = (exam.end_time - now).total_seconds()
-                time_remaining = max(0, int(remaining_seconds / 60))
-
-            data = {
-                'exam_id': exam.id,
-                'exam_name': exam.name,
-                'is_started': test_score.start_time is not None,
-                'is_submitted': test_score.is_submitted,
-                'start_time': test_score.start_time,
-                'submit_time': test_score.submit_time,
-                'time_remaining': time_remaining,
-                'draft_answers': test_score.detail_records if not test_score.is_submitted else None,
-                'score': test_score.test_score if test_score.is_submitted else None,
-            }
-
+        data = {'exam_id': exam.id, 'exam_name': exam.name, **self.get_attempt_state(exam, test_score)}
         return Response(data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=['post'], url_path='save-draft')
+    @idempotent('save_draft')
     def save_draft(self, request, pk=None):
         """
         답안 임시 저장.
@@ -338,10 +380,126 @@ class ExamTakingViewSet(viewsets.ViewSet):
         if test_score.is_submitted:
             return Response({'detail': '이미 제출한 시험입니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 임시 저장
-        test_score.detail_records = serializer.validated_data['answers']
-        test_score.save()
+        # 임시 저장 (write-behind 모드에서는 버퍼에만 저장)
+        if is_write_behind():
+            buffer_draft(test_score, serializer.validated_data['answers'])
+        elif not TestScores.objects.filter(id=test_score.id, is_submitted=False).update(
+            detail_records=serializer.validated_data['answers']
+        ):
+            # 확인 후 제출이 먼저 반영된 경우 (채점 결과를 임시 답안으로 덮어쓰지 않음)
+            return Response({'detail': '이미 제출한 시험입니다.'}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(
             {'detail': '임시 저장되었습니다.', 'saved_at': timezone.now()}, status=status.HTTP_200_OK
         )
+
+    @save_draft.mapping.patch
+    @idempotent('patch_draft')
+    def patch_draft(self, request, pk=None):
+        """
+        답안 부분 임시 저장 (변경된 문제만).
+        PATCH /api/v1/taking/{exam_id}/save-draft/
+
+        Request Body:
+        {
+            "answers": {"<question_id>": {...}},
+            "seq": 12
+        }
+        seq가 마지막으로 반영된 순번 이하이면 409 응답.
+        """
+        student_info = self.get_student_info(request.user)
+        if not student_info:
+            return Response({'detail': '학생 정보를 찾을 수 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            exam = ExaminationInfo.objects.get(id=pk)
+        except ExaminationInfo.DoesNotExist:
+            return Response({'detail': '시험을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = DraftPatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        test_score = TestScores.objects.filter(exam=exam, user=student_info).first()
+        if not test_score or not test_score.start_time:
+            return Response({'detail': '시험을 시작하지 않았습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        if test_score.is_submitted:
+            return Response({'detail': '이미 제출한 시험입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        seq = serializer.validated_data['seq']
+        if not patch_draft(test_score, serializer.validated_data['answers'], seq):
+            return Response(
+                {'detail': '이미 반영되었거나 오래된 변경입니다.', 'current_seq': current_draft_seq(test_score)},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(
+            {'detail': '임시 저장되었습니다.', 'seq': seq, 'saved_at': timezone.now()}, status=status.HTTP_200_OK
+        )
+
+    @action(detail=True, methods=['post'])
+    def session(self, request, pk=None):
+        """
+        시험 응시 세션 (info + start + status 통합).
+        POST /api/v1/taking/{exam_id}/session/
+
+        시작하지 않았으면 시험을 시작하고, 시험 정보/응시 상태/임시 답안/문제 목록을 한 번에 반환.
+        응시 기록이 있으면 등록 학생이므로 응시 자격 조회 생략.
+        start_time은 응시 시작 시간, exam_start_time은 시험 시작 시간.
+        """
+        student_info = self.get_student_info(request.user)
+        if not student_info:
+            return Response({'detail': '학생 정보를 찾을 수 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            exam = ExaminationInfo.objects.select_related('subject').get(id=pk)
+        except ExaminationInfo.DoesNotExist:
+            return Response({'detail': '시험을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        now = timezone.now()
+        if now < exam.start_time:
+            return Response({'detail': '아직 시험 시작 시간이 아닙니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        attempts = TestScores.objects.filter(exam=exam, user=student_info).select_related('test_paper')
+        test_score = attempts.first()
+
+        if not test_score:
+            if not is_enrolled(exam.id, student_info.id):
+                return Response({'detail': '이 시험에 등록되지 않았습니다.'}, status=status.HTTP_403_FORBIDDEN)
+            if now > exam.end_time:
+                return Response({'detail': '시험 종료 시간이 지났습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+            paper_id = assign_paper(exam.id, student_info.id)
+            if not paper_id:
+                return Response({'detail': '시험지가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+            ensure_attempt(exam, student_info, paper_id)
+            test_score = attempts.first()
+
+        if not test_score.start_time:
+            if now > exam.end_time:
+                return Response({'detail': '시험 종료 시간이 지났습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+            # 동시 요청 중 하나만 시작 처리, 나머지는 먼저 기록된 시작 시간 사용
+            if start_attempt(exam, student_info, now):
+                test_score.start_time = now
+            else:
+                test_score = attempts.first()
+
+        paper = test_score.test_paper
+        if not paper:
+            return Response({'detail': '시험지가 없습니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = {
+            'exam_id': exam.id,
+            'exam_name': exam.name,
+            'subject_name': exam.subject.subject_name,
+            'exam_start_time': exam.start_time,
+            'end_time': exam.end_time,
+            'duration': int((exam.end_time - exam.start_time).total_seconds() / 60),
+            'total_score': paper.total_score,
+            'passing_score': paper.passing_score,
+            'question_count': paper.question_count,
+            **self.get_attempt_state(exam, test_score),
+        }
+
+        version, questions = self.get_questions(exam, paper.id, student_info)
+        return raw_json_response(request, data, {'questions': questions}, raw_version=version)
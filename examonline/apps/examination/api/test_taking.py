@@ -2,12 +2,26 @@
 Exam Taking API Tests.
 시험 응시 관련 API 테스트.
 """
+import uuid
+from io import StringIO
+
 import pytest
 from django.utils import timezone
 from datetime import timedelta
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
-from examination.models import ExaminationInfo, ExamPaperInfo, ExamStudentsInfo
+from examination.api import taking_views
+from examination.drafts import buffer_draft, discard_draft, flush_drafts, get_buffered_draft
+from examination.eligibility import is_enrolled
+from examination.models import ExaminationInfo, ExamPaperInfo, ExamStatistics, ExamStudentsInfo, GradingJob
+from examination.payload import get_questions_payload
+from examination.provisioning import arm_exam, assign_paper
+from examination.submissions import process_jobs
+from testpaper.answer_keys import invalidate_paper
+from testpaper.manual_grading import grade_question
 from testpaper.models import TestPaperInfo, TestPaperTestQ, TestScores
 from testquestion.models import TestQuestionInfo, OptionInfo
 from user.models import UserProfile, SubjectInfo, StudentsInfo
@@ -178,17 +192,95 @@ class TestExamInfo:
         response = api_client.get(f'/api/v1/taking/{ongoing_examination.id}/info/')
 
         assert response.status_code == 200
-        assert response.data['exam_name'] == 'Ongoing Exam'
-        assert response.data['question_count'] == 2
-        assert len(response.data['questions']) == 2
-        assert response.data['total_score'] == 15
-        assert response.data['passing_score'] == 9
+        data = response.json()
+        assert data['exam_name'] == 'Ongoing Exam'
+        assert data['question_count'] == 2
+        assert len(data['questions']) == 2
+        assert data['total_score'] == 15
+        assert data['passing_score'] == 9
         # 정답 정보는 포함되지 않아야 함
-        for question in response.data['questions']:
+        for question in data['questions']:
             assert 'options' in question
             for option in question['options']:
                 assert 'is_right' not in option
 
+    def test_get_exam_info_etag_not_modified(self, api_client, student_user, ongoing_examination):
+        """동일한 ETag로 재요청 시 304 응답"""
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+
+        api_client.force_authenticate(user=student_user)
+        url = f'/api/v1/taking/{ongoing_examination.id}/info/'
+        response = api_client.get(url)
+        etag = response['ETag']
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+
+        # 응시 상태가 바뀌면 ETag도 변경
+        TestScores.objects.create(
+            exam=ongoing_examination,
+            user=student_user.studentsinfo,
+            test_paper=ongoing_examination.exampaperinfo_set.first().paper,
+            start_time=timezone.now(),
+        )
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()['is_started'] is True
+
+    def test_get_exam_info_not_modified_skips_payload(self, api_client, student_user, ongoing_examination, monkeypatch):
+        """304 응답은 문제 payload를 만들지 않고, 시험지가 바뀌면 ETag 변경"""
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        api_client.force_authenticate(user=student_user)
+        url = f'/api/v1/taking/{ongoing_examination.id}/info/'
+        etag = api_client.get(url)['ETag']
+
+        def fail(*args, **kwargs):
+            raise AssertionError('payload built for 304')
+
+        monkeypatch.setattr(taking_views, 'get_questions_payload', fail)
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        monkeypatch.undo()
+
+        invalidate_paper(ongoing_examination.exampaperinfo_set.first().paper_id)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_get_exam_info_payload_cached(
+        self, api_client, student_user, ongoing_examination, django_assert_max_num_queries
+    ):
+        """문제 목록은 한 번 렌더링 후 캐시에서 제공"""
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+
+        api_client.force_authenticate(user=student_user)
+        url = f'/api/v1/taking/{ongoing_examination.id}/info/'
+        first = api_client.get(url)
+
+        # 학생 정보, 시험, 응시 자격, 시험지, 응시 기록
+        with django_assert_max_num_queries(5):
+            second = api_client.get(url)
+
+        assert second.json()['questions'] == first.json()['questions']
+
+    def test_get_exam_info_payload_invalidated(
+        self, api_client, student_user, ongoing_examination, multiple_choice_question
+    ):
+        """문제 내용 변경 시 payload 갱신"""
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+
+        api_client.force_authenticate(user=student_user)
+        url = f'/api/v1/taking/{ongoing_examination.id}/info/'
+        api_client.get(url)
+
+        option = OptionInfo.objects.filter(test_question=multiple_choice_question).first()
+        option.option = 'changed option'
+        option.save()
+
+        data = api_client.get(url).json()
+        option_texts = [o['option'] for q in data['questions'] for o in q['options']]
+        assert 'changed option' in option_texts
+
     def test_get_exam_info_not_enrolled_fails(self, api_client, student_user, ongoing_examination):
         """등록되지 않은 학생이 시험 정보 조회 실패"""
         api_client.force_authenticate(user=student_user)
@@ -212,6 +304,223 @@ class TestExamInfo:
 
         assert response.status_code == 404
 
+    def test_fill_in_answers_not_exposed(
+        self, api_client, student_user, teacher_user, subject, ongoing_examination, test_paper
+    ):
+        """빈칸 채우기 문제의 허용 정답은 선택지로 내려가지 않음"""
+        question = TestQuestionInfo.objects.create(name='Capital?', subject=subject, tq_type='tk', create_user=teacher_user)
+        OptionInfo.objects.create(test_question=question, option='Seoul', is_right=True)
+        TestPaperTestQ.objects.create(test_paper=test_paper, test_question=question, score=5, order=3)
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+
+        api_client.force_authenticate(user=student_user)
+        questions = api_client.get(f'/api/v1/taking/{ongoing_examination.id}/info/').json()['questions']
+
+        fill_in = next(q for q in questions if q['id'] == question.id)
+        assert fill_in['options'] == []
+        assert all(q['options'] for q in questions if q['id'] != question.id)
+
+
+@pytest.mark.django_db
+class TestExamInfoQueryCount:
+    """시험 정보 조회 쿼리 수 테스트"""
+
+    def _create_exam(self, teacher_user, subject, question_count):
+        """question_count개의 객관식 문제로 구성된 진행 중 시험 생성"""
+        paper = TestPaperInfo.objects.create(
+            name=f'Paper {question_count}', subject=subject, total_score=question_count * 5, create_user=teacher_user
+        )
+        for order in range(1, question_count + 1):
+            question = TestQuestionInfo.objects.create(
+                name=f'Question {order}', subject=subject, tq_type='xz', create_user=teacher_user
+            )
+            OptionInfo.objects.create(test_question=question, option='A', is_right=True)
+            OptionInfo.objects.create(test_question=question, option='B', is_right=False)
+            TestPaperTestQ.objects.create(test_paper=paper, test_question=question, score=5, order=order)
+
+        now = timezone.now()
+        exam = ExaminationInfo.objects.create(
+            name=f'Exam {question_count}',
+            subject=subject,
+            start_time=now - timedelta(minutes=10),
+            end_time=now + timedelta(hours=1),
+            exam_state='1',
+            create_user=teacher_user,
+        )
+        ExamPaperInfo.objects.create(exam=exam, paper=paper)
+        return exam
+
+    def _count_exam_info_queries(self, api_client, student_user, exam):
+        ExamStudentsInfo.objects.create(exam=exam, student=student_user.studentsinfo)
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(f'/api/v1/taking/{exam.id}/info/')
+        assert response.status_code == 200
+        return len(context.captured_queries), response.json()
+
+    def test_exam_info_query_count_constant(self, api_client, student_user, teacher_user, subject):
+        """문제 수와 무관하게 쿼리 수 일정 (payload 최초 렌더링 포함)"""
+        api_client.force_authenticate(user=student_user)
+        small_exam = self._create_exam(teacher_user, subject, 2)
+        large_exam = self._create_exam(teacher_user, subject, 12)
+
+        small_count, small_data = self._count_exam_info_queries(api_client, student_user, small_exam)
+        large_count, large_data = self._count_exam_info_queries(api_client, student_user, large_exam)
+
+        assert small_count == large_count
+        assert len(large_data['questions']) == 12
+        assert [q['assigned_score'] for q in large_data['questions']] == [5] * 12
+        assert [q['order'] for q in large_data['questions']] == list(range(1, 13))
+
+
+@pytest.mark.django_db
+class TestShuffledQuestions:
+    """학생별 문제/선택지 무작위 배치 테스트"""
+
+    @pytest.fixture
+    def shuffled_exam(self, teacher_user, subject, student_user, another_student):
+        """4지선다 8문제, 무작위 배치 시험"""
+        paper = TestPaperInfo.objects.create(name='Shuffle Paper', subject=subject, total_score=40, create_user=teacher_user)
+        for order in range(1, 9):
+            question = TestQuestionInfo.objects.create(
+                name=f'Question {order}', subject=subject, tq_type='xz', create_user=teacher_user
+            )
+            for label in 'ABCD':
+                OptionInfo.objects.create(test_question=question, option=label, is_right=label == 'A')
+            TestPaperTestQ.objects.create(test_paper=paper, test_question=question, score=5, order=order)
+
+        now = timezone.now()
+        exam = ExaminationInfo.objects.create(
+            name='Shuffle Exam',
+            subject=subject,
+            start_time=now - timedelta(minutes=10),
+            end_time=now + timedelta(hours=1),
+            exam_state='1',
+            shuffle_questions=True,
+            create_user=teacher_user,
+        )
+        ExamPaperInfo.objects.create(exam=exam, paper=paper)
+        for user in (student_user, another_student):
+            ExamStudentsInfo.objects.create(exam=exam, student=user.studentsinfo)
+        return exam
+
+    def _questions(self, api_client, user, exam):
+        api_client.force_authenticate(user=user)
+        return api_client.get(f'/api/v1/taking/{exam.id}/info/').json()['questions']
+
+    def test_order_stable_per_student(self, api_client, student_user, another_student, shuffled_exam):
+        """같은 학생은 항상 같은 순서, 학생마다 다른 순서"""
+        first = self._questions(api_client, student_user, shuffled_exam)
+        again = self._questions(api_client, student_user, shuffled_exam)
+        other = self._questions(api_client, another_student, shuffled_exam)
+
+        assert first == again
+        assert [q['id'] for q in first] != [q['id'] for q in other]
+        assert sorted(q['id'] for q in first) == sorted(q['id'] for q in other)
+        assert [q['order'] for q in first] == list(range(1, 9))
+        assert any([o['option'] for o in q['options']] != ['A', 'B', 'C', 'D'] for q in first)
+        assert all(sorted(o['option'] for o in q['options']) == ['A', 'B', 'C', 'D'] for q in first)
+
+    def test_shuffle_disabled_keeps_paper_order(self, api_client, student_user, shuffled_exam):
+        """무작위 배치가 꺼져 있으면 시험지 순서 그대로"""
+        ExaminationInfo.objects.filter(id=shuffled_exam.id).update(shuffle_questions=False)
+
+        questions = self._questions(api_client, student_user, shuffled_exam)
+
+        assert [q['name'] for q in questions] == [f'Question {order}' for order in range(1, 9)]
+        assert all([o['option'] for o in q['options']] == ['A', 'B', 'C', 'D'] for q in questions)
+
+    def test_grading_independent_of_order(self, api_client, student_user, shuffled_exam):
+        """선택지 ID로 채점하므로 배치 순서와 무관하게 만점"""
+        questions = self._questions(api_client, student_user, shuffled_exam)
+        api_client.post(f'/api/v1/taking/{shuffled_exam.id}/start/')
+        right_ids = dict(
+            OptionInfo.objects.filter(test_question_id__in=[q['id'] for q in questions], is_right=True).values_list(
+                'test_question_id', 'id'
+            )
+        )
+        answers = [{'question_id': q['id'], 'answer': str(right_ids[q['id']])} for q in questions]
+
+        response = api_client.post(f'/api/v1/taking/{shuffled_exam.id}/submit/', {'answers': answers}, format='json')
+
+        assert response.data['score'] == 40
+
+
+@pytest.mark.django_db
+class TestPaperForms:
+    """다중 시험지(A/B형) 배정 테스트"""
+
+    @pytest.fixture
+    def form_b(self, teacher_user, subject, ongoing_examination, multiple_choice_question):
+        """1문제짜리 B형 시험지"""
+        paper = TestPaperInfo.objects.create(
+            name='Form B', subject=subject, total_score=10, question_count=1, create_user=teacher_user
+        )
+        TestPaperTestQ.objects.create(test_paper=paper, test_question=multiple_choice_question, score=10, order=1)
+        ExamPaperInfo.objects.create(exam=ongoing_examination, paper=paper)
+        return paper
+
+    def test_students_get_different_forms(
+        self, api_client, student_user, another_student, ongoing_examination, test_paper, form_b
+    ):
+        """정렬 순위대로 A/B형 배정, 시작 시 응시 기록에 배정된 시험지 기록"""
+        assigned = {}
+        for user in (student_user, another_student):
+            ExamStudentsInfo.objects.create(exam=ongoing_examination, student=user.studentsinfo)
+        for user in (student_user, another_student):
+            api_client.force_authenticate(user=user)
+            info = api_client.get(f'/api/v1/taking/{ongoing_examination.id}/info/').json()
+            assert api_client.post(f'/api/v1/taking/{ongoing_examination.id}/start/').status_code == 200
+            assigned[user.id] = TestScores.objects.get(exam=ongoing_examination, user=user.studentsinfo).test_paper
+            assert info['question_count'] == assigned[user.id].question_count
+            assert len(info['questions']) == assigned[user.id].question_count
+
+        assert {paper.id for paper in assigned.values()} == {test_paper.id, form_b.id}
+
+    def test_submit_graded_against_assigned_form(self, api_client, student_user, another_student, ongoing_examination, form_b):
+        """배정된 시험지의 정답/배점으로 채점"""
+        for user in (student_user, another_student):
+            ExamStudentsInfo.objects.create(exam=ongoing_examination, student=user.studentsinfo)
+        user = next(
+            user for user in (student_user, another_student)
+            if assign_paper(ongoing_examination.id, user.studentsinfo.id) == form_b.id
+        )
+        api_client.force_authenticate(user=user)
+        api_client.post(f'/api/v1/taking/{ongoing_examination.id}/start/')
+        question = TestPaperTestQ.objects.get(test_paper=form_b).test_question
+        right = OptionInfo.objects.get(test_question=question, is_right=True)
+
+        response = api_client.post(
+            f'/api/v1/taking/{ongoing_examination.id}/submit/',
+            {'answers': [{'question_id': question.id, 'answer': str(right.id)}]},
+            format='json',
+        )
+
+        assert response.data['score'] == 10
+
+
+@pytest.mark.django_db
+class TestEligibilityCache:
+    """응시 자격 캐시 테스트"""
+
+    def test_is_enrolled_cached(self, django_assert_num_queries, student_user, another_student, ongoing_examination):
+        """최초 1회 적재 후에는 쿼리 없이 확인"""
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        assert is_enrolled(ongoing_examination.id, student_user.studentsinfo.id)
+
+        with django_assert_num_queries(0):
+            assert is_enrolled(ongoing_examination.id, student_user.studentsinfo.id)
+            assert not is_enrolled(ongoing_examination.id, another_student.studentsinfo.id)
+
+    def test_enrollment_change_invalidates(self, student_user, ongoing_examination):
+        """등록/삭제 시 캐시 무효화"""
+        assert not is_enrolled(ongoing_examination.id, student_user.studentsinfo.id)
+
+        enrollment = ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        assert is_enrolled(ongoing_examination.id, student_user.studentsinfo.id)
+
+        enrollment.delete()
+        assert not is_enrolled(ongoing_examination.id, student_user.studentsinfo.id)
+
 
 @pytest.mark.django_db
 class TestExamStart:
@@ -284,6 +593,66 @@ class TestExamStart:
         assert response.status_code == 200
         assert '이미 시작한 시험입니다' in response.data['detail']
 
+    def test_start_armed_attempt_single_update(
+        self, api_client, student_user, ongoing_examination, django_assert_num_queries
+    ):
+        """미리 생성된 응시 기록은 조건부 UPDATE로 시작 (한 번만 시작)"""
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        assert arm_exam(ongoing_examination) == 1
+        assert arm_exam(ongoing_examination) == 0
+
+        api_client.force_authenticate(user=student_user)
+        url = f'/api/v1/taking/{ongoing_examination.id}/start/'
+        # 시험 조회 + UPDATE (응시 자격 조회/INSERT 없음)
+        with django_assert_num_queries(2):
+            response = api_client.post(url)
+
+        assert response.status_code == 200
+        assert '시작되었습니다' in response.data['detail']
+        test_score = TestScores.objects.get(exam=ongoing_examination, user=student_user.studentsinfo)
+        assert test_score.start_time is not None
+
+        response = api_client.post(url)
+        assert '이미 시작한 시험입니다' in response.data['detail']
+        assert TestScores.objects.get(id=test_score.id).start_time == test_score.start_time
+
+    def test_start_twice_keeps_single_attempt(self, api_client, student_user, ongoing_examination):
+        """연속 시작 요청에도 응시 기록은 하나, 시작 시간은 처음 값 유지"""
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        api_client.force_authenticate(user=student_user)
+        url = f'/api/v1/taking/{ongoing_examination.id}/start/'
+
+        first = api_client.post(url)
+        second = api_client.post(url)
+
+        assert '시작되었습니다' in first.data['detail']
+        assert '이미 시작한 시험입니다' in second.data['detail']
+        assert second.data['start_time'] == first.data['start_time']
+        assert TestScores.objects.filter(exam=ongoing_examination, user=student_user.studentsinfo).count() == 1
+
+    def test_duplicate_attempt_rejected_by_constraint(self, student_user, ongoing_examination):
+        """(시험, 학생) 중복 응시 기록은 DB 제약으로 거부"""
+        paper = ongoing_examination.exampaperinfo_set.first().paper
+        TestScores.objects.create(exam=ongoing_examination, user=student_user.studentsinfo, test_paper=paper)
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            TestScores.objects.create(exam=ongoing_examination, user=student_user.studentsinfo, test_paper=paper)
+
+    def test_arm_exams_command(self, student_user, another_student, ongoing_examination, future_examination):
+        """곧 시작하거나 진행 중인 시험만 응시 기록 생성"""
+        for exam in (ongoing_examination, future_examination):
+            for user in (student_user, another_student):
+                ExamStudentsInfo.objects.create(exam=exam, student=user.studentsinfo)
+
+        out = StringIO()
+        call_command('arm_exams', '--lead-minutes', '30', stdout=out)
+
+        assert '2건' in out.getvalue()
+        armed = TestScores.objects.filter(exam=ongoing_examination)
+        assert armed.count() == 2
+        assert all(score.start_time is None and not score.is_submitted for score in armed)
+        assert not TestScores.objects.filter(exam=future_examination).exists()
+
     def test_start_exam_already_submitted_fails(self, api_client, student_user, ongoing_examination):
         """이미 제출한 시험 재시작 실패"""
         student_info = student_user.studentsinfo
@@ -413,6 +782,32 @@ class TestExamSubmit:
         assert response.data['score'] == 10  # 첫 문제만 정답
         assert response.data['passed'] is True  # 합격점(9점) 이상
 
+    def test_submit_query_count_independent_of_answers(
+        self, api_client, student_user, ongoing_examination, django_assert_max_num_queries
+    ):
+        """채점 쿼리 수는 답안 수와 무관 (정답표 1회 조회)"""
+        student_info = student_user.studentsinfo
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_info)
+        paper = ongoing_examination.exampaperinfo_set.first().paper
+
+        TestScores.objects.create(
+            exam=ongoing_examination, user=student_info, test_paper=paper, start_time=timezone.now() - timedelta(minutes=10)
+        )
+
+        answers = [
+            {'question_id': pq.test_question_id, 'answer': '0'}
+            for pq in TestPaperTestQ.objects.filter(test_paper=paper)
+        ]
+
+        api_client.force_authenticate(user=student_user)
+        with django_assert_max_num_queries(10):
+            response = api_client.post(
+                f'/api/v1/taking/{ongoing_examination.id}/submit/', {'answers': answers}, format='json'
+            )
+
+        assert response.status_code == 200
+        assert response.data['score'] == 0
+
     def test_submit_without_starting_fails(self, api_client, student_user, ongoing_examination):
         """시작하지 않은 시험 제출 실패"""
         student_info = student_user.studentsinfo
@@ -426,6 +821,43 @@ class TestExamSubmit:
         assert response.status_code == 400
         assert '시작하지 않았습니다' in response.data['detail']
 
+    def test_submit_replay_with_idempotency_key(
+        self, api_client, student_user, ongoing_examination, multiple_choice_question
+    ):
+        """같은 Idempotency-Key 재시도는 재채점 없이 처음 응답 반환"""
+        student_info = student_user.studentsinfo
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_info)
+        test_score = TestScores.objects.create(
+            exam=ongoing_examination,
+            user=student_info,
+            test_paper=ongoing_examination.exampaperinfo_set.first().paper,
+            start_time=timezone.now() - timedelta(minutes=10),
+        )
+        correct_option = OptionInfo.objects.get(test_question=multiple_choice_question, is_right=True)
+        data = {'answers': [{'question_id': multiple_choice_question.id, 'answer': str(correct_option.id)}]}
+        url = f'/api/v1/taking/{ongoing_examination.id}/submit/'
+        key = f'submit-{uuid.uuid4()}'
+
+        api_client.force_authenticate(user=student_user)
+        first = api_client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+        replay = api_client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+        assert first.status_code == replay.status_code == 200
+        assert replay.data == first.data
+        assert replay['Idempotent-Replayed'] == 'true'
+        assert 'Idempotent-Replayed' not in first
+
+        # 다른 본문에 같은 키 재사용은 거부
+        other = api_client.post(
+            url, {'answers': [{'question_id': 1, 'answer': 'x'}]}, format='json', HTTP_IDEMPOTENCY_KEY=key
+        )
+        assert other.status_code == 422
+
+        # 키 없이 재제출하면 기존처럼 거부
+        assert api_client.post(url, data, format='json').status_code == 400
+        test_score.refresh_from_db()
+        assert test_score.test_score == 10
+
     def test_submit_already_submitted_fails(self, api_client, student_user, ongoing_examination):
         """이미 제출한 시험 재제출 실패"""
         student_info = student_user.studentsinfo
@@ -449,6 +881,59 @@ class TestExamSubmit:
         assert '이미 제출한 시험입니다' in response.data['detail']
 
 
+    def test_submit_within_grace_accepted(
+        self, api_client, student_user, ongoing_examination, multiple_choice_question
+    ):
+        """종료 직후(유예 시간 안) 도착한 제출은 그대로 채점"""
+        student_info = student_user.studentsinfo
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_info)
+        TestScores.objects.create(
+            exam=ongoing_examination,
+            user=student_info,
+            test_paper=ongoing_examination.exampaperinfo_set.first().paper,
+            start_time=timezone.now() - timedelta(minutes=30),
+        )
+        ExaminationInfo.objects.filter(id=ongoing_examination.id).update(end_time=timezone.now() - timedelta(seconds=5))
+        correct = OptionInfo.objects.get(test_question=multiple_choice_question, is_right=True)
+
+        api_client.force_authenticate(user=student_user)
+        data = {'answers': [{'question_id': multiple_choice_question.id, 'answer': str(correct.id)}]}
+        response = api_client.post(f'/api/v1/taking/{ongoing_examination.id}/submit/', data, format='json')
+
+        assert response.status_code == 200
+        assert response.data['score'] == 10
+
+    def test_submit_after_deadline_uses_draft(
+        self, api_client, student_user, ongoing_examination, multiple_choice_question, true_false_question
+    ):
+        """유예 시간 이후 도착한 제출은 받지 않고 임시 답안으로 제출 처리 (제출 시간은 종료 시간)"""
+        student_info = student_user.studentsinfo
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_info)
+        correct_tf = OptionInfo.objects.get(test_question=true_false_question, is_right=True)
+        test_score = TestScores.objects.create(
+            exam=ongoing_examination,
+            user=student_info,
+            test_paper=ongoing_examination.exampaperinfo_set.first().paper,
+            start_time=timezone.now() - timedelta(minutes=30),
+            detail_records={str(true_false_question.id): {'answer': str(correct_tf.id)}},
+        )
+        end_time = timezone.now() - timedelta(minutes=5)
+        ExaminationInfo.objects.filter(id=ongoing_examination.id).update(end_time=end_time)
+        correct_mc = OptionInfo.objects.get(test_question=multiple_choice_question, is_right=True)
+
+        api_client.force_authenticate(user=student_user)
+        data = {'answers': [{'question_id': multiple_choice_question.id, 'answer': str(correct_mc.id)}]}
+        response = api_client.post(f'/api/v1/taking/{ongoing_examination.id}/submit/', data, format='json')
+
+        assert response.status_code == 400
+        assert '임시 저장된 답안으로 제출되었습니다' in response.data['detail']
+        test_score.refresh_from_db()
+        assert (test_score.is_submitted, test_score.test_score, test_score.submit_time) == (True, 5, end_time)
+
+        response = api_client.post(f'/api/v1/taking/{ongoing_examination.id}/submit/', data, format='json')
+        assert response.data['detail'] == '시험 종료 시간이 지났습니다.'
+
+
 @pytest.mark.django_db
 class TestExamStatus:
     """응시 상태 조회 테스트"""
@@ -541,6 +1026,30 @@ class TestSaveDraft:
         test_score = TestScores.objects.get(exam=ongoing_examination, user=student_info)
         assert test_score.detail_records == data['answers']
 
+    def test_save_draft_replay_with_idempotency_key(self, api_client, student_user, ongoing_examination):
+        """같은 Idempotency-Key 재시도는 저장하지 않고 처음 응답 반환"""
+        student_info = student_user.studentsinfo
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_info)
+        test_score = TestScores.objects.create(
+            exam=ongoing_examination,
+            user=student_info,
+            test_paper=ongoing_examination.exampaperinfo_set.first().paper,
+            start_time=timezone.now() - timedelta(minutes=10),
+        )
+        url = f'/api/v1/taking/{ongoing_examination.id}/save-draft/'
+        data = {'answers': {'1': {'answer': 'first'}}}
+        key = f'draft-{uuid.uuid4()}'
+
+        api_client.force_authenticate(user=student_user)
+        first = api_client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+        TestScores.objects.filter(id=test_score.id).update(detail_records={'1': {'answer': 'newer'}})
+        replay = api_client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+        assert replay.status_code == 200
+        assert replay.data == first.data
+        test_score.refresh_from_db()
+        assert test_score.detail_records == {'1': {'answer': 'newer'}}
+
     def test_save_draft_without_starting_fails(self, api_client, student_user, ongoing_examination):
         """시작하지 않은 시험 임시 저장 실패"""
         student_info = student_user.studentsinfo
@@ -574,3 +1083,421 @@ class TestSaveDraft:
 
         assert response.status_code == 400
         assert '이미 제출한 시험입니다' in response.data['detail']
+
+    def test_save_draft_racing_submit_keeps_graded_records(
+        self, api_client, student_user, ongoing_examination, monkeypatch
+    ):
+        """확인 후 저장 전에 제출이 반영되면 채점 결과를 덮어쓰지 않음"""
+        student_info = student_user.studentsinfo
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_info)
+        test_score = TestScores.objects.create(
+            exam=ongoing_examination,
+            user=student_info,
+            test_paper=ongoing_examination.exampaperinfo_set.first().paper,
+            start_time=timezone.now() - timedelta(minutes=30),
+        )
+        graded = {'1': {'answer': 'final', 'is_correct': True, 'score': 5}}
+
+        def submit_then_check():
+            TestScores.objects.filter(id=test_score.id).update(is_submitted=True, detail_records=graded)
+            return False
+
+        monkeypatch.setattr(taking_views, 'is_write_behind', submit_then_check)
+        api_client.force_authenticate(user=student_user)
+        data = {'answers': {'1': {'answer': 'draft'}}}
+
+        response = api_client.post(f'/api/v1/taking/{ongoing_examination.id}/save-draft/', data, format='json')
+
+        assert response.status_code == 400
+        test_score.refresh_from_db()
+        assert test_score.detail_records == graded
+
+
+@pytest.mark.django_db
+class TestPatchDraft:
+    """답안 부분 임시 저장 (PATCH) 테스트"""
+
+    @pytest.fixture
+    def started_score(self, student_user, ongoing_examination):
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        return TestScores.objects.create(
+            exam=ongoing_examination,
+            user=student_user.studentsinfo,
+            test_paper=ongoing_examination.exampaperinfo_set.first().paper,
+            start_time=timezone.now() - timedelta(minutes=10),
+            detail_records={'1': {'answer': 'a'}, '2': {'answer': 'b'}},
+        )
+
+    def test_patch_merges_changed_answers(self, api_client, student_user, ongoing_examination, started_score):
+        """변경된 문제만 기존 답안에 병합"""
+        api_client.force_authenticate(user=student_user)
+        data = {'answers': {'2': {'answer': 'c'}, '3': {'answer': 'd'}}, 'seq': 1}
+
+        response = api_client.patch(f'/api/v1/taking/{ongoing_examination.id}/save-draft/', data, format='json')
+
+        assert response.status_code == 200
+        assert response.data['seq'] == 1
+        started_score.refresh_from_db()
+        assert started_score.detail_records == {
+            '1': {'answer': 'a'},
+            '2': {'answer': 'c'},
+            '3': {'answer': 'd'},
+        }
+        assert started_score.draft_seq == 1
+
+    def test_patch_stale_seq_rejected(self, api_client, student_user, ongoing_examination, started_score):
+        """이미 반영된 순번 이하의 patch는 409"""
+        api_client.force_authenticate(user=student_user)
+        url = f'/api/v1/taking/{ongoing_examination.id}/save-draft/'
+        api_client.patch(url, {'answers': {'1': {'answer': 'new'}}, 'seq': 5}, format='json')
+
+        response = api_client.patch(url, {'answers': {'1': {'answer': 'stale'}}, 'seq': 4}, format='json')
+
+        assert response.status_code == 409
+        assert response.data['current_seq'] == 5
+        started_score.refresh_from_db()
+        assert started_score.detail_records['1'] == {'answer': 'new'}
+
+    def test_patch_after_submit_fails(self, api_client, student_user, ongoing_examination, started_score):
+        """제출 후 부분 저장 실패"""
+        TestScores.objects.filter(id=started_score.id).update(is_submitted=True)
+        api_client.force_authenticate(user=student_user)
+
+        response = api_client.patch(
+            f'/api/v1/taking/{ongoing_examination.id}/save-draft/',
+            {'answers': {'1': {'answer': 'x'}}, 'seq': 1},
+            format='json',
+        )
+
+        assert response.status_code == 400
+
+    def test_patch_invalid_answers_fails(self, api_client, student_user, ongoing_examination, started_score):
+        """answers가 객체가 아니면 400"""
+        api_client.force_authenticate(user=student_user)
+
+        response = api_client.patch(
+            f'/api/v1/taking/{ongoing_examination.id}/save-draft/', {'answers': [1], 'seq': 1}, format='json'
+        )
+
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestExamSession:
+    """응시 세션 (info + start + status 통합) 테스트"""
+
+    def test_session_starts_and_returns_everything(self, api_client, student_user, ongoing_examination):
+        """시작 전이면 시작 처리 후 시험 정보/상태/문제 반환"""
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        api_client.force_authenticate(user=student_user)
+
+        response = api_client.post(f'/api/v1/taking/{ongoing_examination.id}/session/')
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['exam_id'] == ongoing_examination.id
+        assert data['is_started'] is True
+        assert data['is_submitted'] is False
+        assert data['start_time'] is not None
+        assert data['time_remaining'] > 0
+        assert data['draft_answers'] == {}
+        assert data['total_score'] == 15
+        assert len(data['questions']) == 2
+        assert 'is_right' not in data['questions'][0]['options'][0]
+
+        test_score = TestScores.objects.get(exam=ongoing_examination, user=student_user.studentsinfo)
+        assert test_score.start_time is not None
+
+    def test_session_resume_keeps_start_time_and_draft(self, api_client, student_user, ongoing_examination):
+        """이미 시작한 응시는 시작 시간 유지, 임시 답안 반환"""
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        start_time = timezone.now() - timedelta(minutes=5)
+        TestScores.objects.create(
+            exam=ongoing_examination,
+            user=student_user.studentsinfo,
+            test_paper=ongoing_examination.exampaperinfo_set.first().paper,
+            start_time=start_time,
+            detail_records={'1': {'answer': 'draft'}},
+        )
+        api_client.force_authenticate(user=student_user)
+
+        response = api_client.post(f'/api/v1/taking/{ongoing_examination.id}/session/')
+
+        data = response.json()
+        assert data['draft_answers'] == {'1': {'answer': 'draft'}}
+        assert TestScores.objects.get(exam=ongoing_examination).start_time == start_time
+
+    def test_session_armed_query_count(
+        self, api_client, student_user, ongoing_examination, django_assert_max_num_queries
+    ):
+        """미리 생성된 응시 기록이면 시험 조회 + 응시 기록 조회 + 시작 UPDATE (문제는 캐시)"""
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        arm_exam(ongoing_examination)
+        paper = ongoing_examination.exampaperinfo_set.first().paper
+        get_questions_payload(ongoing_examination.id, paper.id)
+        api_client.force_authenticate(user=student_user)
+
+        with django_assert_max_num_queries(3):
+            response = api_client.post(f'/api/v1/taking/{ongoing_examination.id}/session/')
+
+        assert response.status_code == 200
+
+    def test_session_not_enrolled_fails(self, api_client, student_user, ongoing_examination):
+        """등록되지 않은 학생은 403"""
+        api_client.force_authenticate(user=student_user)
+
+        response = api_client.post(f'/api/v1/taking/{ongoing_examination.id}/session/')
+
+        assert response.status_code == 403
+        assert not TestScores.objects.exists()
+
+    def test_session_before_start_fails(self, api_client, student_user, future_examination):
+        """시작 시간 전이면 400"""
+        ExamStudentsInfo.objects.create(exam=future_examination, student=student_user.studentsinfo)
+        api_client.force_authenticate(user=student_user)
+
+        response = api_client.post(f'/api/v1/taking/{future_examination.id}/session/')
+
+        assert response.status_code == 400
+
+    def test_session_after_end_without_attempt_fails(self, api_client, student_user, past_examination):
+        """종료 후 새로 시작 불가"""
+        ExamStudentsInfo.objects.create(exam=past_examination, student=student_user.studentsinfo)
+        api_client.force_authenticate(user=student_user)
+
+        response = api_client.post(f'/api/v1/taking/{past_examination.id}/session/')
+
+        assert response.status_code == 400
+        assert '종료 시간이 지났습니다' in response.data['detail']
+
+
+@pytest.fixture
+def write_behind(settings):
+    """임시 저장 write-behind 모드"""
+    settings.EXAM_DRAFT_WRITE_BEHIND = True
+
+
+@pytest.mark.django_db
+class TestSaveDraftWriteBehind:
+    """임시 저장 write-behind 모드 테스트"""
+
+    @pytest.fixture
+    def started_score(self, student_user, ongoing_examination):
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        test_score = TestScores.objects.create(
+            exam=ongoing_examination,
+            user=student_user.studentsinfo,
+            test_paper=ongoing_examination.exampaperinfo_set.first().paper,
+            start_time=timezone.now() - timedelta(minutes=10),
+            detail_records={'1': {'answer': 'old'}},
+        )
+        # 이전 테스트 실행에서 같은 ID로 남은 버퍼 항목 제거
+        discard_draft(test_score.id)
+        return test_score
+
+    def test_draft_buffered_not_written(self, api_client, student_user, ongoing_examination, started_score, write_behind):
+        """임시 저장은 버퍼에만 기록되고 status는 버퍼의 최신 답안 반환"""
+        api_client.force_authenticate(user=student_user)
+        data = {'answers': {'1': {'answer': 'buffered'}}}
+
+        response = api_client.post(f'/api/v1/taking/{ongoing_examination.id}/save-draft/', data, format='json')
+        assert response.status_code == 200
+
+        started_score.refresh_from_db()
+        assert started_score.detail_records == {'1': {'answer': 'old'}}
+
+        response = api_client.get(f'/api/v1/taking/{ongoing_examination.id}/status/')
+        assert response.data['draft_answers'] == data['answers']
+
+    def test_flush_command_persists_drafts(self, api_client, student_user, ongoing_examination, started_score, write_behind):
+        """flush 명령이 버퍼의 답안을 일괄 반영 (변경 없으면 재기록 안 함)"""
+        api_client.force_authenticate(user=student_user)
+        data = {'answers': {'1': {'answer': 'buffered'}}}
+        api_client.post(f'/api/v1/taking/{ongoing_examination.id}/save-draft/', data, format='json')
+
+        call_command('flush_exam_drafts', stdout=StringIO())
+        started_score.refresh_from_db()
+        assert started_score.detail_records == data['answers']
+
+        assert flush_drafts([started_score.id]) == 0
+
+    def test_flush_skips_submitted(self, api_client, student_user, ongoing_examination, started_score, write_behind):
+        """제출된 기록은 버퍼 답안으로 덮어쓰지 않음"""
+        buffer_draft(started_score, {'1': {'answer': 'late'}})
+        TestScores.objects.filter(id=started_score.id).update(is_submitted=True, detail_records={'graded': True})
+
+        assert flush_drafts([started_score.id]) == 0
+        started_score.refresh_from_db()
+        assert started_score.detail_records == {'graded': True}
+
+    def test_submit_discards_buffered_draft(self, api_client, student_user, ongoing_examination, started_score, write_behind):
+        """제출 후 버퍼의 임시 답안 삭제"""
+        api_client.force_authenticate(user=student_user)
+        api_client.post(
+            f'/api/v1/taking/{ongoing_examination.id}/save-draft/', {'answers': {'1': {'answer': 'x'}}}, format='json'
+        )
+        response = api_client.post(
+            f'/api/v1/taking/{ongoing_examination.id}/submit/',
+            {'answers': [{'question_id': 1, 'answer': 'x'}]},
+            format='json',
+        )
+
+        assert response.status_code == 200
+        assert get_buffered_draft(started_score.id) is None
+
+    def test_patch_merges_into_buffer(self, api_client, student_user, ongoing_examination, started_score, write_behind):
+        """write-behind 모드의 부분 저장은 버퍼에 병합되고 flush 시 순번도 반영"""
+        api_client.force_authenticate(user=student_user)
+        url = f'/api/v1/taking/{ongoing_examination.id}/save-draft/'
+
+        response = api_client.patch(url, {'answers': {'2': {'answer': 'x'}}, 'seq': 3}, format='json')
+        assert response.status_code == 200
+        response = api_client.patch(url, {'answers': {'2': {'answer': 'y'}}, 'seq': 3}, format='json')
+        assert response.status_code == 409
+
+        assert get_buffered_draft(started_score.id) == {'1': {'answer': 'old'}, '2': {'answer': 'x'}}
+
+        flush_drafts([started_score.id])
+        started_score.refresh_from_db()
+        assert started_score.detail_records == {'1': {'answer': 'old'}, '2': {'answer': 'x'}}
+        assert started_score.draft_seq == 3
+
+
+@pytest.fixture
+def async_submit(settings):
+    """비동기 제출 모드"""
+    settings.EXAM_SUBMIT_ASYNC = True
+
+
+@pytest.mark.django_db
+class TestSubmitAsync:
+    """비동기 제출 (채점 대기열) 테스트"""
+
+    @pytest.fixture
+    def started_score(self, student_user, ongoing_examination):
+        ExamStudentsInfo.objects.create(exam=ongoing_examination, student=student_user.studentsinfo)
+        return TestScores.objects.create(
+            exam=ongoing_examination,
+            user=student_user.studentsinfo,
+            test_paper=ongoing_examination.exampaperinfo_set.first().paper,
+            start_time=timezone.now() - timedelta(minutes=10),
+        )
+
+    @pytest.fixture
+    def correct_answers(self, multiple_choice_question, true_false_question):
+        return [
+            {
+                'question_id': question.id,
+                'answer': str(OptionInfo.objects.get(test_question=question, is_right=True).id),
+            }
+            for question in (multiple_choice_question, true_false_question)
+        ]
+
+    def test_submit_returns_receipt(
+        self, api_client, student_user, ongoing_examination, started_score, correct_answers, async_submit
+    ):
+        """제출 시 채점 없이 접수 응답, status는 grading"""
+        api_client.force_authenticate(user=student_user)
+
+        response = api_client.post(
+            f'/api/v1/taking/{ongoing_examination.id}/submit/', {'answers': correct_answers}, format='json'
+        )
+
+        assert response.status_code == 202
+        assert response.data['grading_status'] == 'grading'
+        job = GradingJob.objects.get(id=response.data['receipt_id'])
+        assert job.answers == correct_answers
+
+        started_score.refresh_from_db()
+        assert started_score.is_submitted
+        assert started_score.test_score == 0
+
+        response = api_client.get(f'/api/v1/taking/{ongoing_examination.id}/status/')
+        assert response.data['grading_status'] == 'grading'
+        assert response.data['score'] is None
+
+    def test_worker_grades_submission(
+        self, api_client, student_user, ongoing_examination, started_score, correct_answers, async_submit
+    ):
+        """worker 명령이 채점 후 status는 graded"""
+        api_client.force_authenticate(user=student_user)
+        api_client.post(f'/api/v1/taking/{ongoing_examination.id}/submit/', {'answers': correct_answers}, format='json')
+
+        out = StringIO()
+        call_command('grade_submissions', stdout=out)
+        assert '1건' in out.getvalue()
+
+        started_score.refresh_from_db()
+        assert started_score.test_score == 15
+        assert GradingJob.objects.get(test_score=started_score).status == GradingJob.STATUS_DONE
+
+        response = api_client.get(f'/api/v1/taking/{ongoing_examination.id}/status/')
+        assert response.data['grading_status'] == 'graded'
+        assert response.data['score'] == 15
+
+    def test_worker_keeps_manual_grade_made_while_pending(
+        self, api_client, student_user, ongoing_examination, started_score, correct_answers, true_false_question,
+        async_submit,
+    ):
+        """채점 대기 중 교사가 수동 채점한 항목은 worker 채점 후에도 유지"""
+        api_client.force_authenticate(user=student_user)
+        api_client.post(f'/api/v1/taking/{ongoing_examination.id}/submit/', {'answers': correct_answers}, format='json')
+
+        started_score.refresh_from_db()
+        grade_question(started_score, true_false_question.id, 2, '부분 점수')
+        process_jobs()
+
+        started_score.refresh_from_db()
+        assert started_score.test_score == 12  # 10 + 수동 채점 2
+        record = started_score.detail_records[str(true_false_question.id)]
+        assert (record['score'], record['manual_graded'], record['comment']) == (2, True, '부분 점수')
+        assert record['answer'] == correct_answers[1]['answer']
+        assert ExamStatistics.objects.get(exam=ongoing_examination).score_sum == 12
+
+    def test_resubmit_rejected_while_grading(
+        self, api_client, student_user, ongoing_examination, started_score, correct_answers, async_submit
+    ):
+        """채점 대기 중 재제출 불가"""
+        api_client.force_authenticate(user=student_user)
+        url = f'/api/v1/taking/{ongoing_examination.id}/submit/'
+        api_client.post(url, {'answers': correct_answers}, format='json')
+
+        response = api_client.post(url, {'answers': correct_answers}, format='json')
+
+        assert response.status_code == 400
+        assert GradingJob.objects.count() == 1
+
+    def test_failed_job_retried_until_max_attempts(self, started_score, settings, monkeypatch):
+        """채점 실패 시 재시도 후 실패 상태로 남음"""
+        settings.GRADING_JOB_MAX_ATTEMPTS = 2
+        TestScores.objects.filter(id=started_score.id).update(is_submitted=True)
+        job = GradingJob.objects.create(test_score=started_score, answers=[])
+
+        def broken(paper_id):
+            raise RuntimeError('answer key unavailable')
+
+        monkeypatch.setattr('examination.submissions.get_answer_key', broken)
+
+        assert process_jobs() == 0
+        job.refresh_from_db()
+        assert job.status == GradingJob.STATUS_PENDING
+
+        assert process_jobs() == 0
+        job.refresh_from_db()
+        assert job.status == GradingJob.STATUS_FAILED
+        assert job.attempts == 2
+        assert 'answer key unavailable' in job.error
+
+    def test_stale_processing_job_reclaimed(self, started_score, settings):
+        """처리 중에 중단된 작업은 일정 시간 후 다시 처리"""
+        TestScores.objects.filter(id=started_score.id).update(is_submitted=True)
+        job = GradingJob.objects.create(
+            test_score=started_score,
+            answers=[],
+            status=GradingJob.STATUS_PROCESSING,
+            started_time=timezone.now() - timedelta(seconds=settings.GRADING_JOB_STALE_SECONDS + 1),
+        )
+
+        assert process_jobs() == 1
+        job.refresh_from_db()
+        assert job.status == GradingJob.STATUS_DONE
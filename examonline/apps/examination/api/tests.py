@@ -2,12 +2,16 @@
 Examination API Tests.
 """
 import pytest
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework.test import APIClient
 
+from examination.eligibility import is_enrolled
 from examination.models import ExaminationInfo, ExamPaperInfo, ExamStudentsInfo
-from testpaper.models import TestPaperInfo
+from examination import provisioning
+from examination.provisioning import arm_exam, assign_paper, get_form_paper_ids
+from testpaper.models import TestPaperInfo, TestScores
 from user.models import UserProfile, SubjectInfo, StudentsInfo
 
 
@@ -237,6 +241,28 @@ class TestStudentEnrollment:
         assert response.status_code == 400
         assert 'student_ids' in response.data
 
+    def test_enroll_students_invalidates_eligibility_cache(self, api_client, teacher_user, examination):
+        """등록 후 응시 자격 캐시 갱신"""
+        student = UserProfile.objects.create_user(username='student1', password='pass', user_type='student')
+        student_info = StudentsInfo.objects.create(user=student, student_name='Student 1', student_id='001')
+        assert not is_enrolled(examination.id, student_info.id)
+
+        api_client.force_authenticate(user=teacher_user)
+        api_client.post(
+            f'/api/v1/exams/{examination.id}/enroll_students/', {'student_ids': [student_info.id]}, format='json'
+        )
+
+        assert is_enrolled(examination.id, student_info.id)
+
+    def test_duplicate_enrollment_rejected_by_constraint(self, examination):
+        """(시험, 학생) 중복 등록은 DB 제약으로 거부"""
+        student = UserProfile.objects.create_user(username='student1', password='pass', user_type='student')
+        student_info = StudentsInfo.objects.create(user=student, student_name='Student 1', student_id='001')
+        ExamStudentsInfo.objects.create(exam=examination, student=student_info)
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            ExamStudentsInfo.objects.create(exam=examination, student=student_info)
+
     def test_enroll_students_after_exam_start_fails(self, api_client, teacher_user, examination):
         """시험 시작 후 학생 등록 실패"""
         examination.exam_state = '1'
@@ -266,6 +292,88 @@ class TestStudentEnrollment:
         assert response.status_code == 200
         assert len(response.data['students']) == 1
         assert response.data['students'][0]['student']['student_name'] == 'Student 1'
+        assert response.data['meta']['next'] is None
+
+
+@pytest.mark.django_db
+class TestArmExam:
+    """응시 기록 사전 생성 테스트"""
+
+    def test_arm_creates_attempts_for_enrolled(self, api_client, teacher_user, examination, test_paper):
+        """등록 학생마다 시작 전 응시 기록 생성"""
+        ExamPaperInfo.objects.create(exam=examination, paper=test_paper)
+        for index in range(3):
+            user = UserProfile.objects.create_user(username=f'student{index}', password='pass', user_type='student')
+            student_info = StudentsInfo.objects.create(user=user, student_name=f'Student {index}', student_id=f'00{index}')
+            ExamStudentsInfo.objects.create(exam=examination, student=student_info)
+
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.post(f'/api/v1/exams/{examination.id}/arm/')
+
+        assert response.status_code == 200
+        assert response.data['created'] == 3
+        scores = TestScores.objects.filter(exam=examination)
+        assert scores.count() == 3
+        assert all(score.test_paper_id == test_paper.id and score.start_time is None for score in scores)
+
+        response = api_client.post(f'/api/v1/exams/{examination.id}/arm/')
+        assert response.data['created'] == 0
+
+    def test_arm_counts_only_inserted_rows(self, examination, test_paper, monkeypatch):
+        """생성 중 동시에 시작한 학생의 기록은 생성 수에서 제외"""
+        ExamPaperInfo.objects.create(exam=examination, paper=test_paper)
+        students = []
+        for index in range(3):
+            user = UserProfile.objects.create_user(username=f'student{index}', password='pass', user_type='student')
+            students.append(StudentsInfo.objects.create(user=user, student_name=f'Student {index}', student_id=f'00{index}'))
+            ExamStudentsInfo.objects.create(exam=examination, student=students[-1])
+        form_for = provisioning._form_for
+
+        def start_concurrently(paper_ids, enrolled_ids, student_id):
+            if student_id == students[0].id:
+                provisioning.ensure_attempt(examination, students[0], test_paper.id)
+            return form_for(paper_ids, enrolled_ids, student_id)
+
+        monkeypatch.setattr(provisioning, '_form_for', start_concurrently)
+
+        assert arm_exam(examination) == 2
+        assert TestScores.objects.filter(exam=examination).count() == 3
+
+    def test_arm_balances_paper_forms(self, teacher_user, subject, examination, test_paper):
+        """시험지가 여러 개면 형별 인원 차이 1명 이내, 같은 학생은 항상 같은 시험지"""
+        form_b = TestPaperInfo.objects.create(name='Form B', subject=subject, create_user=teacher_user)
+        ExamPaperInfo.objects.create(exam=examination, paper=test_paper)
+        ExamPaperInfo.objects.create(exam=examination, paper=form_b)
+        for index in range(5):
+            user = UserProfile.objects.create_user(username=f'student{index}', password='pass', user_type='student')
+            student_info = StudentsInfo.objects.create(user=user, student_name=f'Student {index}', student_id=f'00{index}')
+            ExamStudentsInfo.objects.create(exam=examination, student=student_info)
+
+        assert arm_exam(examination) == 5
+
+        scores = TestScores.objects.filter(exam=examination)
+        counts = sorted(scores.filter(test_paper=paper).count() for paper in (test_paper, form_b))
+        assert counts == [2, 3]
+        assert all(assign_paper(examination.id, score.user_id) == score.test_paper_id for score in scores)
+
+    def test_paper_change_invalidates_forms(self, teacher_user, subject, examination, test_paper):
+        """시험지 추가/삭제 시 배정 대상 시험지 목록 갱신"""
+        ExamPaperInfo.objects.create(exam=examination, paper=test_paper)
+        assert get_form_paper_ids(examination.id) == (test_paper.id,)
+
+        form_b = TestPaperInfo.objects.create(name='Form B', subject=subject, create_user=teacher_user)
+        exam_paper = ExamPaperInfo.objects.create(exam=examination, paper=form_b)
+        assert get_form_paper_ids(examination.id) == (test_paper.id, form_b.id)
+
+        exam_paper.delete()
+        assert get_form_paper_ids(examination.id) == (test_paper.id,)
+
+    def test_arm_requires_creator(self, api_client, another_teacher, examination):
+        """작성자만 사전 생성 가능"""
+        api_client.force_authenticate(user=another_teacher)
+        response = api_client.post(f'/api/v1/exams/{examination.id}/arm/')
+
+        assert response.status_code == 403
 
 
 @pytest.mark.django_db
@@ -10,8 +10,13 @@ from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
+from core.api.pagination import KeysetPagination
 from core.api.permissions import IsTeacher, IsExamCreator
+from examination.deadlines import EXAM_STATE_FINISHED
+from examination.eligibility import invalidate_enrollment
 from examination.models import ExaminationInfo, ExamPaperInfo, ExamStudentsInfo
+from examination.provisioning import arm_exam
+from examination.regrade import regrade_exam
 from user.models import StudentsInfo
 
 from .filters import ExaminationFilter
@@ -37,6 +42,8 @@ class ExaminationViewSet(viewsets.ModelViewSet):
     destroy: 시험 삭제 (작성자 전용)
     enroll_students: 학생 일괄 등록 (작성자 전용)
     enrolled_students: 등록된 학생 목록 조회
+    arm: 등록 학생 응시 기록 사전 생성 (작성자 전용)
+    regrade: 제출 기록 전체 재채점 (작성자 전용)
     """
 
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -65,7 +72,7 @@ class ExaminationViewSet(viewsets.ModelViewSet):
         """Action별 권한 설정"""
         if self.action == 'create':
             return [IsAuthenticated(), IsTeacher()]
-        elif self.action in ['update', 'partial_update', 'destroy', 'enroll_students']:
+        elif self.action in ['update', 'partial_update', 'destroy', 'enroll_students', 'arm', 'regrade']:
             return [IsAuthenticated(), IsExamCreator()]
         return [IsAuthenticated()]
 
@@ -120,11 +127,15 @@ class ExaminationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # 학생 등록
+        # 학생 등록 (동시 요청과 겹친 학생은 unique 제약으로 건너뜀, ON CONFLICT DO NOTHING)
         with transaction.atomic():
-            students = StudentsInfo.objects.filter(id__in=student_ids)
-            for student in students:
-                ExamStudentsInfo.objects.create(exam=exam, student=student)
+            students = StudentsInfo.objects.filter(id__in=student_ids).values_list('id', flat=True)
+            ExamStudentsInfo.objects.bulk_create(
+                [ExamStudentsInfo(exam=exam, student_id=student_id) for student_id in students],
+                ignore_conflicts=True,
+            )
+            # bulk_create는 signal이 없으므로 응시 자격 캐시 직접 무효화
+            invalidate_enrollment(exam.id)
 
             # student_num 업데이트
             exam.student_num = ExamStudentsInfo.objects.filter(exam=exam).count()
@@ -139,13 +150,55 @@ class ExaminationViewSet(viewsets.ModelViewSet):
     def enrolled_students(self, request, pk=None):
         """
         등록된 학생 목록 조회.
+
+        keyset 페이지네이션 (?cursor=, ?page_size=, ?count=approx), (exam, student) 유일 인덱스 순서.
+        """
+        exam = self.get_object()
+        enrollments = ExamStudentsInfo.objects.filter(exam=exam).select_related('student').order_by('student_id')
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(enrollments, request, view=self)
+        serializer = EnrolledStudentSerializer(page, many=True)
+
+        return Response(
+            {'exam_id': exam.id, 'exam_name': exam.name, 'students': serializer.data, 'meta': paginator.get_meta()},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=['post'])
+    def arm(self, request, pk=None):
+        """
+        응시 기록 사전 생성.
+
+        등록 마감 후 호출하면 시험 시작 시 start 요청이 INSERT 없이 처리됨.
+        이미 생성된 기록은 건너뛰므로 여러 번 호출 가능.
         """
         exam = self.get_object()
-        enrollments = ExamStudentsInfo.objects.filter(exam=exam).select_related('student')
-        serializer = EnrolledStudentSerializer(enrollments, many=True)
 
+        if exam.exam_state == EXAM_STATE_FINISHED:
+            return Response({'detail': '종료된 시험입니다.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        created = arm_exam(exam)
+        return Response(
+            {'detail': f'{created}건의 응시 기록이 생성되었습니다.', 'created': created},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=['post'])
+    def regrade(self, request, pk=None):
+        """
+        시험 전체 재채점.
+
+        정답 옵션을 수정한 뒤 호출하면 제출 기록을 현재 정답표로 다시 채점.
+        수동 채점 항목은 유지. 응시 기록이 매우 많으면 regrade_exam 명령(--workers) 사용.
+        """
+        exam = self.get_object()
+        result = regrade_exam(exam)
         return Response(
-            {'exam_id': exam.id, 'exam_name': exam.name, 'students': serializer.data},
+            {
+                'detail': f'{result.regraded}건을 재채점했습니다.',
+                'regraded': result.regraded,
+                'changed': result.changed,
+            },
             status=status.HTTP_200_OK,
         )
 
@@ -0,0 +1,132 @@
+"""
+Exam deadlines.
+
+시험 종료 시간이 지났는데 제출하지 않은 응시 기록을 임시 답안으로 채점하여 일괄 제출 처리하고,
+시험 상태(exam_state)를 시간에 맞게 갱신.
+sweep_exam_deadlines 명령(주기 실행)이 사용.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from examination.drafts import discard_draft, flush_drafts, is_write_behind
+from examination.models import ExaminationInfo
+from examination.statistics import record_submissions
+from testpaper.answer_keys import get_answer_key
+from testpaper.grading import grade_answers
+from testpaper.models import TestScores
+
+EXAM_STATE_READY = '0'
+EXAM_STATE_ONGOING = '1'
+EXAM_STATE_FINISHED = '2'
+
+
+def draft_to_answers(draft):
+    """
+    임시 답안({문제 ID: {'answer': ...}})을 채점용 답안 목록으로 변환.
+    문제 ID가 숫자가 아닌 항목은 무시.
+    """
+    answers = []
+    for question_id, value in (draft or {}).items():
+        if not str(question_id).isdigit():
+            continue
+        answer = value.get('answer', '') if isinstance(value, dict) else value
+        answers.append({'question_id': int(question_id), 'answer': answer})
+    return answers
+
+
+def advance_exam_states(now=None):
+    """
+    시험 상태 갱신 (시험 전 → 시험 중 → 시험 종료).
+    반환값: (시험 중으로 바뀐 수, 종료로 바뀐 수)
+    """
+    now = now or timezone.now()
+    started = ExaminationInfo.objects.filter(
+        exam_state=EXAM_STATE_READY, start_time__lte=now, end_time__gt=now
+    ).update(exam_state=EXAM_STATE_ONGOING)
+    finished = ExaminationInfo.objects.filter(end_time__lte=now).exclude(
+        exam_state=EXAM_STATE_FINISHED
+    ).update(exam_state=EXAM_STATE_FINISHED)
+    return started, finished
+
+
+def submit_deadline(exam):
+    """제출 마감 시간 (종료 시간 + 유예 시간)"""
+    return exam.end_time + timedelta(seconds=settings.EXAM_SUBMIT_GRACE_SECONDS)
+
+
+def expired_attempt_ids(now=None):
+    """제출 마감 시간(종료 시간 + 유예 시간)이 지났는데 제출하지 않은 응시 기록 ID"""
+    now = now or timezone.now()
+    return TestScores.objects.filter(
+        is_submitted=False,
+        start_time__isnull=False,
+        exam__end_time__lte=now - timedelta(seconds=settings.EXAM_SUBMIT_GRACE_SECONDS),
+    ).order_by('id').values_list('id', flat=True)
+
+
+def auto_submit(test_score_ids, batch_size=500):
+    """
+    임시 답안으로 채점하여 일괄 제출 처리.
+
+    제출 시간은 시험 종료 시간으로 기록하며, 그 사이 학생이 직접 제출한 기록은 건너뜀.
+    반환값: 자동 제출 처리한 기록 수
+    """
+    test_score_ids = list(test_score_ids)
+    submitted_count = 0
+
+    for start in range(0, len(test_score_ids), batch_size):
+        chunk = test_score_ids[start:start + batch_size]
+        if is_write_behind():
+            # 버퍼에만 있는 최신 임시 답안 먼저 반영
+            flush_drafts(chunk, batch_size=batch_size)
+
+        with transaction.atomic():
+            test_scores = list(
+                TestScores.objects.select_for_update(skip_locked=True, of=('self',))
+                .filter(id__in=chunk, is_submitted=False)
+                .select_related('exam', 'test_paper')
+            )
+            for test_score in test_scores:
+                answer_key = get_answer_key(test_score.test_paper_id)
+                total_score, detail_records = grade_answers(answer_key, draft_to_answers(test_score.detail_records))
+
+                submit_time = test_score.exam.end_time
+                test_score.test_score = total_score
+                test_score.detail_records = detail_records
+                test_score.submit_time = submit_time
+                test_score.is_submitted = True
+                test_score.time_used = max(0, int((submit_time - test_score.start_time).total_seconds() / 60))
+
+            TestScores.objects.bulk_update(
+                test_scores, ['test_score', 'detail_records', 'submit_time', 'is_submitted', 'time_used']
+            )
+
+            # 시험 통계 누적 (시험/시험지별)
+            submitted_scores = {}
+            for test_score in test_scores:
+                if test_score.test_paper:
+                    key = (test_score.exam_id, test_score.test_paper_id, test_score.test_paper.passing_score)
+                    submitted_scores.setdefault(key, []).append(test_score.test_score)
+            for (exam_id, paper_id, passing_score), scores in submitted_scores.items():
+                record_submissions(exam_id, paper_id, passing_score, scores)
+
+        if is_write_behind():
+            for test_score in test_scores:
+                discard_draft(test_score.id)
+        submitted_count += len(test_scores)
+
+    return submitted_count
+
+
+def sweep_deadlines(now=None, batch_size=500):
+    """
+    마감 처리 1회 실행.
+    반환값: (자동 제출 수, 종료로 바뀐 시험 수)
+    """
+    now = now or timezone.now()
+    submitted = auto_submit(expired_attempt_ids(now), batch_size=batch_size)
+    _, finished = advance_exam_states(now)
+    return submitted, finished
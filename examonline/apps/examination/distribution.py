@@ -0,0 +1,163 @@
+"""
+Exam score distribution.
+
+제출 점수의 히스토그램, 사분위수/중앙값, 표준편차, 백분위수를 계산하여
+(시험, 구간 수, 백분위수, 시험 통계 버전) 키로 캐시. 점수가 바뀌면 통계 버전이 증가하므로 별도 무효화 불필요.
+
+- PostgreSQL: percentile_cont/stddev_pop/width_bucket으로 쿼리 1회에 계산
+- 그 외 DB(SQLite 등): 점수별 인원만 SQL로 집계하고 NumPy로 계산 (numpy 필요: analytics extra)
+어느 경우에도 제출 기록 행을 Python으로 읽지 않음.
+"""
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Max
+
+from core.cache import get_or_build, get_version
+from examination.item_analysis import numpy_available
+from examination.statistics import STATISTICS_VERSION_NAMESPACE
+from testpaper.models import TestPaperInfo, TestScores
+
+# 기본 백분위수 (사분위수/중앙값은 항상 포함)
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+QUARTILES = (25, 50, 75)
+DEFAULT_BUCKETS = 10
+
+_DISTRIBUTION_SQL = '''
+WITH scores AS (
+    SELECT s.test_score AS score, p.total_score AS total
+    FROM {scores_table} s JOIN {papers_table} p ON p.id = s.test_paper_id
+    WHERE s.exam_id = %(exam_id)s AND s.is_submitted
+), summary AS (
+    SELECT
+        count(*) AS n,
+        avg(score)::float8 AS mean,
+        stddev_pop(score)::float8 AS stddev,
+        min(score) AS lowest,
+        max(score) AS highest,
+        GREATEST(max(total), max(score), 1) AS upper,
+        percentile_cont(%(fractions)s::float8[]) WITHIN GROUP (ORDER BY score) AS percentiles
+    FROM scores
+)
+SELECT summary.n, summary.mean, summary.stddev, summary.lowest, summary.highest, summary.upper,
+    summary.percentiles,
+    (
+        SELECT coalesce(json_agg(json_build_array(bucket, bucket_count)), '[]'::json)
+        FROM (
+            SELECT LEAST(width_bucket(score::float8, 0, summary.upper, %(buckets)s::int), %(buckets)s::int) AS bucket,
+                count(*) AS bucket_count
+            FROM scores GROUP BY 1
+        ) histogram
+    )
+FROM summary
+'''
+
+
+def _postgres_distribution(exam_id, percentiles, buckets):
+    sql = _DISTRIBUTION_SQL.format(
+        scores_table=TestScores._meta.db_table, papers_table=TestPaperInfo._meta.db_table
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql, {'exam_id': exam_id, 'fractions': [p / 100 for p in percentiles], 'buckets': buckets}
+        )
+        count, mean, stddev, lowest, highest, upper, values, histogram = cursor.fetchone()
+
+    if not count:
+        return None
+    return {
+        'count': count,
+        'mean': mean,
+        'stddev': stddev,
+        'lowest': lowest,
+        'highest': highest,
+        'upper': upper,
+        'percentiles': list(values),
+        'bucket_counts': dict(histogram),
+    }
+
+
+def _numpy_distribution(exam_id, percentiles, buckets):
+    import numpy as np
+
+    submitted = TestScores.objects.filter(exam_id=exam_id, is_submitted=True, test_paper__isnull=False)
+    score_counts = list(submitted.values_list('test_score').annotate(n=Count('id')).order_by())
+    if not score_counts:
+        return None
+
+    values = np.repeat(*np.array(score_counts, dtype=np.int64).T)
+    total = submitted.aggregate(total=Max('test_paper__total_score'))['total'] or 0
+    upper = max(total, int(values.max()), 1)
+    bucket_ids = np.minimum(np.floor(values / upper * buckets).astype(np.int64) + 1, buckets)
+    bucket_ids, bucket_counts = np.unique(bucket_ids, return_counts=True)
+
+    return {
+        'count': int(values.size),
+        'mean': float(values.mean()),
+        'stddev': float(values.std()),
+        'lowest': int(values.min()),
+        'highest': int(values.max()),
+        'upper': upper,
+        'percentiles': np.percentile(values, percentiles).tolist(),
+        'bucket_counts': dict(zip(bucket_ids.tolist(), bucket_counts.tolist(), strict=True)),
+    }
+
+
+def distribution_available():
+    """점수 분포 계산 가능 여부 (PostgreSQL이 아니면 numpy 필요)"""
+    return connection.vendor == 'postgresql' or numpy_available()
+
+
+def build_distribution(exam_id, percentiles=DEFAULT_PERCENTILES, buckets=DEFAULT_BUCKETS):
+    """
+    점수 분포 계산.
+    percentiles: 0~100 백분위수 목록, buckets: 히스토그램 구간 수 (0점 ~ 시험지 총점을 균등 분할)
+    """
+    percentiles = sorted(set(percentiles) | set(QUARTILES))
+    if connection.vendor == 'postgresql':
+        result = _postgres_distribution(exam_id, percentiles, buckets)
+    else:
+        result = _numpy_distribution(exam_id, percentiles, buckets)
+
+    if result is None:
+        return {
+            'count': 0,
+            'mean': 0,
+            'median': None,
+            'stddev': 0,
+            'lowest': None,
+            'highest': None,
+            'quartiles': None,
+            'percentiles': {},
+            'histogram': [],
+        }
+
+    values = dict(zip(percentiles, (round(value, 2) for value in result['percentiles']), strict=True))
+    width = result['upper'] / buckets
+    return {
+        'count': result['count'],
+        'mean': round(result['mean'], 2),
+        'median': values[50],
+        'stddev': round(result['stddev'], 2),
+        'lowest': result['lowest'],
+        'highest': result['highest'],
+        'quartiles': {'q1': values[25], 'q2': values[50], 'q3': values[75]},
+        'percentiles': {f'{p:g}': value for p, value in values.items()},
+        'histogram': [
+            {
+                'lower': round(width * (bucket - 1), 2),
+                'upper': round(width * bucket, 2),
+                'count': result['bucket_counts'].get(bucket, 0),
+            }
+            for bucket in range(1, buckets + 1)
+        ],
+    }
+
+
+def get_distribution(exam_id, percentiles=DEFAULT_PERCENTILES, buckets=DEFAULT_BUCKETS):
+    """점수 분포 조회 (캐시 우선, 다음 제출/채점까지 유지)"""
+    percentile_key = ','.join(f'{p:g}' for p in sorted(set(percentiles)))
+    return get_or_build(
+        f'exam_distribution:{exam_id}:{buckets}:{percentile_key}:{get_version(STATISTICS_VERSION_NAMESPACE, exam_id)}',
+        lambda: build_distribution(exam_id, percentiles, buckets),
+        timeout=settings.EXAM_DISTRIBUTION_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,181 @@
+"""
+Draft answers.
+
+- 부분 저장(patch): 변경된 문제만 client 순번(seq)과 함께 병합, 오래된/중복 patch는 거부
+- write-behind 버퍼: EXAM_DRAFT_WRITE_BEHIND가 켜져 있으면 임시 답안은 Redis(CACHES)에만 저장하고,
+  flush_exam_drafts 명령(주기 실행)이 TestScores.detail_records에 일괄 반영.
+  submit은 요청 답안으로 채점/저장하므로 버퍼의 임시 답안은 폐기.
+"""
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F, JSONField, Value
+from django.utils import timezone
+
+from core.db import JSONBConcat, supports_jsonb
+from testpaper.models import TestScores
+
+
+def _draft_key(test_score_id):
+    return f'exam_draft:{test_score_id}'
+
+
+def _flushed_key(test_score_id):
+    return f'exam_draft_flushed:{test_score_id}'
+
+
+def is_write_behind():
+    """write-behind 모드 여부"""
+    return settings.EXAM_DRAFT_WRITE_BEHIND
+
+
+def _lock_key(test_score_id):
+    return f'exam_draft_lock:{test_score_id}'
+
+
+@contextmanager
+def _draft_lock(test_score_id, timeout=5):
+    """버퍼 항목 read-modify-write 보호용 짧은 캐시 잠금"""
+    key = _lock_key(test_score_id)
+    deadline = time.monotonic() + timeout
+    while not cache.add(key, 1, timeout):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f'임시 답안 잠금 획득 실패: {test_score_id}')
+        time.sleep(0.01)
+    try:
+        yield
+    finally:
+        cache.delete(key)
+
+
+def _read_buffer(test_score):
+    """버퍼 항목 조회 (없으면 DB 값으로 초기화)"""
+    draft = cache.get(_draft_key(test_score.id))
+    if draft is None:
+        return {'answers': test_score.detail_records or {}, 'seq': test_score.draft_seq}
+    # 순번 도입 이전에 버퍼된 항목
+    draft.setdefault('seq', test_score.draft_seq)
+    return draft
+
+
+def _write_buffer(test_score_id, answers, seq):
+    # revision은 flush 여부 판단용
+    cache.set(
+        _draft_key(test_score_id),
+        {'answers': answers, 'seq': seq, 'revision': uuid.uuid4().hex},
+        settings.EXAM_DRAFT_CACHE_TIMEOUT,
+    )
+
+
+def buffer_draft(test_score, answers):
+    """임시 답안 전체를 버퍼에 저장 (patch 순번은 유지)"""
+    with _draft_lock(test_score.id):
+        _write_buffer(test_score.id, answers, _read_buffer(test_score)['seq'])
+
+
+def patch_draft(test_score, answers, seq):
+    """
+    변경된 문제의 답안만 병합.
+
+    seq가 마지막으로 반영된 순번보다 커야 반영 (순서 뒤바뀜/중복 재전송 거부).
+    - write-behind: 버퍼 항목을 잠금 후 병합
+    - PostgreSQL: jsonb || 연산으로 DB에서 원자적으로 병합
+    - 그 외 DB: 행 잠금 후 Python에서 병합
+    반환값: 반영 여부
+    """
+    if is_write_behind():
+        with _draft_lock(test_score.id):
+            draft = _read_buffer(test_score)
+            if seq <= draft['seq']:
+                return False
+            _write_buffer(test_score.id, {**draft['answers'], **answers}, seq)
+        return True
+
+    if supports_jsonb(connection):
+        updated = TestScores.objects.filter(id=test_score.id, is_submitted=False, draft_seq__lt=seq).update(
+            detail_records=JSONBConcat(F('detail_records'), Value(answers, output_field=JSONField())),
+            draft_seq=seq,
+        )
+        return updated == 1
+
+    with transaction.atomic():
+        locked = TestScores.objects.select_for_update().get(id=test_score.id)
+        if locked.is_submitted or seq <= locked.draft_seq:
+            return False
+        locked.detail_records = {**(locked.detail_records or {}), **answers}
+        locked.draft_seq = seq
+        locked.save(update_fields=['detail_records', 'draft_seq'])
+    return True
+
+
+def current_draft_seq(test_score):
+    """마지막으로 반영된 patch 순번"""
+    if is_write_behind():
+        return _read_buffer(test_score)['seq']
+    return TestScores.objects.filter(id=test_score.id).values_list('draft_seq', flat=True).first()
+
+
+def get_buffered_draft(test_score_id):
+    """버퍼의 최신 임시 답안 (없으면 None)"""
+    draft = cache.get(_draft_key(test_score_id))
+    return draft['answers'] if draft else None
+
+
+def discard_draft(test_score_id):
+    """버퍼의 임시 답안 삭제 (제출 완료 등)"""
+    cache.delete_many([_draft_key(test_score_id), _flushed_key(test_score_id)])
+
+
+def active_attempt_ids(grace_minutes=10):
+    """임시 답안이 있을 수 있는 응시 기록 ID (시작했고 미제출, 시험 종료 직후까지)"""
+    threshold = timezone.now() - timedelta(minutes=grace_minutes)
+    return TestScores.objects.filter(
+        is_submitted=False, start_time__isnull=False, exam__end_time__gte=threshold
+    ).values_list('id', flat=True)
+
+
+def flush_drafts(test_score_ids, batch_size=500):
+    """
+    버퍼의 임시 답안을 TestScores.detail_records에 일괄 반영.
+
+    마지막 flush 이후 변경된 답안만 반영하며, 이미 제출된 기록은 덮어쓰지 않음.
+    반환값: 반영한 기록 수
+    """
+    test_score_ids = list(test_score_ids)
+    flushed_count = 0
+
+    for start in range(0, len(test_score_ids), batch_size):
+        chunk = test_score_ids[start:start + batch_size]
+        drafts = cache.get_many([_draft_key(i) for i in chunk])
+        flushed = cache.get_many([_flushed_key(i) for i in chunk])
+
+        dirty = {}
+        for test_score_id in chunk:
+            draft = drafts.get(_draft_key(test_score_id))
+            if draft and draft['revision'] != flushed.get(_flushed_key(test_score_id)):
+                dirty[test_score_id] = draft
+        if not dirty:
+            continue
+
+        with transaction.atomic():
+            # 제출과 경합 시 행 잠금으로 직렬화, 제출된 기록은 제외
+            writable = TestScores.objects.select_for_update().filter(
+                id__in=list(dirty), is_submitted=False
+            ).values_list('id', flat=True)
+            objs = [
+                TestScores(id=i, detail_records=dirty[i]['answers'], draft_seq=dirty[i].get('seq', 0)) for i in writable
+            ]
+            TestScores.objects.bulk_update(objs, ['detail_records', 'draft_seq'])
+
+        cache.set_many(
+            {_flushed_key(obj.id): dirty[obj.id]['revision'] for obj in objs},
+            settings.EXAM_DRAFT_CACHE_TIMEOUT,
+        )
+        flushed_count += len(objs)
+
+    return flushed_count
@@ -0,0 +1,48 @@
+"""
+Exam eligibility cache.
+시험별 등록 학생 ID를 정렬된 정수 배열로 캐시하여 응시 자격 확인을 쿼리 없이 처리.
+
+조회 순서: 프로세스 로컬 LRU -> Redis -> DB
+학생 등록/삭제 시 시험 버전을 증가시켜 무효화 (enroll_students, signals).
+"""
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+
+from core.cache import LocalLRUCache, bump_version, get_or_build, get_version
+from examination.models import ExamStudentsInfo
+
+ENROLLMENT_VERSION_NAMESPACE = 'exam_enrollment'
+
+_local_enrollments = LocalLRUCache(maxsize=settings.LOCAL_CACHE_MAXSIZE)
+
+
+def build_enrolled_ids(exam_id):
+    """시험 등록 학생 ID (정렬된 정수 배열)"""
+    student_ids = ExamStudentsInfo.objects.filter(exam_id=exam_id).order_by('student_id').values_list(
+        'student_id', flat=True
+    )
+    return array('q', student_ids)
+
+
+def get_enrolled_ids(exam_id):
+    """시험 등록 학생 ID 조회 (캐시 우선)"""
+    return get_or_build(
+        f'exam_enrollment:{exam_id}:{get_version(ENROLLMENT_VERSION_NAMESPACE, exam_id)}',
+        lambda: build_enrolled_ids(exam_id),
+        local_cache=_local_enrollments,
+        timeout=settings.EXAM_ENROLLMENT_CACHE_TIMEOUT,
+    )
+
+
+def is_enrolled(exam_id, student_id):
+    """응시 자격 확인 (이진 탐색)"""
+    student_ids = get_enrolled_ids(exam_id)
+    index = bisect_left(student_ids, student_id)
+    return index < len(student_ids) and student_ids[index] == student_id
+
+
+def invalidate_enrollment(exam_id):
+    """등록 학생 캐시 무효화 (버전 증가)"""
+    bump_version(ENROLLMENT_VERSION_NAMESPACE, exam_id)
@@ -0,0 +1,263 @@
+"""
+Exam item analysis.
+
+제출 기록의 detail_records로 문항별 난이도(정답률, p-value), 변별도(점-이연 상관계수),
+상/하위 27% 집단 정답률과 변별 지수, 선택지별 선택 빈도를 계산.
+- 응시자 x 문항 득점률 행렬과 응시자 x 선택지 선택 행렬을 한 번에 만들고 NumPy로 일괄 계산
+  (문항별 쿼리 없음, 제출 기록은 iterator로 한 번만 읽음)
+- 득점률: 문항 점수 / 배점 (자동 채점 문항은 정답 여부와 같고, 수동 채점 부분 점수도 반영)
+- 총점: 시험지 총점 대비 비율 (시험지(형)마다 총점이 달라도 비교 가능)
+- 시험지(형)에 없는 문항은 해당 응시자를 제외하고 계산
+
+5,000명 규모 시험에서도 조회가 느려지지 않도록 계산은 analyze_items 명령(worker)이 하고
+결과는 ItemAnalysis 행에 시험 통계 버전과 함께 저장. 조회 시 버전이 다르면 재계산을 요청하고
+이전 결과를 그대로 반환.
+numpy(analytics extra)가 없으면 API/명령에서 바로 오류 응답 (numpy_available).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.cache import get_version
+from examination.models import ExamPaperInfo, ItemAnalysis
+from examination.statistics import STATISTICS_VERSION_NAMESPACE
+from testpaper.grading import OPTION_GRADED_TYPES, selected_option_ids
+from testpaper.models import TestPaperTestQ, TestScores
+from testquestion.models import OptionInfo
+
+# 상/하위 집단 비율
+GROUP_RATIO = 0.27
+
+
+def numpy_available():
+    """문항 분석 가능 여부 (numpy 설치)"""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _round(value):
+    return None if value is None else round(float(value), 4)
+
+
+def _load_questions(exam_id):
+    """
+    시험 문항 목록과 시험지별 문항 배점.
+    반환값: (문항 목록, {시험지 ID: {문항 ID: 배점}}, 선택지 목록)
+    """
+    paper_ids = ExamPaperInfo.objects.filter(exam_id=exam_id).values('paper_id')
+    questions = {}
+    paper_scores = {}
+    rows = (
+        TestPaperTestQ.objects.filter(test_paper_id__in=paper_ids)
+        .order_by('order', 'test_question_id')
+        .values_list('test_paper_id', 'test_question_id', 'score', 'test_question__name', 'test_question__tq_type')
+    )
+    for paper_id, question_id, score, name, tq_type in rows:
+        paper_scores.setdefault(paper_id, {})[question_id] = score
+        questions.setdefault(question_id, {'question_id': question_id, 'name': name, 'tq_type': tq_type})
+
+    options = list(
+        OptionInfo.objects.filter(
+            test_question_id__in=[q['question_id'] for q in questions.values() if q['tq_type'] in OPTION_GRADED_TYPES]
+        )
+        .order_by('test_question_id', 'id')
+        .values_list('test_question_id', 'id', 'option', 'is_right')
+    )
+    return list(questions.values()), paper_scores, options
+
+
+def build_item_analysis(exam_id, chunk_size=2000):
+    """문항 분석 계산 (numpy 필요)"""
+    import numpy as np
+
+    questions, paper_scores, options = _load_questions(exam_id)
+    paper_totals = {paper_id: sum(scores.values()) for paper_id, scores in paper_scores.items()}
+    question_index = {question['question_id']: index for index, question in enumerate(questions)}
+    option_index = {str(option_id): index for index, (_, option_id, _, _) in enumerate(options)}
+    option_question = np.array([question_index[question_id] for question_id, *_ in options], dtype=np.int64)
+
+    submitted = TestScores.objects.filter(exam_id=exam_id, is_submitted=True, test_paper_id__in=paper_scores)
+    count = submitted.count()
+    presented = np.zeros((count, len(questions)), dtype=bool)
+    earned = np.zeros((count, len(questions)))
+    selected = np.zeros((count, len(options)), dtype=bool)
+    totals = np.zeros(count)
+
+    rows = submitted.order_by('id').values_list('test_paper_id', 'test_score', 'detail_records')
+    for row, (paper_id, test_score, detail_records) in enumerate(rows.iterator(chunk_size=chunk_size)):
+        if row >= count:
+            break
+        scores = paper_scores[paper_id]
+        totals[row] = test_score / paper_totals[paper_id] if paper_totals[paper_id] else 0
+        for question_id in scores:
+            presented[row, question_index[question_id]] = True
+        for question_id, record in (detail_records or {}).items():
+            max_score = scores.get(int(question_id)) if question_id.isdigit() else None
+            if not max_score or not isinstance(record, dict):
+                continue
+            column = question_index[int(question_id)]
+            earned[row, column] = min(record.get('score', 0) / max_score, 1)
+            for option_id in selected_option_ids(record.get('answer', '')):
+                index = option_index.get(option_id)
+                if index is not None and option_question[index] == column:
+                    selected[row, index] = True
+
+    # 상/하위 27% 집단 (총점 비율 기준, 동점은 먼저 제출된 기록 순)
+    group_size = max(1, round(count * GROUP_RATIO)) if count else 0
+    order = np.argsort(-totals, kind='stable')
+    upper = np.zeros(count, dtype=bool)
+    lower = np.zeros(count, dtype=bool)
+    upper[order[:group_size]] = True
+    lower[order[count - group_size:]] = True
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # 문항별 응시자 수/정답률
+        presented_count = presented.sum(axis=0)
+        p_values = np.where(presented, earned, 0).sum(axis=0) / presented_count
+
+        # 점-이연 상관계수 (문항 득점률과 총점 비율의 상관, 문항을 받은 응시자만)
+        total_matrix = np.where(presented, totals[:, None], 0)
+        total_means = total_matrix.sum(axis=0) / presented_count
+        earned_dev = np.where(presented, earned - p_values, 0)
+        total_dev = np.where(presented, totals[:, None] - total_means, 0)
+        covariance = (earned_dev * total_dev).sum(axis=0)
+        spread = np.sqrt((earned_dev ** 2).sum(axis=0) * (total_dev ** 2).sum(axis=0))
+        point_biserial = np.where(spread > 0, covariance / spread, np.nan)
+
+        def group_p(group):
+            group_presented = presented & group[:, None]
+            return np.where(group_presented, earned, 0).sum(axis=0) / group_presented.sum(axis=0)
+
+        upper_p, lower_p = group_p(upper), group_p(lower)
+
+    option_counts = selected.sum(axis=0)
+    option_upper = selected[upper].sum(axis=0)
+    option_lower = selected[lower].sum(axis=0)
+
+    def finite(values, index):
+        value = values[index]
+        return _round(value) if np.isfinite(value) else None
+
+    items = []
+    for index, question in enumerate(questions):
+        item_options = []
+        for position in np.flatnonzero(option_question == index):
+            _, option_id, option, is_right = options[position]
+            item_options.append(
+                {
+                    'option_id': option_id,
+                    'option': option,
+                    'is_right': is_right,
+                    'count': int(option_counts[position]),
+                    'ratio': (
+                        _round(option_counts[position] / presented_count[index]) if presented_count[index] else None
+                    ),
+                    'upper_count': int(option_upper[position]),
+                    'lower_count': int(option_lower[position]),
+                }
+            )
+        upper_value, lower_value = finite(upper_p, index), finite(lower_p, index)
+        items.append(
+            {
+                **question,
+                'presented_count': int(presented_count[index]),
+                'p_value': finite(p_values, index),
+                'point_biserial': finite(point_biserial, index),
+                'upper_p': upper_value,
+                'lower_p': lower_value,
+                'discrimination_index': (
+                    _round(upper_value - lower_value) if upper_value is not None and lower_value is not None else None
+                ),
+                'options': item_options,
+            }
+        )
+
+    return {'student_count': count, 'group_size': group_size, 'questions': items}
+
+
+def request_analysis(exam_id):
+    """
+    문항 분석 조회.
+
+    현재 시험 통계 버전으로 계산된 결과가 없으면 재계산을 요청(대기 상태로 변경).
+    반환값: (ItemAnalysis, 최신 결과 여부)
+    """
+    version = get_version(STATISTICS_VERSION_NAMESPACE, exam_id)
+    ItemAnalysis.objects.bulk_create(
+        [ItemAnalysis(exam_id=exam_id, requested_version=version)], ignore_conflicts=True
+    )
+    analysis = ItemAnalysis.objects.get(exam_id=exam_id)
+    if analysis.report_version == version:
+        return analysis, True
+
+    # 같은 버전으로 이미 대기/처리 중이면 그대로 둠
+    requested = (
+        ItemAnalysis.objects.filter(id=analysis.id)
+        .exclude(
+            requested_version=version,
+            status__in=[ItemAnalysis.STATUS_PENDING, ItemAnalysis.STATUS_PROCESSING],
+        )
+        .update(status=ItemAnalysis.STATUS_PENDING, requested_version=version, request_time=timezone.now())
+    )
+    if requested:
+        analysis.refresh_from_db()
+    return analysis, False
+
+
+def claim_analyses(limit):
+    """
+    처리할 문항 분석 요청 선점.
+
+    다른 worker가 잠근 행은 건너뛰며(SKIP LOCKED), 처리 중 상태로 오래 남은 요청은 재시도 대상.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.ITEM_ANALYSIS_STALE_SECONDS)
+
+    with transaction.atomic():
+        analysis_ids = list(
+            ItemAnalysis.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=ItemAnalysis.STATUS_PENDING)
+                | Q(status=ItemAnalysis.STATUS_PROCESSING, started_time__lt=stale_before)
+            )
+            .order_by('request_time', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        ItemAnalysis.objects.filter(id__in=analysis_ids).update(
+            status=ItemAnalysis.STATUS_PROCESSING, started_time=now
+        )
+
+    return list(ItemAnalysis.objects.filter(id__in=analysis_ids).order_by('request_time', 'id'))
+
+
+def run_analysis(analysis):
+    """문항 분석 1건 계산 후 저장"""
+    # 계산 전에 버전을 읽어 두면 계산 중 제출/채점이 있어도 다음 조회에서 재계산됨
+    version = get_version(STATISTICS_VERSION_NAMESPACE, analysis.exam_id)
+    try:
+        report = build_item_analysis(analysis.exam_id)
+    except Exception as e:
+        ItemAnalysis.objects.filter(id=analysis.id).update(
+            status=ItemAnalysis.STATUS_FAILED, error=str(e), finished_time=timezone.now()
+        )
+        return False
+
+    # 처리 중에 새 버전으로 다시 요청되었으면 대기 상태 유지
+    finished = ItemAnalysis.objects.filter(id=analysis.id)
+    finished.update(report=report, report_version=version, error='', finished_time=timezone.now())
+    finished.filter(requested_version=analysis.requested_version).update(status=ItemAnalysis.STATUS_DONE)
+    return True
+
+
+def process_analyses(limit=10):
+    """
+    대기 중인 문항 분석 처리.
+    반환값: 계산 완료 건수
+    """
+    return sum(run_analysis(analysis) for analysis in claim_analyses(limit))
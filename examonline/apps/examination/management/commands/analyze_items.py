@@ -0,0 +1,36 @@
+"""
+문항 분석 worker 명령.
+
+사용법:
+    python manage.py analyze_items               # 대기 요청 1회 처리
+    python manage.py analyze_items --interval 5  # 5초 주기 반복 실행 (worker)
+
+문항 분석 API가 요청을 기록하면 이 명령이 계산하여 저장 (numpy 필요: analytics extra).
+여러 프로세스로 실행해도 요청은 SKIP LOCKED로 나뉘어 중복 처리되지 않음.
+"""
+from django.core.management.base import CommandError
+
+from core.commands import PollingCommand
+from examination.item_analysis import numpy_available, process_analyses
+
+
+class Command(PollingCommand):
+    help = '대기 중인 시험 문항 분석 요청을 처리합니다.'
+
+    interval_type = float
+    interval_help = '대기 요청이 없을 때 반복 주기 (초, 0이면 1회 실행)'
+    drain = True
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--batch-size', type=int, default=10, help='한 번에 선점할 요청 수')
+
+    def handle(self, *args, **options):
+        if not numpy_available():
+            raise CommandError('문항 분석에는 numpy가 필요합니다 (analytics extra 설치).')
+        super().handle(*args, **options)
+
+    def run_once(self, **options):
+        count = process_analyses(limit=options['batch_size'])
+        self.stdout.write(f'{count}개 시험의 문항 분석을 완료했습니다.')
+        return count
@@ -0,0 +1,27 @@
+"""
+응시 기록 사전 생성 명령.
+
+사용법:
+    python manage.py arm_exams                        # 30분 안에 시작하는 시험
+    python manage.py arm_exams --lead-minutes 60
+    python manage.py arm_exams --interval 300         # 5분 주기 반복 실행
+"""
+from core.commands import PollingCommand
+from examination.provisioning import arm_exam, exams_to_arm
+
+
+class Command(PollingCommand):
+    help = '곧 시작하는 시험의 등록 학생 응시 기록(TestScores)을 미리 생성합니다.'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--lead-minutes', type=int, default=30, help='시작 몇 분 전부터 생성할지')
+        parser.add_argument('--batch-size', type=int, default=1000, help='bulk_create 배치 크기')
+
+    def run_once(self, **options):
+        created = sum(
+            arm_exam(exam, batch_size=options['batch_size'])
+            for exam in exams_to_arm(options['lead_minutes'])
+        )
+        self.stdout.write(f'{created}건의 응시 기록을 생성했습니다.')
+        return created
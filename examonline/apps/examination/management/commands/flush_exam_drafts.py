@@ -0,0 +1,22 @@
+"""
+임시 답안 버퍼 flush 명령.
+
+사용법:
+    python manage.py flush_exam_drafts                # 1회 실행
+    python manage.py flush_exam_drafts --interval 30  # 30초 주기 반복 실행
+"""
+from core.commands import PollingCommand
+from examination.drafts import active_attempt_ids, flush_drafts
+
+
+class Command(PollingCommand):
+    help = '버퍼(Redis)에 쌓인 시험 임시 답안을 TestScores에 일괄 반영합니다.'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--batch-size', type=int, default=500, help='bulk_update 배치 크기')
+
+    def run_once(self, **options):
+        count = flush_drafts(active_attempt_ids(), batch_size=options['batch_size'])
+        self.stdout.write(f'{count}건의 임시 답안을 반영했습니다.')
+        return count
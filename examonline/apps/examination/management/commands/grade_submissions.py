@@ -0,0 +1,28 @@
+"""
+채점 worker 명령 (비동기 제출 모드).
+
+사용법:
+    python manage.py grade_submissions               # 대기 작업 1회 처리
+    python manage.py grade_submissions --interval 1  # 1초 주기 반복 실행 (worker)
+
+여러 프로세스로 실행해도 작업은 SKIP LOCKED로 나뉘어 중복 처리되지 않음.
+"""
+from core.commands import PollingCommand
+from examination.submissions import process_jobs
+
+
+class Command(PollingCommand):
+    help = '대기 중인 시험 답안 채점 작업을 처리합니다.'
+
+    interval_type = float
+    interval_help = '대기 작업이 없을 때 반복 주기 (초, 0이면 1회 실행)'
+    drain = True
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--batch-size', type=int, default=100, help='한 번에 선점할 작업 수')
+
+    def run_once(self, **options):
+        count = process_jobs(limit=options['batch_size'])
+        self.stdout.write(f'{count}건의 답안을 채점했습니다.')
+        return count
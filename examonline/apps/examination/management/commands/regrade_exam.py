@@ -0,0 +1,32 @@
+"""
+시험 재채점 명령.
+
+사용법:
+    python manage.py regrade_exam 12                 # 시험 ID 12 재채점
+    python manage.py regrade_exam 12 --workers 4     # 프로세스 4개로 병렬 재채점
+    python manage.py regrade_exam 12 --chunk-size 5000
+
+정답 옵션(OptionInfo.is_right) 수정 후 실행. 수동 채점 항목은 유지.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from examination.models import ExaminationInfo
+from examination.regrade import regrade_exam
+
+
+class Command(BaseCommand):
+    help = '시험의 제출 기록을 현재 정답표로 다시 채점합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('exam_id', type=int, help='시험 ID')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='한 번에 읽고 저장할 기록 수')
+        parser.add_argument('--workers', type=int, default=1, help='재채점 프로세스 수 (1이면 현재 프로세스)')
+
+    def handle(self, *args, **options):
+        try:
+            exam = ExaminationInfo.objects.get(id=options['exam_id'])
+        except ExaminationInfo.DoesNotExist:
+            raise CommandError(f'시험을 찾을 수 없습니다: {options["exam_id"]}') from None
+
+        result = regrade_exam(exam, chunk_size=options['chunk_size'], workers=options['workers'])
+        self.stdout.write(f'{result.regraded}건을 재채점했고 {result.changed}건의 점수가 바뀌었습니다.')
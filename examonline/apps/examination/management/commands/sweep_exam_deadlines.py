@@ -0,0 +1,22 @@
+"""
+시험 마감 처리 명령.
+
+사용법:
+    python manage.py sweep_exam_deadlines                # 1회 실행
+    python manage.py sweep_exam_deadlines --interval 30  # 30초 주기 반복 실행
+"""
+from core.commands import PollingCommand
+from examination.deadlines import sweep_deadlines
+
+
+class Command(PollingCommand):
+    help = '종료된 시험의 미제출 응시 기록을 임시 답안으로 자동 제출하고 시험 상태를 갱신합니다.'
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--batch-size', type=int, default=500, help='bulk_update 배치 크기')
+
+    def run_once(self, **options):
+        submitted, finished = sweep_deadlines(batch_size=options['batch_size'])
+        self.stdout.write(f'{submitted}건을 자동 제출하고 {finished}개 시험을 종료 처리했습니다.')
+        return submitted + finished
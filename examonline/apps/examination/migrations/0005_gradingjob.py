@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:39
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examination', '0004_alter_examinationinfo_create_time_and_more'),
+        ('testpaper', '0006_testscores_draft_seq'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradingJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answers', models.JSONField(default=list, verbose_name='제출 답안')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('processing', '채점 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='시도 횟수')),
+                ('error', models.TextField(blank=True, default='', verbose_name='오류 내용')),
+                ('create_time', models.DateTimeField(default=django.utils.timezone.now, verbose_name='생성 시간')),
+                ('started_time', models.DateTimeField(blank=True, null=True, verbose_name='처리 시작 시간')),
+                ('finished_time', models.DateTimeField(blank=True, null=True, verbose_name='처리 완료 시간')),
+                ('test_score', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='testpaper.testscores', verbose_name='응시 기록')),
+            ],
+            options={
+                'verbose_name': '채점 작업',
+                'verbose_name_plural': '채점 작업',
+                'indexes': [models.Index(fields=['status', 'create_time'], name='examination_status_a236f3_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:51
+
+from django.db import migrations
+from django.db.models import Count, Min
+
+
+def remove_duplicate_enrollments(apps, schema_editor):
+    """(시험, 학생) 중복 등록은 가장 먼저 생성된 행만 유지"""
+    ExamStudentsInfo = apps.get_model('examination', 'ExamStudentsInfo')
+    duplicates = (
+        ExamStudentsInfo.objects.values('exam_id', 'student_id')
+        .annotate(keep_id=Min('id'), row_count=Count('id'))
+        .filter(row_count__gt=1)
+    )
+    for row in duplicates:
+        ExamStudentsInfo.objects.filter(exam_id=row['exam_id'], student_id=row['student_id']).exclude(
+            id=row['keep_id']
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examination', '0005_gradingjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_enrollments, migrations.RunPython.noop),
+    ]
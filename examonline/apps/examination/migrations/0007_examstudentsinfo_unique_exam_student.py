@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examination', '0006_remove_duplicate_enrollments'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='examstudentsinfo',
+            constraint=models.UniqueConstraint(fields=('exam', 'student'), name='unique_exam_student'),
+        ),
+    ]
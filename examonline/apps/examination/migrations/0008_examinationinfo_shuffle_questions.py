@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examination', '0007_examstudentsinfo_unique_exam_student'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='examinationinfo',
+            name='shuffle_questions',
+            field=models.BooleanField(default=False, verbose_name='문제/선택지 무작위 배치'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examination', '0008_examinationinfo_shuffle_questions'),
+        ('testpaper', '0008_testscores_unique_exam_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submitted_count', models.PositiveIntegerField(default=0, verbose_name='제출 수')),
+                ('score_sum', models.BigIntegerField(default=0, verbose_name='점수 합계')),
+                ('pass_count', models.PositiveIntegerField(default=0, verbose_name='합격 수')),
+                ('highest_score', models.IntegerField(blank=True, null=True, verbose_name='최고 점수')),
+                ('lowest_score', models.IntegerField(blank=True, null=True, verbose_name='최저 점수')),
+                ('edit_time', models.DateTimeField(auto_now=True, verbose_name='수정 시간')),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='examination.examinationinfo', verbose_name='시험 정보')),
+                ('paper', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='testpaper.testpaperinfo', verbose_name='시험지 정보')),
+            ],
+            options={
+                'verbose_name': '시험 성적 통계',
+                'verbose_name_plural': '시험 성적 통계',
+                'constraints': [models.UniqueConstraint(fields=('exam', 'paper'), name='unique_exam_statistics')],
+            },
+        ),
+    ]
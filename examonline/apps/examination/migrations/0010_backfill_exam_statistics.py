@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:28
+
+from django.db import migrations
+from django.db.models import Count, F, Max, Min, Q, Sum
+
+
+def backfill_exam_statistics(apps, schema_editor):
+    """기존 제출 기록으로 시험지별 통계 생성"""
+    ExamStatistics = apps.get_model('examination', 'ExamStatistics')
+    TestScores = apps.get_model('testpaper', 'TestScores')
+    rows = (
+        TestScores.objects.filter(exam__isnull=False, is_submitted=True, test_paper__isnull=False)
+        .values('exam_id', 'test_paper_id')
+        .annotate(
+            submitted_count=Count('id'),
+            score_sum=Sum('test_score'),
+            pass_count=Count('id', filter=Q(test_score__gte=F('test_paper__passing_score'))),
+            highest_score=Max('test_score'),
+            lowest_score=Min('test_score'),
+        )
+        .order_by()
+    )
+    ExamStatistics.objects.bulk_create(
+        [ExamStatistics(exam_id=row.pop('exam_id'), paper_id=row.pop('test_paper_id'), **row) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examination', '0009_examstatistics'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_exam_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examination', '0010_backfill_exam_statistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemAnalysis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('processing', '분석 중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='상태')),
+                ('requested_version', models.BigIntegerField(default=0, verbose_name='요청 통계 버전')),
+                ('report_version', models.BigIntegerField(blank=True, null=True, verbose_name='분석 통계 버전')),
+                ('report', models.JSONField(blank=True, null=True, verbose_name='분석 결과')),
+                ('error', models.TextField(blank=True, default='', verbose_name='오류 내용')),
+                ('request_time', models.DateTimeField(default=django.utils.timezone.now, verbose_name='요청 시간')),
+                ('started_time', models.DateTimeField(blank=True, null=True, verbose_name='처리 시작 시간')),
+                ('finished_time', models.DateTimeField(blank=True, null=True, verbose_name='처리 완료 시간')),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='examination.examinationinfo', verbose_name='시험 정보')),
+            ],
+            options={
+                'verbose_name': '문항 분석',
+                'verbose_name_plural': '문항 분석',
+                'indexes': [models.Index(fields=['status', 'request_time'], name='examination_status_59ba5d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('exam',), name='unique_item_analysis')],
+            },
+        ),
+    ]
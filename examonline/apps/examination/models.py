@@ -2,7 +2,7 @@ from django.db import models
 from django.utils import timezone
 
 from user.models import UserProfile, StudentsInfo, SubjectInfo
-from testpaper.models import TestPaperInfo
+from testpaper.models import TestPaperInfo, TestScores
 
 
 # 시험 정보
@@ -23,6 +23,8 @@ class ExaminationInfo(models.Model):
     )
     exam_type = models.CharField(choices=(
         ('pt', '보통'), ('ts', '특수')), max_length=2, default='pt', verbose_name='유형')
+    shuffle_questions = models.BooleanField(
+        default=False, verbose_name='문제/선택지 무작위 배치')
     create_user = models.ForeignKey(
         UserProfile, on_delete=models.CASCADE, verbose_name='창설자')
     create_time = models.DateTimeField(
@@ -61,6 +63,119 @@ class ExamStudentsInfo(models.Model):
     class Meta:
         verbose_name = '수험생 정보'
         verbose_name_plural = verbose_name
+        constraints = [
+            models.UniqueConstraint(fields=['exam', 'student'], name='unique_exam_student'),
+        ]
 
     def __str__(self):
         return self.exam.name
+
+
+# 채점 작업 (비동기 제출)
+class GradingJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    test_score = models.ForeignKey(
+        TestScores, on_delete=models.CASCADE, verbose_name='응시 기록')
+    answers = models.JSONField(default=list, verbose_name='제출 답안')
+    status = models.CharField(
+        choices=(
+            (STATUS_PENDING, '대기'),
+            (STATUS_PROCESSING, '채점 중'),
+            (STATUS_DONE, '완료'),
+            (STATUS_FAILED, '실패'),
+        ),
+        default=STATUS_PENDING,
+        max_length=10,
+        verbose_name='상태',
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name='시도 횟수')
+    error = models.TextField(default='', blank=True, verbose_name='오류 내용')
+    create_time = models.DateTimeField(
+        default=timezone.now, verbose_name='생성 시간')
+    started_time = models.DateTimeField(
+        null=True, blank=True, verbose_name='처리 시작 시간')
+    finished_time = models.DateTimeField(
+        null=True, blank=True, verbose_name='처리 완료 시간')
+
+    class Meta:
+        verbose_name = '채점 작업'
+        verbose_name_plural = verbose_name
+        indexes = [
+            models.Index(fields=['status', 'create_time']),
+        ]
+
+    def __str__(self):
+        return f'{self.test_score_id} ({self.status})'
+
+
+# 시험 성적 통계 (시험지별, 제출/채점 시 누적 갱신)
+class ExamStatistics(models.Model):
+    exam = models.ForeignKey(
+        ExaminationInfo, on_delete=models.CASCADE, verbose_name='시험 정보')
+    paper = models.ForeignKey(
+        TestPaperInfo, on_delete=models.CASCADE, verbose_name='시험지 정보')
+    submitted_count = models.PositiveIntegerField(default=0, verbose_name='제출 수')
+    score_sum = models.BigIntegerField(default=0, verbose_name='점수 합계')
+    pass_count = models.PositiveIntegerField(default=0, verbose_name='합격 수')
+    highest_score = models.IntegerField(null=True, blank=True, verbose_name='최고 점수')
+    lowest_score = models.IntegerField(null=True, blank=True, verbose_name='최저 점수')
+    edit_time = models.DateTimeField(auto_now=True, verbose_name='수정 시간')
+
+    class Meta:
+        verbose_name = '시험 성적 통계'
+        verbose_name_plural = verbose_name
+        constraints = [
+            models.UniqueConstraint(fields=['exam', 'paper'], name='unique_exam_statistics'),
+        ]
+
+    def __str__(self):
+        return f'{self.exam_id}:{self.paper_id}'
+
+
+# 문항 분석 결과 (시험별, 백그라운드에서 계산하여 저장)
+class ItemAnalysis(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    exam = models.ForeignKey(
+        ExaminationInfo, on_delete=models.CASCADE, verbose_name='시험 정보')
+    status = models.CharField(
+        choices=(
+            (STATUS_PENDING, '대기'),
+            (STATUS_PROCESSING, '분석 중'),
+            (STATUS_DONE, '완료'),
+            (STATUS_FAILED, '실패'),
+        ),
+        default=STATUS_PENDING,
+        max_length=10,
+        verbose_name='상태',
+    )
+    requested_version = models.BigIntegerField(default=0, verbose_name='요청 통계 버전')
+    report_version = models.BigIntegerField(null=True, blank=True, verbose_name='분석 통계 버전')
+    report = models.JSONField(null=True, blank=True, verbose_name='분석 결과')
+    error = models.TextField(default='', blank=True, verbose_name='오류 내용')
+    request_time = models.DateTimeField(
+        default=timezone.now, verbose_name='요청 시간')
+    started_time = models.DateTimeField(
+        null=True, blank=True, verbose_name='처리 시작 시간')
+    finished_time = models.DateTimeField(
+        null=True, blank=True, verbose_name='처리 완료 시간')
+
+    class Meta:
+        verbose_name = '문항 분석'
+        verbose_name_plural = verbose_name
+        constraints = [
+            models.UniqueConstraint(fields=['exam'], name='unique_item_analysis'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'request_time']),
+        ]
+
+    def __str__(self):
+        return f'{self.exam_id} ({self.status})'
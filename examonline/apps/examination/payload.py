@@ -0,0 +1,72 @@
+"""
+Exam question payload.
+학생용 문제 목록(정답 제외)을 (시험, 시험지 버전) 단위로 한 번만 렌더링하여 JSON bytes로 캐시.
+
+시험지 내용이 바뀌면 시험지 버전이 증가하므로 별도 무효화 불필요.
+무작위 배치 시험은 캐시된 문제/선택지 조각(fragment)을 학생별 순서로 이어 붙이기만 함 (재직렬화 없음).
+"""
+from django.conf import settings
+from rest_framework.renderers import JSONRenderer
+
+from core.cache import LocalLRUCache, get_or_build
+from examination.api.serializers import ExamQuestionSerializer
+from examination.shuffle import permutations
+from testpaper.answer_keys import get_paper_version
+from testpaper.models import TestPaperTestQ
+
+_local_payloads = LocalLRUCache(maxsize=settings.LOCAL_CACHE_MAXSIZE)
+
+
+def _question_bytes(head, order, options):
+    """문제 조각 결합: {...,"order":N,"options":[...]}"""
+    return head + b'"order":%d,"options":[' % order + b','.join(options) + b']}'
+
+
+def render_questions(paper_id):
+    """
+    학생용 문제 목록 렌더링.
+
+    반환값: {'body': 문제 목록 JSON bytes, 'fragments': [(문제 앞부분, 순서, (선택지 JSON bytes, ...)), ...]}
+    """
+    paper_questions = TestPaperTestQ.objects.filter(test_paper_id=paper_id).select_related(
+        'test_question'
+    ).prefetch_related('test_question__optioninfo_set').order_by('order')
+
+    renderer = JSONRenderer()
+    fragments = []
+    for question in ExamQuestionSerializer(paper_questions, many=True).data:
+        options = tuple(renderer.render(option) for option in question.pop('options'))
+        order = question.pop('order')
+        head = renderer.render(question)[:-1] + b','
+        fragments.append((head, order, options))
+
+    body = b'[' + b','.join(_question_bytes(*fragment) for fragment in fragments) + b']'
+    return {'body': body, 'fragments': fragments}
+
+
+def questions_version(exam_id, paper_id, shuffle_seed=None):
+    """문제 목록 payload 식별 문자열 (캐시 키 구성 요소와 학생별 배치 seed, ETag용)"""
+    return f'{exam_id}:{paper_id}:{get_paper_version(paper_id)}:{shuffle_seed}'
+
+
+def get_questions_payload(exam_id, paper_id, shuffle_seed=None):
+    """
+    시험 문제 목록 payload 조회 (캐시 우선).
+    shuffle_seed가 있으면 학생별 순서로 재배치 (order는 화면 표시 순서로 다시 부여).
+    """
+    payload = get_or_build(
+        f'exam_questions:{exam_id}:{paper_id}:{get_paper_version(paper_id)}',
+        lambda: render_questions(paper_id),
+        local_cache=_local_payloads,
+        timeout=settings.EXAM_PAYLOAD_CACHE_TIMEOUT,
+    )
+    if shuffle_seed is None:
+        return payload['body']
+
+    fragments = payload['fragments']
+    question_order, option_orders = permutations(shuffle_seed, [len(options) for _, _, options in fragments])
+    questions = []
+    for position, index in enumerate(question_order, start=1):
+        head, _, options = fragments[index]
+        questions.append(_question_bytes(head, position, [options[i] for i in option_orders[index]]))
+    return b'[' + b','.join(questions) + b']'
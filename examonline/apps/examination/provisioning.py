@@ -0,0 +1,132 @@
+"""
+Attempt provisioning.
+
+시험 시작 전에 등록 학생 전원의 응시 기록(TestScores, start_time 없음)을 미리 생성(arming).
+시험 시작 시각에 start 요청이 몰려도 INSERT 없이 조건부 UPDATE 한 번으로 시작 처리.
+
+시험지가 여러 개(A/B/C형)인 시험은 등록 학생 ID 정렬 순위로 시험지를 번갈아 배정하여
+형별 인원이 1명 이내로 균등하고, 같은 학생은 항상 같은 시험지를 받음.
+배정된 시험지는 TestScores.test_paper에 기록되며 이후 채점/캐시/통계는 그 시험지 기준.
+"""
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.cache import LocalLRUCache, bump_version, get_or_build, get_version
+from examination.eligibility import get_enrolled_ids
+from examination.models import ExaminationInfo, ExamPaperInfo, ExamStudentsInfo
+from testpaper.models import TestScores
+
+FORMS_VERSION_NAMESPACE = 'exam_forms'
+
+_local_forms = LocalLRUCache(maxsize=settings.LOCAL_CACHE_MAXSIZE)
+
+
+def get_form_paper_ids(exam_id):
+    """시험의 시험지 ID 목록 (형 순서, 캐시 우선)"""
+    return get_or_build(
+        f'exam_forms:{exam_id}:{get_version(FORMS_VERSION_NAMESPACE, exam_id)}',
+        lambda: tuple(ExamPaperInfo.objects.filter(exam_id=exam_id).order_by('id').values_list('paper_id', flat=True)),
+        local_cache=_local_forms,
+        timeout=settings.EXAM_ENROLLMENT_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_forms(exam_id):
+    """시험지 구성 캐시 무효화 (버전 증가)"""
+    bump_version(FORMS_VERSION_NAMESPACE, exam_id)
+
+
+def _form_for(paper_ids, enrolled_ids, student_id):
+    if len(paper_ids) == 1:
+        return paper_ids[0]
+    return paper_ids[bisect_left(enrolled_ids, student_id) % len(paper_ids)]
+
+
+def assign_paper(exam_id, student_id):
+    """
+    학생에게 배정할 시험지 ID (시험지가 없으면 None).
+    등록 학생 정렬 순위 % 시험지 수 (캐시된 배열에서 계산, 쿼리 없음).
+    """
+    paper_ids = get_form_paper_ids(exam_id)
+    if not paper_ids:
+        return None
+    return _form_for(paper_ids, get_enrolled_ids(exam_id), student_id)
+
+
+def arm_exam(exam, batch_size=1000):
+    """
+    등록 학생 중 응시 기록이 없는 학생의 응시 기록 일괄 생성 (시험지 배정 포함).
+    여러 번 실행해도 이미 생성된 기록은 건너뜀.
+    응시 자격 캐시도 함께 미리 적재.
+    반환값: 실제로 생성한 기록 수 (시험지가 없으면 0)
+    """
+    paper_ids = get_form_paper_ids(exam.id)
+    if not paper_ids:
+        return 0
+    enrolled_ids = get_enrolled_ids(exam.id)
+
+    created = 0
+    with transaction.atomic():
+        armed = TestScores.objects.filter(exam=exam).values('user_id')
+        student_ids = list(
+            ExamStudentsInfo.objects.filter(exam=exam).exclude(student_id__in=armed).values_list(
+                'student_id', flat=True
+            )
+        )
+        for start in range(0, len(student_ids), batch_size):
+            attempts = [
+                TestScores(
+                    exam=exam,
+                    user_id=student_id,
+                    test_paper_id=_form_for(paper_ids, enrolled_ids, student_id),
+                    detail_records={},
+                )
+                for student_id in student_ids[start:start + batch_size]
+            ]
+            try:
+                with transaction.atomic():
+                    TestScores.objects.bulk_create(attempts)
+                created += len(attempts)
+            except IntegrityError:
+                # 동시에 시작/생성된 기록과 충돌하면 이 묶음만 한 건씩 생성 여부 확인
+                for attempt in attempts:
+                    _, is_created = TestScores.objects.get_or_create(
+                        exam=exam,
+                        user_id=attempt.user_id,
+                        defaults={'test_paper_id': attempt.test_paper_id, 'detail_records': {}},
+                    )
+                    created += is_created
+    return created
+
+
+def ensure_attempt(exam, student_info, paper_id):
+    """
+    응시 기록이 없으면 생성 (시작 전 상태).
+    (시험, 학생) unique 제약에 기대는 INSERT ... ON CONFLICT DO NOTHING이므로 중복 생성 없음.
+    """
+    TestScores.objects.bulk_create(
+        [TestScores(exam=exam, user=student_info, test_paper_id=paper_id, detail_records={})],
+        ignore_conflicts=True,
+    )
+
+
+def exams_to_arm(lead_minutes, now=None):
+    """lead_minutes 안에 시작하거나 진행 중인 시험"""
+    now = now or timezone.now()
+    return ExaminationInfo.objects.filter(start_time__lte=now + timedelta(minutes=lead_minutes), end_time__gt=now)
+
+
+def start_attempt(exam, student_info, now):
+    """
+    미리 생성된 응시 기록으로 시험 시작 (조건부 UPDATE 1회).
+
+    아직 시작하지 않은 기록만 갱신하므로 학생당 한 번만 시작됨.
+    반환값: 시작 처리 여부 (미리 생성된 기록이 없거나 이미 시작했으면 False)
+    """
+    return TestScores.objects.filter(
+        exam=exam, user=student_info, start_time__isnull=True, is_submitted=False
+    ).update(start_time=now) == 1
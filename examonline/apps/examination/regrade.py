@@ -0,0 +1,152 @@
+"""
+Exam regrade.
+
+정답 옵션 수정 등으로 정답표가 바뀐 뒤 시험 전체 제출 기록을 다시 채점.
+- 시험지(형)별 정답표는 시작 시 한 번만 조회
+- 제출 기록은 iterator(chunk_size)로 나눠 읽어 메모리에서 재채점하고, 바뀐 기록만 bulk_update
+  (같은 트랜잭션에서 시험 통계에 점수 차이 반영)
+- 저장 시 바뀐 기록을 행 잠금으로 다시 읽어, 읽은 뒤 수동 채점 등으로 바뀐 기록은 잠근 값으로 다시 재채점
+  (재채점 중 반영된 채점 결과를 덮어쓰지 않음)
+- 수동 채점(manual_graded) 항목은 점수/코멘트 그대로 유지
+- workers > 1이면 재채점 계산을 프로세스 풀에서 병렬 처리 (응시 기록이 수만 건인 시험),
+  DB 쓰기는 현재 프로세스 (worker 진입점은 regrade_worker)
+채점 대기 중인(비동기 제출) 기록은 worker가 채점하므로 제외.
+regrade_exam 명령과 시험 API(regrade)가 사용.
+"""
+import pickle
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.db import transaction
+
+from examination import regrade_worker
+from examination.deadlines import draft_to_answers
+from examination.models import GradingJob
+from examination.statistics import record_score_changes
+from testpaper.answer_keys import get_answer_key, invalidate_paper
+from testpaper.grading import grade_answers
+from testpaper.models import TestPaperInfo, TestScores
+from testpaper.results import invalidate_results
+
+# 재채점 결과 (재채점한 기록 수, 점수/채점 결과가 바뀐 기록 수)
+RegradeResult = namedtuple('RegradeResult', ['regraded', 'changed'])
+
+
+def regrade_record(answer_key, detail_records):
+    """
+    채점 결과(detail_records) 재채점.
+    기록된 답안을 다시 채점하고 수동 채점 항목은 그대로 합산.
+    반환값: (총점, 새 detail_records)
+    """
+    detail_records = detail_records or {}
+    manual_records = {
+        question_id: record
+        for question_id, record in detail_records.items()
+        if isinstance(record, dict) and record.get('manual_graded')
+    }
+    total_score, records = grade_answers(
+        answer_key,
+        draft_to_answers(
+            {question_id: record for question_id, record in detail_records.items() if question_id not in manual_records}
+        ),
+    )
+    records.update(manual_records)
+    total_score += sum(record.get('score', 0) for record in manual_records.values())
+    return total_score, records
+
+
+def _regrade_rows(answer_keys, rows):
+    """
+    rows: [(응시 기록 ID, 시험지 ID, 총점, detail_records), ...]
+    반환값: 바뀐 기록 [(응시 기록 ID, 시험지 ID, 읽은 총점, 읽은 detail_records, 총점, detail_records), ...]
+    """
+    changed = []
+    for score_id, paper_id, old_total, detail_records in rows:
+        total_score, records = regrade_record(answer_keys[paper_id], detail_records)
+        if total_score != old_total or records != detail_records:
+            changed.append((score_id, paper_id, old_total, detail_records, total_score, records))
+    return changed
+
+
+def _write(exam, answer_keys, passing_scores, changed, batch_size):
+    """바뀐 기록 일괄 저장 및 시험 통계 반영 (잠근 뒤 다시 읽은 값 기준)"""
+    if not changed:
+        return 0
+
+    with transaction.atomic():
+        locked = {
+            score_id: (test_score, detail_records)
+            for score_id, test_score, detail_records in TestScores.objects.select_for_update()
+            .filter(id__in=[row[0] for row in changed])
+            .order_by('id')
+            .values_list('id', 'test_score', 'detail_records')
+        }
+
+        updates = []
+        score_changes = {}
+        for score_id, paper_id, read_total, read_records, total_score, records in changed:
+            if score_id not in locked:
+                continue
+            old_total, old_records = locked[score_id]
+            if (old_total, old_records) != (read_total, read_records):
+                total_score, records = regrade_record(answer_keys[paper_id], old_records)
+                if total_score == old_total and records == old_records:
+                    continue
+            updates.append(TestScores(id=score_id, test_score=total_score, detail_records=records))
+            score_changes.setdefault(paper_id, []).append((old_total, total_score))
+
+        if not updates:
+            return 0
+        TestScores.objects.bulk_update(updates, ['test_score', 'detail_records'], batch_size=batch_size)
+        for paper_id, changes in score_changes.items():
+            record_score_changes(exam.id, paper_id, passing_scores[paper_id], changes)
+        invalidate_results(exam.id)
+    return len(updates)
+
+
+def regradable_scores(exam):
+    """재채점 대상 (채점이 끝난 제출 기록)"""
+    grading = GradingJob.objects.exclude(status=GradingJob.STATUS_DONE).values('test_score_id')
+    return TestScores.objects.filter(exam=exam, is_submitted=True, test_paper__isnull=False).exclude(id__in=grading)
+
+
+def regrade_exam(exam, chunk_size=1000, workers=1):
+    """
+    시험 전체 재채점.
+    반환값: RegradeResult
+    """
+    scores = regradable_scores(exam)
+
+    # 수정된 정답이 반영되도록 캐시를 무효화한 뒤 시험지별로 한 번만 조회
+    answer_keys = {}
+    for paper_id in scores.order_by().values_list('test_paper_id', flat=True).distinct():
+        invalidate_paper(paper_id)
+        answer_keys[paper_id] = get_answer_key(paper_id)
+    passing_scores = dict(TestPaperInfo.objects.filter(id__in=answer_keys).values_list('id', 'passing_score'))
+
+    rows = scores.order_by('id').values_list('id', 'test_paper_id', 'test_score', 'detail_records').iterator(
+        chunk_size=chunk_size
+    )
+    chunks = iter(lambda: list(islice(rows, chunk_size)), [])
+    regraded = changed = 0
+
+    if workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=regrade_worker.init, initargs=(pickle.dumps(answer_keys),)
+        ) as pool:
+            # 읽기가 계산보다 앞서 나가지 않도록 진행 중인 묶음 수 제한
+            pending = deque()
+            for chunk in chunks:
+                regraded += len(chunk)
+                pending.append(pool.submit(regrade_worker.regrade_rows, chunk))
+                if len(pending) >= workers * 2:
+                    changed += _write(exam, answer_keys, passing_scores, pending.popleft().result(), chunk_size)
+            while pending:
+                changed += _write(exam, answer_keys, passing_scores, pending.popleft().result(), chunk_size)
+    else:
+        for chunk in chunks:
+            regraded += len(chunk)
+            changed += _write(exam, answer_keys, passing_scores, _regrade_rows(answer_keys, chunk), chunk_size)
+
+    return RegradeResult(regraded=regraded, changed=changed)
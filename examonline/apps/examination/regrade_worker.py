@@ -0,0 +1,27 @@
+"""
+Regrade process pool worker.
+
+spawn/forkserver 방식(Python 3.14부터 Linux 기본값은 forkserver)의 worker는 빈 인터프리터에서 시작하므로
+Django 설정을 로드하기 전에 모델을 import하면 안 됨.
+이 모듈은 import 시 Django 모델을 불러오지 않으며, 정답표는 pickle bytes로 받아 초기화 후 복원.
+"""
+import pickle
+
+import django
+
+# worker 프로세스의 정답표 ({시험지 ID: 정답표})
+_answer_keys = None
+
+
+def init(answer_keys_pickle):
+    """worker 초기화 (Django 설정 로드 후 정답표 복원)"""
+    global _answer_keys
+    django.setup()
+    _answer_keys = pickle.loads(answer_keys_pickle)
+
+
+def regrade_rows(rows):
+    """묶음 재채점 (examination.regrade._regrade_rows)"""
+    from examination.regrade import _regrade_rows
+
+    return _regrade_rows(_answer_keys, rows)
@@ -0,0 +1,28 @@
+"""
+Per-student shuffle.
+(시험 ID, 학생 ID)로 만든 seed에서 문제/선택지 순서를 결정하므로 학생별로 저장할 데이터가 없음.
+같은 학생은 어느 프로세스에서 몇 번을 조회해도 같은 순서를 받음.
+
+답안은 문제 ID/선택지 ID로 제출되므로 채점은 순서와 무관.
+"""
+import hashlib
+import random
+
+
+def exam_seed(exam_id, student_id):
+    """학생별 배치 seed (프로세스/PYTHONHASHSEED와 무관하게 고정)"""
+    digest = hashlib.sha256(f'exam:{exam_id}:student:{student_id}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def permutations(seed, option_counts):
+    """
+    문제 순서와 문제별 선택지 순서.
+
+    option_counts: 원래 문제 순서대로 각 문제의 선택지 수
+    반환값: (문제 인덱스 순열, [문제별 선택지 인덱스 순열])
+    """
+    rng = random.Random(seed)
+    question_order = rng.sample(range(len(option_counts)), len(option_counts))
+    option_orders = [rng.sample(range(count), count) for count in option_counts]
+    return question_order, option_orders
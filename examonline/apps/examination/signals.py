@@ -0,0 +1,35 @@
+"""
+Examination signals.
+- 등록 학생 변경 시 응시 자격 캐시 무효화 (bulk_create는 enroll_students에서 직접 무효화)
+- 시험지 구성 변경 시 시험지 배정 캐시 무효화
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from examination.eligibility import invalidate_enrollment
+from examination.models import ExaminationInfo, ExamPaperInfo, ExamStudentsInfo
+from examination.provisioning import invalidate_forms
+from examination.statistics import invalidate_statistics
+from testpaper.results import invalidate_results
+
+
+@receiver([post_save, post_delete], sender=ExamStudentsInfo)
+def enrollment_changed(sender, instance, **kwargs):
+    """학생 등록/삭제"""
+    invalidate_enrollment(instance.exam_id)
+
+
+@receiver(post_save, sender=ExaminationInfo)
+def exam_created(sender, instance, created, **kwargs):
+    """새 시험 (DB 초기화 등으로 재사용된 ID의 캐시 항목 무시)"""
+    if created:
+        invalidate_enrollment(instance.id)
+        invalidate_forms(instance.id)
+        invalidate_statistics(instance.id)
+        invalidate_results(instance.id)
+
+
+@receiver([post_save, post_delete], sender=ExamPaperInfo)
+def exam_paper_changed(sender, instance, **kwargs):
+    """시험지 추가/삭제"""
+    invalidate_forms(instance.exam_id)
@@ -0,0 +1,118 @@
+"""
+Exam statistics.
+
+시험 성적 통계를 시험지(형)별 ExamStatistics 행에 누적(제출 수, 점수 합계, 합격 수, 최고/최저 점수)하여
+통계 조회는 집계 쿼리 없이 행만 읽음.
+
+- 새 제출(submit, 마감 자동 제출, 비동기 접수): record_submissions - F() 증분 UPDATE 1회 (읽기 없음)
+- 점수 변경(비동기 채점 완료, 수동 채점, 재채점): record_score_changes - 행 잠금 후 차이만 반영
+두 함수 모두 호출한 쪽의 트랜잭션 안에서 TestScores 변경 뒤에 호출.
+최고/최저 점수가 줄어드는 방향으로 바뀔 때만 해당 시험지 제출 기록을 다시 집계.
+점수가 바뀔 때마다 시험 통계 버전을 증가시켜 점수 분포 등 파생 캐시를 무효화.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from core.cache import bump_version
+from examination.models import ExamStatistics
+from testpaper.models import TestScores
+
+STATISTICS_VERSION_NAMESPACE = 'exam_statistics'
+
+
+def invalidate_statistics(exam_id):
+    """시험 점수로 만든 캐시 무효화 (버전 증가)"""
+    bump_version(STATISTICS_VERSION_NAMESPACE, exam_id)
+
+
+def _ensure_row(exam_id, paper_id):
+    """통계 행이 없으면 생성 (INSERT ... ON CONFLICT DO NOTHING)"""
+    ExamStatistics.objects.bulk_create([ExamStatistics(exam_id=exam_id, paper_id=paper_id)], ignore_conflicts=True)
+
+
+def _submitted_scores(exam_id, paper_id):
+    return TestScores.objects.filter(exam_id=exam_id, test_paper_id=paper_id, is_submitted=True)
+
+
+def record_submissions(exam_id, paper_id, passing_score, scores):
+    """새로 제출된 점수 누적"""
+    scores = list(scores)
+    if not scores or not exam_id or not paper_id:
+        return
+
+    _ensure_row(exam_id, paper_id)
+    highest, lowest = max(scores), min(scores)
+    ExamStatistics.objects.filter(exam_id=exam_id, paper_id=paper_id).update(
+        submitted_count=F('submitted_count') + len(scores),
+        score_sum=F('score_sum') + sum(scores),
+        pass_count=F('pass_count') + sum(score >= passing_score for score in scores),
+        highest_score=Greatest(Coalesce(F('highest_score'), Value(highest)), Value(highest)),
+        lowest_score=Least(Coalesce(F('lowest_score'), Value(lowest)), Value(lowest)),
+        edit_time=timezone.now(),
+    )
+    invalidate_statistics(exam_id)
+
+
+def record_score_changes(exam_id, paper_id, passing_score, changes):
+    """
+    제출된 점수 변경 반영.
+    changes: [(이전 점수, 새 점수), ...]
+    """
+    changes = [(old, new) for old, new in changes if old != new]
+    if not changes or not exam_id or not paper_id:
+        return
+
+    stats = ExamStatistics.objects.select_for_update().filter(exam_id=exam_id, paper_id=paper_id).first()
+    if stats is None:
+        # 통계 적재 전의 제출 기록
+        rebuild_statistics(exam_id)
+        return
+
+    stats.score_sum += sum(new - old for old, new in changes)
+    stats.pass_count += sum((new >= passing_score) - (old >= passing_score) for old, new in changes)
+
+    shrinks = any(
+        (old == stats.highest_score and new < old) or (old == stats.lowest_score and new > old)
+        for old, new in changes
+    )
+    if shrinks:
+        extremes = _submitted_scores(exam_id, paper_id).aggregate(
+            highest=Max('test_score'), lowest=Min('test_score')
+        )
+        stats.highest_score, stats.lowest_score = extremes['highest'], extremes['lowest']
+    else:
+        new_scores = [new for _, new in changes]
+        stats.highest_score = max(score for score in new_scores + [stats.highest_score] if score is not None)
+        stats.lowest_score = min(score for score in new_scores + [stats.lowest_score] if score is not None)
+
+    stats.save(update_fields=['score_sum', 'pass_count', 'highest_score', 'lowest_score', 'edit_time'])
+    invalidate_statistics(exam_id)
+
+
+def rebuild_statistics(exam_id):
+    """제출 기록을 다시 집계하여 시험 통계 재생성 (기존 데이터 적재, 불일치 복구)"""
+    rows = (
+        TestScores.objects.filter(exam_id=exam_id, is_submitted=True, test_paper__isnull=False)
+        .values('test_paper_id')
+        .annotate(
+            submitted_count=Count('id'),
+            score_sum=Sum('test_score'),
+            pass_count=Count('id', filter=Q(test_score__gte=F('test_paper__passing_score'))),
+            highest_score=Max('test_score'),
+            lowest_score=Min('test_score'),
+        )
+        .order_by()
+    )
+    with transaction.atomic():
+        ExamStatistics.objects.filter(exam_id=exam_id).delete()
+        ExamStatistics.objects.bulk_create(
+            [ExamStatistics(exam_id=exam_id, paper_id=row.pop('test_paper_id'), **row) for row in rows]
+        )
+    invalidate_statistics(exam_id)
+
+
+def get_statistics_rows(exam_id):
+    """시험지별 통계 행 (시험지 정보 포함, 쿼리 1회)"""
+    return list(ExamStatistics.objects.filter(exam_id=exam_id).select_related('paper').order_by('paper_id'))
@@ -0,0 +1,172 @@
+"""
+Exam submissions.
+
+- 동기 모드: 요청 안에서 채점 후 저장
+- 비동기 모드(EXAM_SUBMIT_ASYNC): 제출 답안을 GradingJob으로 기록하고 즉시 접수 응답,
+  grade_submissions 명령(worker, 여러 프로세스 실행 가능)이 채점.
+  마감 직전 동시 제출이 몰려도 요청 worker는 채점 루프를 기다리지 않음.
+두 모드 모두 같은 트랜잭션에서 시험 통계(ExamStatistics)를 누적 갱신.
+채점 대기 중에 반영된 수동 채점 항목은 worker가 채점 결과에 옮겨 유지.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from examination.models import GradingJob
+from examination.statistics import record_score_changes, record_submissions
+from testpaper.answer_keys import get_answer_key
+from testpaper.grading import grade_answers
+from testpaper.models import TestScores
+from testpaper.results import invalidate_results
+
+GRADING = 'grading'
+GRADED = 'graded'
+
+
+def is_async_submit():
+    """비동기 제출 모드 여부"""
+    return settings.EXAM_SUBMIT_ASYNC
+
+
+def _time_used(test_score, now):
+    return int((now - test_score.start_time).total_seconds() / 60)
+
+
+def _passing_score(test_score):
+    return test_score.test_paper.passing_score if test_score.test_paper else 0
+
+
+def grade_submission(test_score, answers, now):
+    """답안 채점 후 제출 기록 저장 (동기 모드)"""
+    answer_key = get_answer_key(test_score.test_paper_id)
+    total_score, detailed_records = grade_answers(answer_key, answers)
+
+    test_score.test_score = total_score
+    test_score.detail_records = detailed_records
+    test_score.submit_time = now
+    test_score.is_submitted = True
+    test_score.time_used = _time_used(test_score, now)
+    with transaction.atomic():
+        test_score.save()
+        record_submissions(
+            test_score.exam_id, test_score.test_paper_id, _passing_score(test_score), [test_score.test_score]
+        )
+    return test_score
+
+
+def enqueue_submission(test_score, answers, now):
+    """
+    제출 답안을 채점 대기열에 기록 (비동기 모드).
+
+    제출 여부/시간은 즉시 확정되어 재제출을 막고, 점수는 worker가 채점 후 기록.
+    """
+    with transaction.atomic():
+        test_score.submit_time = now
+        test_score.is_submitted = True
+        test_score.time_used = _time_used(test_score, now)
+        test_score.save(update_fields=['submit_time', 'is_submitted', 'time_used'])
+        # 채점 전 점수로 제출 수를 먼저 반영하고, 채점이 끝나면 점수 차이만 반영
+        record_submissions(
+            test_score.exam_id, test_score.test_paper_id, _passing_score(test_score), [test_score.test_score]
+        )
+        return GradingJob.objects.create(test_score=test_score, answers=answers)
+
+
+def grading_status(test_score):
+    """채점 상태 (미제출이면 None, 실패한 작업은 재처리 전까지 채점 중)"""
+    if not test_score.is_submitted:
+        return None
+    pending = GradingJob.objects.filter(test_score=test_score).exclude(status=GradingJob.STATUS_DONE).exists()
+    return GRADING if pending else GRADED
+
+
+def claim_jobs(limit):
+    """
+    처리할 채점 작업 선점.
+
+    다른 worker가 잠근 행은 건너뛰며(SKIP LOCKED), 처리 중 상태로 오래 남은 작업은 재시도 대상.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.GRADING_JOB_STALE_SECONDS)
+
+    with transaction.atomic():
+        job_ids = list(
+            GradingJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=GradingJob.STATUS_PENDING)
+                | Q(status=GradingJob.STATUS_PROCESSING, started_time__lt=stale_before)
+            )
+            .order_by('create_time', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        GradingJob.objects.filter(id__in=job_ids).update(status=GradingJob.STATUS_PROCESSING, started_time=now)
+
+    return list(
+        GradingJob.objects.filter(id__in=job_ids)
+        .select_related('test_score__test_paper')
+        .order_by('create_time', 'id')
+    )
+
+
+def _carry_manual_grades(current_records, records):
+    """
+    채점 대기 중에 반영된 수동 채점 항목(점수/코멘트)을 새 채점 결과로 옮김.
+    반환값: 총점 차이
+    """
+    delta = 0
+    for question_id, record in (current_records or {}).items():
+        if not isinstance(record, dict) or not record.get('manual_graded'):
+            continue
+        graded = records.setdefault(question_id, {})
+        delta += record.get('score', 0) - graded.get('score', 0)
+        graded.update({key: record[key] for key in ('score', 'manual_graded', 'comment') if key in record})
+    return delta
+
+
+def run_job(job):
+    """채점 작업 1건 처리, 실패 시 최대 시도 횟수까지 재시도 대기열로 복귀"""
+    test_score = job.test_score
+    try:
+        answer_key = get_answer_key(test_score.test_paper_id)
+        total_score, detailed_records = grade_answers(answer_key, job.answers)
+    except Exception as e:
+        job.attempts += 1
+        job.error = str(e)
+        job.status = (
+            GradingJob.STATUS_FAILED if job.attempts >= settings.GRADING_JOB_MAX_ATTEMPTS
+            else GradingJob.STATUS_PENDING
+        )
+        job.save(update_fields=['attempts', 'error', 'status'])
+        return False
+
+    with transaction.atomic():
+        # 이전 점수는 잠근 행에서 읽음 (오래된 작업이 재선점되어 두 번 처리되어도 통계가 중복 반영되지 않음)
+        old_score, current_records = (
+            TestScores.objects.select_for_update()
+            .values_list('test_score', 'detail_records')
+            .get(id=test_score.id)
+        )
+        total_score += _carry_manual_grades(current_records, detailed_records)
+        TestScores.objects.filter(id=test_score.id).update(
+            test_score=total_score, detail_records=detailed_records
+        )
+        record_score_changes(
+            test_score.exam_id, test_score.test_paper_id, _passing_score(test_score), [(old_score, total_score)]
+        )
+        invalidate_results(test_score.exam_id)
+        job.attempts += 1
+        job.status = GradingJob.STATUS_DONE
+        job.finished_time = timezone.now()
+        job.save(update_fields=['attempts', 'status', 'finished_time'])
+    return True
+
+
+def process_jobs(limit=100):
+    """
+    대기 중인 채점 작업 처리.
+    반환값: 채점 완료 건수
+    """
+    return sum(run_job(job) for job in claim_jobs(limit))
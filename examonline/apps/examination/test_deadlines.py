@@ -0,0 +1,150 @@
+"""
+Exam Deadline Tests.
+시험 마감 자동 제출 테스트.
+"""
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from examination.deadlines import advance_exam_states, auto_submit, draft_to_answers, expired_attempt_ids
+from examination.drafts import buffer_draft, discard_draft
+from testpaper.models import TestScores
+from testquestion.models import OptionInfo
+from user.models import UserProfile, StudentsInfo
+
+
+@pytest.fixture
+def ended_exam(make_exam):
+    """방금 종료되었지만 상태는 아직 시험 중인 시험"""
+    now = timezone.now()
+    return make_exam(now - timedelta(hours=1), now - timedelta(minutes=1))
+
+
+@pytest.fixture
+def students(db):
+    students = []
+    for index in range(3):
+        user = UserProfile.objects.create_user(
+            username=f'deadline_student{index}', password='testpass123', user_type='student'
+        )
+        students.append(
+            StudentsInfo.objects.create(user=user, student_name=f'Student {index}', student_id=f'2025020{index}')
+        )
+    return students
+
+
+def start_attempt(exam, student, paper, detail_records=None, **kwargs):
+    return TestScores.objects.create(
+        exam=exam,
+        user=student,
+        test_paper=paper,
+        start_time=exam.start_time + timedelta(minutes=5),
+        detail_records=detail_records or {},
+        **kwargs,
+    )
+
+
+class TestDraftToAnswers:
+    """임시 답안 변환 테스트"""
+
+    def test_draft_to_answers(self):
+        draft = {'1': {'answer': '3'}, '2': '7', 'meta': {'answer': 'x'}}
+
+        assert draft_to_answers(draft) == [
+            {'question_id': 1, 'answer': '3'},
+            {'question_id': 2, 'answer': '7'},
+        ]
+        assert draft_to_answers(None) == []
+
+
+@pytest.mark.django_db
+class TestAutoSubmit:
+    """마감 자동 제출 테스트"""
+
+    def test_expired_attempts_graded_from_drafts(self, ended_exam, students, paper, question):
+        """종료된 시험의 미제출 기록은 임시 답안으로 채점되어 제출 처리"""
+        right_option = OptionInfo.objects.get(test_question=question, is_right=True)
+        correct = start_attempt(ended_exam, students[0], paper, {str(question.id): {'answer': str(right_option.id)}})
+        empty = start_attempt(ended_exam, students[1], paper)
+        done = start_attempt(ended_exam, students[2], paper, is_submitted=True, test_score=7)
+
+        assert set(expired_attempt_ids()) == {correct.id, empty.id}
+        assert auto_submit(expired_attempt_ids(), batch_size=1) == 2
+
+        correct.refresh_from_db()
+        assert correct.is_submitted
+        assert correct.test_score == 10
+        assert correct.submit_time == ended_exam.end_time
+        assert correct.detail_records[str(question.id)]['is_correct'] is True
+
+        empty.refresh_from_db()
+        assert empty.is_submitted
+        assert empty.test_score == 0
+
+        done.refresh_from_db()
+        assert done.test_score == 7
+
+    def test_ongoing_exam_not_swept(self, make_exam, paper, students):
+        """진행 중인 시험의 응시 기록은 대상 아님"""
+        now = timezone.now()
+        exam = make_exam(now - timedelta(minutes=10), now + timedelta(minutes=50))
+        start_attempt(exam, students[0], paper)
+
+        assert list(expired_attempt_ids()) == []
+
+    def test_grace_period_not_swept(self, make_exam, paper, students):
+        """종료 직후 유예 시간 안의 응시 기록은 제출을 기다림"""
+        now = timezone.now()
+        exam = make_exam(now - timedelta(minutes=60), now - timedelta(seconds=5))
+        start_attempt(exam, students[0], paper)
+
+        assert list(expired_attempt_ids()) == []
+        assert len(expired_attempt_ids(now + timedelta(minutes=1))) == 1
+
+    def test_write_behind_draft_used(self, settings, ended_exam, students, paper, question):
+        """write-behind 모드에서는 버퍼의 최신 임시 답안으로 채점"""
+        settings.EXAM_DRAFT_WRITE_BEHIND = True
+        right_option = OptionInfo.objects.get(test_question=question, is_right=True)
+        test_score = start_attempt(ended_exam, students[0], paper)
+        discard_draft(test_score.id)
+        buffer_draft(test_score, {str(question.id): {'answer': str(right_option.id)}})
+
+        auto_submit([test_score.id])
+
+        test_score.refresh_from_db()
+        assert test_score.test_score == 10
+
+
+@pytest.mark.django_db
+class TestExamStates:
+    """시험 상태 갱신 테스트"""
+
+    def test_advance_exam_states(self, make_exam, ended_exam):
+        now = timezone.now()
+        ready = make_exam(now - timedelta(minutes=1), now + timedelta(hours=1), exam_state='0')
+        future = make_exam(now + timedelta(hours=1), now + timedelta(hours=2), exam_state='0')
+
+        assert advance_exam_states(now) == (1, 1)
+
+        ready.refresh_from_db()
+        future.refresh_from_db()
+        ended_exam.refresh_from_db()
+        assert ready.exam_state == '1'
+        assert future.exam_state == '0'
+        assert ended_exam.exam_state == '2'
+
+    def test_sweep_command(self, ended_exam, students, paper):
+        """마감 처리 명령"""
+        test_score = start_attempt(ended_exam, students[0], paper)
+        out = StringIO()
+
+        call_command('sweep_exam_deadlines', stdout=out)
+
+        assert '1건을 자동 제출' in out.getvalue()
+        test_score.refresh_from_db()
+        ended_exam.refresh_from_db()
+        assert test_score.is_submitted
+        assert ended_exam.exam_state == '2'
@@ -0,0 +1,186 @@
+"""
+Item Analysis Tests.
+시험 문항 분석 테스트.
+"""
+import sys
+from io import StringIO
+
+import numpy as np
+import pytest
+from django.core.management import CommandError, call_command
+from rest_framework.test import APIClient
+
+from examination.item_analysis import build_item_analysis, process_analyses, request_analysis
+from examination.models import ItemAnalysis
+from examination.statistics import rebuild_statistics
+from testpaper.grading import build_answer_key, grade_answers
+from testpaper.models import TestScores
+from testquestion.models import OptionInfo
+from user.models import UserProfile, StudentsInfo
+
+
+@pytest.fixture
+def questions(make_question):
+    """객관식 문제 2개 (Q1: A/B(정답)/C, Q2: X(정답)/Y)"""
+    return [
+        make_question('Q1', options=[('A', False), ('B', True), ('C', False)]),
+        make_question('Q2', options=[('X', True), ('Y', False)]),
+    ]
+
+
+@pytest.fixture
+def paper_questions(questions):
+    return [(question, 5) for question in questions]
+
+
+@pytest.fixture
+def exam(finished_exam):
+    return finished_exam
+
+
+def option(question, text):
+    return str(OptionInfo.objects.get(test_question=question, option=text).id)
+
+
+def submit(exam, paper, index, answers):
+    user = UserProfile.objects.create_user(username=f'items_student{index}', password='pass', user_type='student')
+    student = StudentsInfo.objects.create(user=user, student_name=f'Student {index}', student_id=f'2025050{index}')
+    total_score, detail_records = grade_answers(build_answer_key(paper.id), answers)
+    return TestScores.objects.create(
+        exam=exam, user=student, test_paper=paper, is_submitted=True, test_score=total_score, detail_records=detail_records
+    )
+
+
+@pytest.fixture
+def submitted_scores(db, exam, paper, questions):
+    """총점 10, 10, 5, 5, 0, 0 (마지막 응시자는 Q2 미응답)"""
+    q1, q2 = questions
+    choices = [('B', 'X'), ('B', 'X'), ('B', 'Y'), ('A', 'X'), ('C', 'Y'), ('A', None)]
+    scores = []
+    for index, (first, second) in enumerate(choices):
+        answers = [{'question_id': q1.id, 'answer': option(q1, first)}]
+        if second:
+            answers.append({'question_id': q2.id, 'answer': option(q2, second)})
+        scores.append(submit(exam, paper, index, answers))
+    rebuild_statistics(exam.id)
+    return scores
+
+
+@pytest.mark.django_db
+class TestBuildItemAnalysis:
+    """문항 분석 계산 테스트"""
+
+    def test_difficulty_and_groups(self, exam, submitted_scores):
+        """정답률, 상/하위 27% 집단 득점률, 변별 지수"""
+        report = build_item_analysis(exam.id)
+
+        assert (report['student_count'], report['group_size']) == (6, 2)
+        for item in report['questions']:
+            assert item['presented_count'] == 6
+            assert item['p_value'] == 0.5
+            assert (item['upper_p'], item['lower_p'], item['discrimination_index']) == (1.0, 0.0, 1.0)
+
+    def test_point_biserial(self, exam, submitted_scores):
+        """문항 득점률과 총점 비율의 상관계수"""
+        report = build_item_analysis(exam.id)
+
+        totals = np.array([1, 1, 0.5, 0.5, 0, 0])
+        expected = [
+            np.corrcoef([1, 1, 1, 0, 0, 0], totals)[0, 1],
+            np.corrcoef([1, 1, 0, 1, 0, 0], totals)[0, 1],
+        ]
+        assert [item['point_biserial'] for item in report['questions']] == pytest.approx(expected, abs=1e-4)
+
+    def test_option_frequencies(self, exam, submitted_scores):
+        """선택지별 선택 빈도 (전체/상위/하위 집단)"""
+        report = build_item_analysis(exam.id)
+
+        q1, q2 = report['questions']
+        assert [(o['option'], o['count'], o['upper_count'], o['lower_count']) for o in q1['options']] == [
+            ('A', 2, 0, 1),
+            ('B', 3, 2, 0),
+            ('C', 1, 0, 1),
+        ]
+        assert [(o['option'], o['count'], o['ratio']) for o in q2['options']] == [('X', 3, 0.5), ('Y', 2, 0.3333)]
+
+    def test_no_submissions(self, exam):
+        """제출이 없으면 문항만 있고 지표는 없음"""
+        report = build_item_analysis(exam.id)
+
+        assert report['student_count'] == 0
+        assert [item['p_value'] for item in report['questions']] == [None, None]
+
+
+@pytest.mark.django_db
+class TestItemAnalysisJob:
+    """문항 분석 요청/백그라운드 계산 테스트"""
+
+    def test_request_then_process(self, exam, submitted_scores):
+        """요청 후 worker가 계산하면 최신 결과로 조회"""
+        analysis, is_current = request_analysis(exam.id)
+        assert (analysis.status, is_current, analysis.report) == (ItemAnalysis.STATUS_PENDING, False, None)
+
+        # 같은 버전으로 다시 요청해도 대기 상태 유지
+        request_analysis(exam.id)
+        assert process_analyses() == 1
+        assert process_analyses() == 0
+
+        analysis, is_current = request_analysis(exam.id)
+        assert (analysis.status, is_current) == (ItemAnalysis.STATUS_DONE, True)
+        assert analysis.report['student_count'] == 6
+
+    def test_new_submission_requests_recompute(self, exam, paper, questions, submitted_scores):
+        """새 제출이 있으면 이전 결과를 반환하며 재계산 요청"""
+        request_analysis(exam.id)
+        process_analyses()
+
+        submit(exam, paper, 6, [{'question_id': questions[0].id, 'answer': option(questions[0], 'B')}])
+        rebuild_statistics(exam.id)
+
+        analysis, is_current = request_analysis(exam.id)
+        assert (analysis.status, is_current) == (ItemAnalysis.STATUS_PENDING, False)
+        assert analysis.report['student_count'] == 6
+
+        out = StringIO()
+        call_command('analyze_items', stdout=out)
+        assert '1개 시험의 문항 분석을 완료했습니다' in out.getvalue()
+        assert request_analysis(exam.id)[0].report['student_count'] == 7
+
+    def test_api(self, teacher_user, exam, submitted_scores):
+        """교사 API: 계산 전 202, 계산 후 200"""
+        api_client = APIClient()
+        api_client.force_authenticate(user=teacher_user)
+        url = f'/api/v1/scores/exam/{exam.id}/item-analysis/'
+
+        response = api_client.get(url)
+        assert response.status_code == 202
+        assert response.data['report'] is None
+
+        process_analyses()
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert response.data['is_current'] is True
+        assert response.data['report']['questions'][0]['p_value'] == 0.5
+
+    def test_requires_numpy(self, teacher_user, exam, monkeypatch):
+        """numpy가 없으면 요청을 기록하지 않고 바로 오류"""
+        monkeypatch.setitem(sys.modules, 'numpy', None)
+        api_client = APIClient()
+        api_client.force_authenticate(user=teacher_user)
+
+        response = api_client.get(f'/api/v1/scores/exam/{exam.id}/item-analysis/')
+
+        assert response.status_code == 400
+        assert not ItemAnalysis.objects.filter(exam=exam).exists()
+        with pytest.raises(CommandError):
+            call_command('analyze_items')
+
+    def test_api_requires_creator(self, exam):
+        """작성자가 아니면 조회 불가"""
+        other = UserProfile.objects.create_user(username='other_items', password='pass', user_type='teacher')
+        api_client = APIClient()
+        api_client.force_authenticate(user=other)
+
+        response = api_client.get(f'/api/v1/scores/exam/{exam.id}/item-analysis/')
+
+        assert response.status_code == 403
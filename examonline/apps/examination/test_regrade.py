@@ -0,0 +1,184 @@
+"""
+Exam Regrade Tests.
+시험 재채점 테스트.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from examination.models import ExamStatistics, GradingJob
+from examination import regrade
+from examination.regrade import regrade_exam, regrade_record
+from examination.statistics import rebuild_statistics
+from testpaper.grading import build_answer_key
+from testpaper.manual_grading import grade_question
+from testpaper.models import TestScores
+from testquestion.models import OptionInfo
+from user.models import UserProfile, StudentsInfo
+
+
+@pytest.fixture
+def questions(make_question):
+    """객관식 10점 문제 + 수동 채점용 빈칸 5점 문제"""
+    return make_question('Q1', options=[('A', False), ('B', True)]), make_question('Q2', tq_type='tk', options=())
+
+
+@pytest.fixture
+def paper_questions(questions):
+    return list(zip(questions, (10, 5), strict=True))
+
+
+@pytest.fixture
+def exam(finished_exam):
+    return finished_exam
+
+
+@pytest.fixture
+def submitted_scores(db, exam, paper, questions):
+    """A 선택(0점), B 선택(10점), A 선택 + 빈칸 수동 채점 3점"""
+    choice, essay = questions
+    option_a, option_b = OptionInfo.objects.filter(test_question=choice).order_by('id')
+    answer_key = build_answer_key(paper.id)
+    scores = []
+    for index, (option, manual_score) in enumerate([(option_a, None), (option_b, None), (option_a, 3)]):
+        user = UserProfile.objects.create_user(username=f'regrade_student{index}', password='pass', user_type='student')
+        student = StudentsInfo.objects.create(user=user, student_name=f'Student {index}', student_id=f'2025030{index}')
+        total_score, detail_records = regrade_record(
+            answer_key,
+            {str(choice.id): {'answer': str(option.id)}, str(essay.id): {'answer': 'essay'}},
+        )
+        if manual_score is not None:
+            detail_records[str(essay.id)].update(score=manual_score, manual_graded=True, comment='partial')
+            total_score += manual_score
+        scores.append(
+            TestScores.objects.create(
+                exam=exam,
+                user=student,
+                test_paper=paper,
+                start_time=exam.start_time,
+                submit_time=exam.end_time,
+                is_submitted=True,
+                test_score=total_score,
+                detail_records=detail_records,
+            )
+        )
+    return scores
+
+
+def fix_answer(question):
+    """정답을 A로 수정"""
+    OptionInfo.objects.filter(test_question=question).update(is_right=False)
+    option_a = OptionInfo.objects.filter(test_question=question).order_by('id').first()
+    option_a.is_right = True
+    option_a.save()
+
+
+@pytest.mark.django_db
+class TestRegradeExam:
+    """시험 재채점 테스트"""
+
+    def test_regrade_after_answer_fix(self, exam, questions, submitted_scores):
+        """정답 수정 후 재채점, 수동 채점 항목은 유지"""
+        choice, essay = questions
+        assert [score.test_score for score in submitted_scores] == [0, 10, 3]
+        fix_answer(choice)
+
+        result = regrade_exam(exam, chunk_size=2)
+
+        assert result == (3, 3)
+        for score in submitted_scores:
+            score.refresh_from_db()
+        assert [score.test_score for score in submitted_scores] == [10, 0, 13]
+        assert submitted_scores[2].detail_records[str(essay.id)] == {
+            'answer': 'essay',
+            'is_correct': False,
+            'score': 3,
+            'max_score': 5,
+            'manual_graded': True,
+            'comment': 'partial',
+        }
+        assert submitted_scores[0].detail_records[str(choice.id)]['is_correct'] is True
+
+        assert regrade_exam(exam) == (3, 0)
+
+    def test_regrade_updates_statistics(self, exam, paper, questions, submitted_scores):
+        """재채점 점수 차이가 시험 통계에 반영"""
+        rebuild_statistics(exam.id)
+        fix_answer(questions[0])
+
+        regrade_exam(exam, chunk_size=2)
+
+        stats = ExamStatistics.objects.get(exam=exam, paper=paper)
+        assert (stats.submitted_count, stats.score_sum, stats.pass_count) == (3, 23, 2)
+        assert (stats.highest_score, stats.lowest_score) == (13, 0)
+
+    def test_regrade_keeps_manual_grade_during_regrade(self, exam, paper, questions, submitted_scores, monkeypatch):
+        """읽은 뒤 저장 전에 반영된 수동 채점을 덮어쓰지 않고 통계도 맞게 유지"""
+        choice, essay = questions
+        rebuild_statistics(exam.id)
+        fix_answer(choice)
+        regrade_rows = regrade._regrade_rows
+
+        def grade_during_regrade(answer_keys, rows):
+            changed = regrade_rows(answer_keys, rows)
+            if any(row[0] == submitted_scores[0].id for row in rows):
+                grade_question(submitted_scores[0], essay.id, 4, 'late')
+            return changed
+
+        monkeypatch.setattr(regrade, '_regrade_rows', grade_during_regrade)
+        regrade_exam(exam, chunk_size=1)
+
+        submitted_scores[0].refresh_from_db()
+        assert submitted_scores[0].test_score == 14
+        assert submitted_scores[0].detail_records[str(essay.id)]['comment'] == 'late'
+        assert submitted_scores[0].detail_records[str(choice.id)]['is_correct'] is True
+        stats = ExamStatistics.objects.get(exam=exam, paper=paper)
+        assert (stats.score_sum, stats.highest_score) == (
+            sum(TestScores.objects.filter(exam=exam).values_list('test_score', flat=True)),
+            14,
+        )
+
+    def test_regrade_skips_pending_grading(self, exam, questions, submitted_scores):
+        """채점 대기 중인 기록은 재채점 대상에서 제외"""
+        fix_answer(questions[0])
+        GradingJob.objects.create(test_score=submitted_scores[0], answers=[])
+
+        result = regrade_exam(exam)
+
+        assert result.regraded == 2
+        submitted_scores[0].refresh_from_db()
+        assert submitted_scores[0].test_score == 0
+
+    def test_regrade_process_pool(self, exam, questions, submitted_scores):
+        """프로세스 풀 모드도 같은 결과"""
+        fix_answer(questions[0])
+
+        out = StringIO()
+        call_command('regrade_exam', str(exam.id), '--workers', '2', '--chunk-size', '1', stdout=out)
+
+        assert '3건을 재채점했고 3건의 점수가 바뀌었습니다' in out.getvalue()
+        assert sorted(TestScores.objects.filter(exam=exam).values_list('test_score', flat=True)) == [0, 10, 13]
+
+    def test_regrade_api(self, teacher_user, exam, questions, submitted_scores):
+        """시험 작성자가 API로 재채점"""
+        fix_answer(questions[0])
+        api_client = APIClient()
+        api_client.force_authenticate(user=teacher_user)
+
+        response = api_client.post(f'/api/v1/exams/{exam.id}/regrade/')
+
+        assert response.status_code == 200
+        assert response.data['regraded'] == 3
+        assert response.data['changed'] == 3
+
+    def test_regrade_api_requires_creator(self, exam):
+        """작성자가 아니면 재채점 불가"""
+        other = UserProfile.objects.create_user(username='other_regrade', password='pass', user_type='teacher')
+        api_client = APIClient()
+        api_client.force_authenticate(user=other)
+
+        response = api_client.post(f'/api/v1/exams/{exam.id}/regrade/')
+
+        assert response.status_code == 403
@@ -0,0 +1,103 @@
+"""
+Exam Statistics Tests.
+시험 성적 누적 통계 테스트.
+"""
+
+import pytest
+from django.utils import timezone
+
+from examination.deadlines import auto_submit
+from examination.models import ExamStatistics
+from examination.statistics import rebuild_statistics, record_score_changes, record_submissions
+from examination.submissions import enqueue_submission, grade_submission, run_job
+from testpaper.models import TestScores
+from testquestion.models import OptionInfo
+from user.models import UserProfile, StudentsInfo
+
+
+@pytest.fixture
+def attempts(db, exam, paper):
+    """시작한 응시 기록 3개"""
+    attempts = []
+    for index in range(3):
+        user = UserProfile.objects.create_user(username=f'statistics_student{index}', password='pass', user_type='student')
+        student = StudentsInfo.objects.create(user=user, student_name=f'Student {index}', student_id=f'2025040{index}')
+        attempts.append(
+            TestScores.objects.create(
+                exam=exam, user=student, test_paper=paper, start_time=exam.start_time, detail_records={}
+            )
+        )
+    return attempts
+
+
+def answer(question, is_right):
+    option = OptionInfo.objects.get(test_question=question, is_right=is_right)
+    return [{'question_id': question.id, 'answer': str(option.id)}]
+
+
+def statistics(exam, paper):
+    stats = ExamStatistics.objects.get(exam=exam, paper=paper)
+    return stats.submitted_count, stats.score_sum, stats.pass_count, stats.highest_score, stats.lowest_score
+
+
+@pytest.mark.django_db
+class TestRecordStatistics:
+    """누적 통계 갱신 테스트"""
+
+    def test_record_submissions_accumulates(self, exam, paper):
+        """제출 점수 누적 (최고/최저 포함)"""
+        record_submissions(exam.id, paper.id, paper.passing_score, [10, 4])
+        record_submissions(exam.id, paper.id, paper.passing_score, [6])
+
+        assert statistics(exam, paper) == (3, 20, 2, 10, 4)
+
+    def test_lowering_highest_score_reaggregates(self, exam, paper, attempts):
+        """최고 점수가 내려가면 제출 기록으로 최고/최저 다시 계산"""
+        for attempt, score in zip(attempts, (10, 4, 7), strict=True):
+            TestScores.objects.filter(id=attempt.id).update(is_submitted=True, test_score=score)
+        rebuild_statistics(exam.id)
+
+        TestScores.objects.filter(id=attempts[0].id).update(test_score=2)
+        record_score_changes(exam.id, paper.id, paper.passing_score, [(10, 2)])
+
+        assert statistics(exam, paper) == (3, 13, 1, 7, 2)
+
+    def test_raising_score_without_reaggregate(self, django_assert_num_queries, exam, paper):
+        """최고/최저가 줄어들지 않는 변경은 통계 행만 갱신"""
+        record_submissions(exam.id, paper.id, paper.passing_score, [0, 5, 8])
+
+        with django_assert_num_queries(2):
+            record_score_changes(exam.id, paper.id, paper.passing_score, [(5, 9)])
+
+        assert statistics(exam, paper) == (3, 17, 2, 9, 0)
+
+
+@pytest.mark.django_db
+class TestSubmissionStatistics:
+    """제출 경로별 통계 반영 테스트"""
+
+    def test_sync_submit(self, exam, paper, question, attempts):
+        """동기 채점 제출"""
+        grade_submission(attempts[0], answer(question, True), timezone.now())
+        grade_submission(attempts[1], answer(question, False), timezone.now())
+
+        assert statistics(exam, paper) == (2, 10, 1, 10, 0)
+
+    def test_async_submit_counts_once(self, exam, paper, question, attempts):
+        """비동기 제출은 접수 시 제출 수, 채점 완료 시 점수 반영 (재처리되어도 중복 없음)"""
+        job = enqueue_submission(attempts[0], answer(question, True), timezone.now())
+        assert statistics(exam, paper) == (1, 0, 0, 0, 0)
+
+        assert run_job(job)
+        assert run_job(job)
+
+        assert statistics(exam, paper) == (1, 10, 1, 10, 10)
+
+    def test_auto_submit(self, exam, paper, question, attempts):
+        """마감 자동 제출"""
+        right = OptionInfo.objects.get(test_question=question, is_right=True)
+        TestScores.objects.filter(id=attempts[0].id).update(detail_records={str(question.id): {'answer': str(right.id)}})
+
+        assert auto_submit([attempt.id for attempt in attempts]) == 3
+
+        assert statistics(exam, paper) == (3, 10, 1, 10, 0)
@@ -0,0 +1,47 @@
+"""
+Answer key cache.
+시험지별 정답표를 (TestPaperInfo.id, 시험지 버전) 키로 캐시.
+
+조회 순서: 프로세스 로컬 LRU -> Redis -> DB (build_answer_key)
+OptionInfo, TestPaperTestQ, TestQuestionInfo 변경 시 signals에서 시험지 버전을 증가시켜 무효화.
+시험지 버전은 시험지 내용으로 만든 다른 캐시(시험 문제 payload 등)의 키에도 사용.
+"""
+from django.conf import settings
+
+from core.cache import LocalLRUCache, bump_version, get_or_build, get_version
+from testpaper.grading import build_answer_key
+from testpaper.models import TestPaperTestQ
+
+PAPER_VERSION_NAMESPACE = 'paper'
+
+# 정답표(AnswerKeyEntry) 구조가 바뀌면 증가 (이전 형식의 캐시 무시)
+ANSWER_KEY_FORMAT = 2
+
+_local_answer_keys = LocalLRUCache(maxsize=settings.LOCAL_CACHE_MAXSIZE)
+
+
+def get_paper_version(paper_id):
+    """시험지 캐시 버전"""
+    return get_version(PAPER_VERSION_NAMESPACE, paper_id)
+
+
+def get_answer_key(paper_id):
+    """시험지 정답표 조회 (캐시 우선)"""
+    return get_or_build(
+        f'answer_key:v{ANSWER_KEY_FORMAT}:{paper_id}:{get_paper_version(paper_id)}',
+        lambda: build_answer_key(paper_id),
+        local_cache=_local_answer_keys,
+        timeout=settings.ANSWER_KEY_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_paper(paper_id):
+    """시험지 캐시 무효화 (버전 증가)"""
+    bump_version(PAPER_VERSION_NAMESPACE, paper_id)
+
+
+def invalidate_papers_for_question(question_id):
+    """문제가 포함된 모든 시험지의 캐시 무효화"""
+    paper_ids = TestPaperTestQ.objects.filter(test_question_id=question_id).values_list('test_paper_id', flat=True)
+    for paper_id in set(paper_ids):
+        invalidate_paper(paper_id)
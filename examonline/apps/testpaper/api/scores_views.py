@@ -2,24 +2,35 @@
 Scores API Views.
 성적 조회 및 관리 API.
 """
-from django.db import transaction
-from django.db.models import Avg, Max, Min, Count, Q
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from examination.models import ExaminationInfo, ExamStudentsInfo
+from core.api.pagination import KeysetPagination
+from examination.distribution import DEFAULT_PERCENTILES, distribution_available, get_distribution
+from examination.eligibility import get_enrolled_ids
+from examination.item_analysis import numpy_available, request_analysis
+from examination.models import ExaminationInfo
+from examination.statistics import get_statistics_rows
+from testpaper.exports import export_rows, stream_csv, stream_xlsx, xlsx_available
+from testpaper.manual_grading import ManualGradeError, bulk_manual_grade, grade_question
 from testpaper.models import TestScores, TestPaperTestQ
 from testquestion.models import TestQuestionInfo
 
 from .serializers import (
+    BulkManualGradeSerializer,
     MyScoreListSerializer,
     MyScoreDetailSerializer,
     ExamScoreListSerializer,
     ExamStatisticsSerializer,
+    ItemAnalysisSerializer,
     ManualGradeSerializer,
+    ScoreDistributionQuerySerializer,
+    ScoreDistributionSerializer,
+    ScoreExportQuerySerializer,
 )
 
 
@@ -44,7 +55,9 @@ class ScoresViewSet(viewsets.ViewSet):
     def my_scores(self, request):
         """
         내 성적 목록 조회 (학생용).
-        GET /api/v1/scores/my/
+        GET /api/v1/scores/my/?cursor=&page_size=&count=approx
+
+        제출 시간 역순 keyset 페이지네이션.
         """
         student_info = self.get_student_info(request.user)
         if not student_info:
@@ -53,10 +66,12 @@ class ScoresViewSet(viewsets.ViewSet):
         # 제출한 성적만 조회
         scores = TestScores.objects.filter(user=student_info, is_submitted=True).select_related(
             'exam', 'exam__subject', 'test_paper'
-        ).order_by('-submit_time')
+        ).order_by('-submit_time', '-id')
 
-        serializer = MyScoreListSerializer(scores, many=True)
-        return Response({'scores': serializer.data}, status=status.HTTP_200_OK)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(scores, request, view=self)
+        serializer = MyScoreListSerializer(page, many=True)
+        return Response({'scores': serializer.data, 'meta': paginator.get_meta()}, status=status.HTTP_200_OK)
 
     @action(detail=False, methods=['get'], url_path='my/(?P<exam_id>[^/.]+)')
     def my_score_detail(self, request, exam_id=None):
@@ -88,7 +103,9 @@ class ScoresViewSet(viewsets.ViewSet):
     def exam_scores(self, request, exam_id=None):
         """
         시험별 성적 목록 조회 (교사용).
-        GET /api/v1/scores/exam/{exam_id}/
+        GET /api/v1/scores/exam/{exam_id}/?cursor=&page_size=&count=approx
+
+        제출 여부, 점수 역순 keyset 페이지네이션. 전체 목록은 export 사용.
         """
         if request.user.user_type != 'teacher':
             return Response({'detail': '교사만 접근할 수 있습니다.'}, status=status.HTTP_403_FORBIDDEN)
@@ -104,11 +121,55 @@ class ScoresViewSet(viewsets.ViewSet):
 
         # 시험 등록된 모든 학생의 성적 조회
         scores = TestScores.objects.filter(exam=exam).select_related('user', 'test_paper').order_by(
-            '-is_submitted', '-test_score'
+            '-is_submitted', '-test_score', '-id'
+        )
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(scores, request, view=self)
+        serializer = ExamScoreListSerializer(page, many=True)
+        return Response(
+            {'exam_id': exam.id, 'exam_name': exam.name, 'scores': serializer.data, 'meta': paginator.get_meta()},
+            status=status.HTTP_200_OK,
         )
 
-        serializer = ExamScoreListSerializer(scores, many=True)
-        return Response({'exam_id': exam.id, 'exam_name': exam.name, 'scores': serializer.data}, status=status.HTTP_200_OK)
+    @action(detail=False, methods=['get'], url_path='exam/(?P<exam_id>[^/.]+)/export')
+    def export_exam_scores(self, request, exam_id=None):
+        """
+        시험별 성적 내보내기 (교사용).
+        GET /api/v1/scores/exam/{exam_id}/export/?file_type=csv|xlsx
+
+        학번/이름/반/학교와 점수를 학번 순으로 스트리밍 (응시 기록 수와 무관하게 메모리 일정).
+        """
+        if request.user.user_type != 'teacher':
+            return Response({'detail': '교사만 접근할 수 있습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            exam = ExaminationInfo.objects.get(id=exam_id)
+        except ExaminationInfo.DoesNotExist:
+            return Response({'detail': '시험을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        # 시험 작성자만 조회 가능
+        if exam.create_user != request.user:
+            return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        query = ScoreExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        file_type = query.validated_data['file_type']
+
+        if file_type == 'xlsx':
+            if not xlsx_available():
+                return Response(
+                    {'detail': 'XLSX 내보내기를 사용할 수 없습니다. CSV로 내보내세요.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            response = StreamingHttpResponse(
+                stream_xlsx(export_rows(exam)),
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            )
+        else:
+            response = StreamingHttpResponse(stream_csv(export_rows(exam)), content_type='text/csv; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="exam_{exam.id}_scores.{file_type}"'
+        return response
 
     @action(detail=False, methods=['get'], url_path='exam/(?P<exam_id>[^/.]+)/statistics')
     def exam_statistics(self, request, exam_id=None):
@@ -128,57 +189,121 @@ class ScoresViewSet(viewsets.ViewSet):
         if exam.create_user != request.user:
             return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
 
-        # 통계 계산
-        total_students = ExamStudentsInfo.objects.filter(exam=exam).count()
-        scores = TestScores.objects.filter(exam=exam, is_submitted=True)
+        # 통계 계산 (시험지별 누적 통계 행에서 합산, 집계 쿼리 없음)
+        total_students = len(get_enrolled_ids(exam.id))
+        rows = [row for row in get_statistics_rows(exam.id) if row.submitted_count]
+
+        submitted_count = sum(row.submitted_count for row in rows)
+        pass_count = sum(row.pass_count for row in rows)
+        score_sum = sum(row.score_sum for row in rows)
+
+        data = {
+            'exam_id': exam.id,
+            'exam_name': exam.name,
+            'total_students': total_students,
+            'submitted_count': submitted_count,
+            'not_submitted_count': total_students - submitted_count,
+            'average_score': round(score_sum / submitted_count, 2) if submitted_count else 0,
+            'highest_score': max((row.highest_score for row in rows), default=0),
+            'lowest_score': min((row.lowest_score for row in rows), default=0),
+            'pass_count': pass_count,
+            'fail_count': submitted_count - pass_count,
+            'pass_rate': round(pass_count / submitted_count * 100, 2) if submitted_count else 0.0,
+            # 시험지(형)별 통계, 합격 여부는 각 시험지 합격점 기준
+            'forms': [
+                {
+                    'paper_id': row.paper_id,
+                    'paper_name': row.paper.name,
+                    'submitted_count': row.submitted_count,
+                    'average_score': round(row.score_sum / row.submitted_count, 2),
+                    'highest_score': row.highest_score,
+                    'lowest_score': row.lowest_score,
+                    'pass_count': row.pass_count,
+                    'pass_rate': round(row.pass_count / row.submitted_count * 100, 2),
+                }
+                for row in rows
+            ],
+        }
 
-        submitted_count = scores.count()
-        not_submitted_count = total_students - submitted_count
+        serializer = ExamStatisticsSerializer(data)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
-        if submitted_count == 0:
-            data = {
-                'exam_id': exam.id,
-                'exam_name': exam.name,
-                'total_students': total_students,
-                'submitted_count': 0,
-                'not_submitted_count': not_submitted_count,
-                'average_score': 0,
-                'highest_score': 0,
-                'lowest_score': 0,
-                'pass_count': 0,
-                'fail_count': 0,
-                'pass_rate': 0.0,
-            }
-        else:
-            stats = scores.aggregate(avg_score=Avg('test_score'), max_score=Max('test_score'), min_score=Min('test_score'))
-
-            # 합격/불합격 수 계산
-            paper = exam.exampaperinfo_set.first().paper if exam.exampaperinfo_set.exists() else None
-            if paper:
-                pass_count = scores.filter(test_score__gte=paper.passing_score).count()
-                fail_count = submitted_count - pass_count
-                pass_rate = (pass_count / submitted_count * 100) if submitted_count > 0 else 0
-            else:
-                pass_count = 0
-                fail_count = 0
-                pass_rate = 0.0
-
-            data = {
+    @action(detail=False, methods=['get'], url_path='exam/(?P<exam_id>[^/.]+)/distribution')
+    def exam_distribution(self, request, exam_id=None):
+        """
+        시험 점수 분포 조회 (교사용).
+        GET /api/v1/scores/exam/{exam_id}/distribution/?buckets=10&percentiles=10,90
+
+        히스토그램, 사분위수/중앙값, 표준편차, 백분위수 (다음 제출/채점 전까지 캐시).
+        """
+        if request.user.user_type != 'teacher':
+            return Response({'detail': '교사만 접근할 수 있습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            exam = ExaminationInfo.objects.get(id=exam_id)
+        except ExaminationInfo.DoesNotExist:
+            return Response({'detail': '시험을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        # 시험 작성자만 조회 가능
+        if exam.create_user != request.user:
+            return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        query = ScoreDistributionQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        if not distribution_available():
+            return Response(
+                {'detail': '점수 분포를 사용할 수 없습니다 (numpy 미설치).'}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        distribution = get_distribution(
+            exam.id,
+            percentiles=query.validated_data.get('percentiles', DEFAULT_PERCENTILES),
+            buckets=query.validated_data['buckets'],
+        )
+        serializer = ScoreDistributionSerializer({'exam_id': exam.id, 'exam_name': exam.name, **distribution})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='exam/(?P<exam_id>[^/.]+)/item-analysis')
+    def exam_item_analysis(self, request, exam_id=None):
+        """
+        시험 문항 분석 조회 (교사용).
+        GET /api/v1/scores/exam/{exam_id}/item-analysis/
+
+        문항별 난이도, 변별도, 상/하위 27% 집단 득점률, 선택지별 선택 빈도.
+        계산은 analyze_items 명령(worker)이 수행하며, 최신 결과가 없으면 재계산을 요청하고
+        이전 결과(없으면 null)와 함께 202 응답.
+        """
+        if request.user.user_type != 'teacher':
+            return Response({'detail': '교사만 접근할 수 있습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            exam = ExaminationInfo.objects.get(id=exam_id)
+        except ExaminationInfo.DoesNotExist:
+            return Response({'detail': '시험을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
+
+        # 시험 작성자만 조회 가능
+        if exam.create_user != request.user:
+            return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        if not numpy_available():
+            return Response(
+                {'detail': '문항 분석을 사용할 수 없습니다 (numpy 미설치).'}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        analysis, is_current = request_analysis(exam.id)
+        serializer = ItemAnalysisSerializer(
+            {
                 'exam_id': exam.id,
                 'exam_name': exam.name,
-                'total_students': total_students,
-                'submitted_count': submitted_count,
-                'not_submitted_count': not_submitted_count,
-                'average_score': round(stats['avg_score'], 2) if stats['avg_score'] else 0,
-                'highest_score': stats['max_score'] or 0,
-                'lowest_score': stats['min_score'] or 0,
-                'pass_count': pass_count,
-                'fail_count': fail_count,
-                'pass_rate': round(pass_rate, 2),
+                'status': analysis.status,
+                'is_current': is_current,
+                'finished_time': analysis.finished_time,
+                'error': analysis.error,
+                'report': analysis.report,
             }
-
-        serializer = ExamStatisticsSerializer(data)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        )
+        return Response(serializer.data, status=status.HTTP_200_OK if is_current else status.HTTP_202_ACCEPTED)
 
     @action(detail=False, methods=['get'], url_path='exam/(?P<exam_id>[^/.]+)/student/(?P<student_id>[^/.]+)')
     def student_score_detail(self, request, exam_id=None, student_id=None):
@@ -234,26 +359,47 @@ class ScoresViewSet(viewsets.ViewSet):
         new_score = serializer.validated_data['score']
         comment = serializer.validated_data.get('comment', '')
 
-        # detail_records 업데이트
-        with transaction.atomic():
-            if not score.detail_records:
-                score.detail_records = {}
+        # 해당 문제 항목과 총점만 DB에서 갱신 (동시 채점 시 갱신 손실 없음)
+        _, new_total = grade_question(score, question_id, new_score, comment)
+
+        return Response(
+            {'detail': '채점이 완료되었습니다.', 'new_total_score': new_total}, status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['post'], url_path='exam/(?P<exam_id>[^/.]+)/grade')
+    def bulk_grade(self, request, exam_id=None):
+        """
+        일괄 수동 채점 (교사용).
+        POST /api/v1/scores/exam/{exam_id}/grade/
+
+        Request Body:
+        {
+            "grades": [{"score_id": 1, "question_id": 2, "score": 3, "comment": "..."}, ...]
+        }
+        모든 항목을 한 트랜잭션에서 반영 (하나라도 잘못되면 반영하지 않음).
+        """
+        if request.user.user_type != 'teacher':
+            return Response({'detail': '교사만 접근할 수 있습니다.'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            exam = ExaminationInfo.objects.get(id=exam_id)
+        except ExaminationInfo.DoesNotExist:
+            return Response({'detail': '시험을 찾을 수 없습니다.'}, status=status.HTTP_404_NOT_FOUND)
 
-            question_id_str = str(question_id)
-            if question_id_str not in score.detail_records:
-                score.detail_records[question_id_str] = {}
+        # 시험 작성자만 채점 가능
+        if exam.create_user != request.user:
+            return Response({'detail': '권한이 없습니다.'}, status=status.HTTP_403_FORBIDDEN)
 
-            # 기존 점수 차감
-            old_score = score.detail_records[question_id_str].get('score', 0)
-            score.detail_records[question_id_str]['score'] = new_score
-            score.detail_records[question_id_str]['manual_graded'] = True
-            if comment:
-                score.detail_records[question_id_str]['comment'] = comment
+        serializer = BulkManualGradeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-            # 총점 재계산
-            score.test_score = score.test_score - old_score + new_score
-            score.save()
+        try:
+            graded = bulk_manual_grade(exam, serializer.validated_data['grades'])
+        except ManualGradeError as e:
+            return Response(
+                {'detail': '채점 항목을 확인하세요.', 'errors': e.errors}, status=status.HTTP_400_BAD_REQUEST
+            )
 
         return Response(
-            {'detail': '채점이 완료되었습니다.', 'new_total_score': score.test_score}, status=status.HTTP_200_OK
+            {'detail': f'{graded}건의 응시 기록을 채점했습니다.', 'graded': graded}, status=status.HTTP_200_OK
         )
@@ -261,8 +261,9 @@ class AddQuestionsSerializer(serializers.Serializer):
 
 # ==================== 성적 관련 Serializers ====================
 
+from testpaper.manual_grading import MAX_BULK_GRADES
 from testpaper.models import TestScores
-from testquestion.models import OptionInfo
+from testpaper.results import get_question_results
 from user.models import StudentsInfo
 
 
@@ -359,43 +360,8 @@ class MyScoreDetailSerializer(serializers.ModelSerializer):
         return False
 
     def get_question_results(self, obj):
-        """문제별 결과"""
-        if not obj.detail_records:
-            return []
-
-        # 시험지의 문제 목록 가져오기
-        paper_questions = TestPaperTestQ.objects.filter(test_paper=obj.test_paper).select_related(
-            'test_question'
-        ).order_by('order')
-
-        results = []
-        for pq in paper_questions:
-            question = pq.test_question
-            question_id_str = str(question.id)
-            record = obj.detail_records.get(question_id_str, {})
-
-            # 정답 찾기
-            correct_answer = None
-            if question.tq_type in ['xz', 'pd']:  # 객관식, OX
-                try:
-                    correct_option = OptionInfo.objects.get(test_question=question, is_right=True)
-                    correct_answer = correct_option.option
-                except OptionInfo.DoesNotExist:
-                    pass
-
-            results.append({
-                'question_id': question.id,
-                'question_name': question.name,
-                'question_type': question.tq_type,
-                'question_type_display': question.get_tq_type_display(),
-                'user_answer': record.get('answer', ''),
-                'correct_answer': correct_answer,
-                'is_correct': record.get('is_correct'),
-                'score': record.get('score', 0),
-                'max_score': pq.score,
-            })
-
-        return results
+        """문제별 결과 (제출된 기록은 캐시된 결과 문서)"""
+        return get_question_results(obj)
 
 
 class ExamScoreListSerializer(serializers.ModelSerializer):
@@ -426,6 +392,19 @@ class ExamScoreListSerializer(serializers.ModelSerializer):
         return None
 
 
+class ExamFormStatisticsSerializer(serializers.Serializer):
+    """시험지(형)별 성적 통계 Serializer"""
+
+    paper_id = serializers.IntegerField()
+    paper_name = serializers.CharField()
+    submitted_count = serializers.IntegerField()
+    average_score = serializers.FloatField()
+    highest_score = serializers.IntegerField()
+    lowest_score = serializers.IntegerField()
+    pass_count = serializers.IntegerField()
+    pass_rate = serializers.FloatField()
+
+
 class ExamStatisticsSerializer(serializers.Serializer):
     """시험 성적 통계 Serializer"""
 
@@ -440,6 +419,113 @@ class ExamStatisticsSerializer(serializers.Serializer):
     pass_count = serializers.IntegerField()
     fail_count = serializers.IntegerField()
     pass_rate = serializers.FloatField()
+    forms = ExamFormStatisticsSerializer(many=True)
+
+
+class ScoreDistributionQuerySerializer(serializers.Serializer):
+    """점수 분포 조회 조건 Serializer (query string)"""
+
+    buckets = serializers.IntegerField(min_value=1, max_value=100, default=10, help_text='히스토그램 구간 수')
+    percentiles = serializers.CharField(
+        required=False, help_text='추가로 계산할 백분위수 (쉼표 구분, 예: 10,90)'
+    )
+
+    def validate_percentiles(self, value):
+        """백분위수 목록 변환 (0~100, 최대 20개)"""
+        try:
+            percentiles = [float(item) for item in value.split(',') if item.strip()]
+        except ValueError:
+            raise serializers.ValidationError('백분위수는 숫자여야 합니다.') from None
+        if not percentiles or len(percentiles) > 20:
+            raise serializers.ValidationError('백분위수는 1~20개까지 지정할 수 있습니다.')
+        if any(not 0 <= percentile <= 100 for percentile in percentiles):
+            raise serializers.ValidationError('백분위수는 0~100 사이여야 합니다.')
+        return percentiles
+
+
+class ScoreExportQuerySerializer(serializers.Serializer):
+    """성적 내보내기 조건 Serializer (query string)"""
+
+    file_type = serializers.ChoiceField(choices=['csv', 'xlsx'], default='csv', help_text='파일 형식')
+
+
+class HistogramBucketSerializer(serializers.Serializer):
+    """점수 히스토그램 구간 Serializer"""
+
+    lower = serializers.FloatField()
+    upper = serializers.FloatField()
+    count = serializers.IntegerField()
+
+
+class QuartilesSerializer(serializers.Serializer):
+    """사분위수 Serializer"""
+
+    q1 = serializers.FloatField()
+    q2 = serializers.FloatField()
+    q3 = serializers.FloatField()
+
+
+class ScoreDistributionSerializer(serializers.Serializer):
+    """시험 점수 분포 Serializer"""
+
+    exam_id = serializers.IntegerField()
+    exam_name = serializers.CharField()
+    count = serializers.IntegerField()
+    mean = serializers.FloatField()
+    median = serializers.FloatField(allow_null=True)
+    stddev = serializers.FloatField()
+    lowest = serializers.IntegerField(allow_null=True)
+    highest = serializers.IntegerField(allow_null=True)
+    quartiles = QuartilesSerializer(allow_null=True)
+    percentiles = serializers.DictField(child=serializers.FloatField())
+    histogram = HistogramBucketSerializer(many=True)
+
+
+class ItemOptionAnalysisSerializer(serializers.Serializer):
+    """선택지별 선택 빈도 Serializer"""
+
+    option_id = serializers.IntegerField()
+    option = serializers.CharField()
+    is_right = serializers.BooleanField()
+    count = serializers.IntegerField()
+    ratio = serializers.FloatField(allow_null=True)
+    upper_count = serializers.IntegerField(help_text='상위 27% 집단 선택 수')
+    lower_count = serializers.IntegerField(help_text='하위 27% 집단 선택 수')
+
+
+class ItemQuestionAnalysisSerializer(serializers.Serializer):
+    """문항별 분석 Serializer"""
+
+    question_id = serializers.IntegerField()
+    name = serializers.CharField()
+    tq_type = serializers.CharField()
+    presented_count = serializers.IntegerField(help_text='문항을 받은 응시자 수')
+    p_value = serializers.FloatField(allow_null=True, help_text='난이도 (평균 득점률)')
+    point_biserial = serializers.FloatField(allow_null=True, help_text='변별도 (점-이연 상관계수)')
+    upper_p = serializers.FloatField(allow_null=True, help_text='상위 27% 집단 득점률')
+    lower_p = serializers.FloatField(allow_null=True, help_text='하위 27% 집단 득점률')
+    discrimination_index = serializers.FloatField(allow_null=True, help_text='변별 지수 (상위 - 하위)')
+    options = ItemOptionAnalysisSerializer(many=True)
+
+
+class ItemAnalysisReportSerializer(serializers.Serializer):
+    """문항 분석 결과 Serializer"""
+
+    student_count = serializers.IntegerField()
+    group_size = serializers.IntegerField(help_text='상/하위 집단 인원')
+    questions = ItemQuestionAnalysisSerializer(many=True)
+
+
+class ItemAnalysisSerializer(serializers.Serializer):
+    """시험 문항 분석 Serializer"""
+
+    exam_id = serializers.IntegerField()
+    exam_name = serializers.CharField()
+    status = serializers.CharField()
+    is_current = serializers.BooleanField(help_text='최신 제출/채점 결과 반영 여부')
+    finished_time = serializers.DateTimeField(allow_null=True)
+    error = serializers.CharField(allow_blank=True)
+    report = ItemAnalysisReportSerializer(allow_null=True)
 
 
 class ManualGradeSerializer(serializers.Serializer):
@@ -468,3 +554,28 @@ class ManualGradeSerializer(serializers.Serializer):
             raise serializers.ValidationError({'question_id': '시험지에 없는 문제입니다.'})
 
         return attrs
+
+
+class ManualGradeEntrySerializer(serializers.Serializer):
+    """일괄 수동 채점 항목 Serializer"""
+
+    score_id = serializers.IntegerField()
+    question_id = serializers.IntegerField()
+    score = serializers.IntegerField(min_value=0)
+    comment = serializers.CharField(required=False, allow_blank=True)
+
+
+class BulkManualGradeSerializer(serializers.Serializer):
+    """
+    일괄 수동 채점용 Serializer.
+    배점/응시 기록 검증은 bulk_manual_grade에서 시험지 문제 목록을 한 번만 읽어 처리.
+    """
+
+    grades = ManualGradeEntrySerializer(many=True, allow_empty=False, max_length=MAX_BULK_GRADES)
+
+    def validate_grades(self, grades):
+        """같은 응시 기록/문제 중복 검증"""
+        keys = [(grade['score_id'], grade['question_id']) for grade in grades]
+        if len(set(keys)) != len(keys):
+            raise serializers.ValidationError('같은 응시 기록의 같은 문제가 중복되었습니다.')
+        return grades
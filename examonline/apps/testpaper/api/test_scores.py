@@ -2,13 +2,26 @@
 Scores API Tests.
 성적 조회 및 관리 API 테스트.
 """
+import csv
+import io
+import sys
+import threading
+import time
+import zipfile
+
 import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from datetime import timedelta
 from rest_framework.test import APIClient
 
-from examination.models import ExaminationInfo, ExamPaperInfo, ExamStudentsInfo
+from examination.models import ExaminationInfo, ExamPaperInfo, ExamStatistics, ExamStudentsInfo
+from examination.distribution import _numpy_distribution, _postgres_distribution
+from examination.statistics import rebuild_statistics, record_submissions
+from testpaper.manual_grading import _grade_in_memory, grade_question
 from testpaper.models import TestPaperInfo, TestPaperTestQ, TestScores
+from testpaper.results import build_question_results, get_question_results
 from testquestion.models import TestQuestionInfo, OptionInfo
 from user.models import UserProfile, SubjectInfo, StudentsInfo
 
@@ -179,6 +192,39 @@ class TestMyScores:
         assert len(response.data['question_results']) == 2
         assert response.data['question_results'][0]['is_correct'] is True
 
+    def test_question_results_single_query(self, django_assert_num_queries, submitted_score):
+        """정답은 정답표 캐시에서, 문제 목록은 쿼리 1회"""
+        build_question_results(submitted_score)
+
+        with django_assert_num_queries(1):
+            results = build_question_results(submitted_score)
+
+        assert [result['correct_answer'] for result in results] == ['4', 'True']
+        assert results[1]['question_type_display'] == '주관식'
+
+    def test_question_results_cached(self, django_assert_num_queries, submitted_score):
+        """제출된 기록의 결과 문서는 캐시에서 조회"""
+        get_question_results(submitted_score)
+
+        with django_assert_num_queries(0):
+            assert len(get_question_results(submitted_score)) == 2
+
+    def test_manual_grade_refreshes_results(
+        self, api_client, teacher_user, student_user, examination, submitted_score, true_false_question
+    ):
+        """수동 채점 후 학생 성적 상세에 반영"""
+        api_client.force_authenticate(user=student_user)
+        api_client.get(f'/api/v1/scores/my/{examination.id}/')
+
+        api_client.force_authenticate(user=teacher_user)
+        api_client.post(
+            f'/api/v1/scores/{submitted_score.id}/grade/', {'question_id': true_false_question.id, 'score': 2}, format='json'
+        )
+
+        api_client.force_authenticate(user=student_user)
+        response = api_client.get(f'/api/v1/scores/my/{examination.id}/')
+        assert response.data['question_results'][1]['score'] == 2
+
     def test_my_score_detail_not_submitted(self, api_client, student_user, examination):
         """제출하지 않은 시험 조회 실패"""
         api_client.force_authenticate(user=student_user)
@@ -209,6 +255,50 @@ class TestExamScores:
         assert len(response.data['scores']) == 1
         assert response.data['scores'][0]['test_score'] == 15
 
+    def test_exam_scores_keyset_pages(self, api_client, teacher_user, examination, test_paper):
+        """점수 역순 keyset 페이지 (동점은 ID 역순, 다음/이전 커서 왕복)"""
+        for index, score in enumerate((15, 10, 10, 10, 5, 0, 0)):
+            user = UserProfile.objects.create_user(username=f'page_student{index}', password='pass', user_type='student')
+            student = StudentsInfo.objects.create(user=user, student_name=f'Student {index}', student_id=f'2025070{index}')
+            TestScores.objects.create(
+                exam=examination, user=student, test_paper=test_paper, is_submitted=True, test_score=score
+            )
+        expected = list(
+            TestScores.objects.filter(exam=examination).order_by('-test_score', '-id').values_list('id', flat=True)
+        )
+        api_client.force_authenticate(user=teacher_user)
+
+        pages = []
+        url = f'/api/v1/scores/exam/{examination.id}/?page_size=3'
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == 200
+            pages.append(response.data)
+            url = response.data['meta']['next']
+
+        assert [len(page['scores']) for page in pages] == [3, 3, 1]
+        assert [score['id'] for page in pages for score in page['scores']] == expected
+        assert pages[0]['meta']['previous'] is None
+
+        previous = api_client.get(pages[2]['meta']['previous']).data
+        assert [score['id'] for score in previous['scores']] == expected[3:6]
+        assert previous['meta']['next'] is not None
+
+    def test_exam_scores_approximate_count(self, api_client, teacher_user, examination, submitted_score):
+        """요청한 경우에만 대략적인 전체 개수 포함"""
+        api_client.force_authenticate(user=teacher_user)
+        url = f'/api/v1/scores/exam/{examination.id}/'
+
+        assert 'approximate_count' not in api_client.get(url).data['meta']
+        assert api_client.get(f'{url}?count=approx').data['meta']['approximate_count'] >= 0
+
+    def test_exam_scores_invalid_cursor(self, api_client, teacher_user, examination):
+        """잘못된 커서"""
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/?cursor=invalid')
+
+        assert response.status_code == 404
+
     def test_exam_scores_student_forbidden(self, api_client, student_user, examination):
         """학생은 시험 성적 조회 불가"""
         api_client.force_authenticate(user=student_user)
@@ -233,6 +323,63 @@ class TestExamScores:
         assert response.status_code == 404
 
 
+@pytest.mark.django_db
+class TestExportScores:
+    """시험 성적 내보내기 테스트"""
+
+    def read_csv(self, response):
+        content = b''.join(response.streaming_content).decode('utf-8')
+        assert content.startswith('\ufeff')
+        return list(csv.reader(io.StringIO(content[1:])))
+
+    def test_export_csv(self, api_client, teacher_user, student_user2, examination, test_paper, submitted_score):
+        """학번 순 CSV (학번/반/학교 포함, 미제출은 점수 공란)"""
+        TestScores.objects.create(exam=examination, user=student_user2.studentsinfo, test_paper=test_paper)
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/export/')
+
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        assert f'exam_{examination.id}_scores.csv' in response['Content-Disposition']
+        rows = self.read_csv(response)
+        assert rows[0][:4] == ['학번', '이름', '반', '학교']
+        assert rows[1][:8] == ['20250201', 'Scores Student', '2-A', 'Test School', 'Scores Test Paper', 'Y', '15', 'Y']
+        assert rows[2][:8] == ['20250202', 'Student 2', '2-B', 'Test School', 'Scores Test Paper', 'N', '', '']
+
+    def test_export_csv_escapes_formulas(self, api_client, teacher_user, student_user, examination, submitted_score):
+        """수식으로 시작하는 값은 텍스트로 내보냄"""
+        StudentsInfo.objects.filter(user=student_user).update(student_name='=HYPERLINK("x")')
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/export/')
+
+        assert self.read_csv(response)[1][1] == '\'=HYPERLINK("x")'
+
+    def test_export_xlsx(self, api_client, teacher_user, examination, submitted_score):
+        """XLSX 내보내기"""
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/export/?file_type=xlsx')
+
+        assert response.status_code == 200
+        workbook = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        sheet = workbook.read('xl/worksheets/sheet1.xml').decode('utf-8')
+        assert 'Scores Student' in sheet
+        assert '2-A' in sheet
+
+    def test_export_invalid_file_type(self, api_client, teacher_user, examination):
+        """지원하지 않는 형식"""
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/export/?file_type=pdf')
+
+        assert response.status_code == 400
+
+    def test_export_not_creator(self, api_client, another_teacher, examination):
+        """시험 작성자가 아닌 교사는 내보내기 불가"""
+        api_client.force_authenticate(user=another_teacher)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/export/')
+
+        assert response.status_code == 403
+
+
 @pytest.mark.django_db
 class TestExamStatistics:
     """시험 성적 통계 테스트"""
@@ -254,6 +401,8 @@ class TestExamStatistics:
             test_score=5,  # 불합격
             time_used=60,
         )
+        # ORM으로 직접 만든 제출 기록을 통계에 반영
+        rebuild_statistics(examination.id)
 
         api_client.force_authenticate(user=teacher_user)
         response = api_client.get(f'/api/v1/scores/exam/{examination.id}/statistics/')
@@ -269,6 +418,54 @@ class TestExamStatistics:
         assert response.data['fail_count'] == 1
         assert response.data['pass_rate'] == 50.0
 
+    def test_exam_statistics_by_form(
+        self, api_client, teacher_user, subject, examination, student_user, student_user2, submitted_score
+    ):
+        """시험지(형)별 통계, 합격 여부는 각 시험지 합격점 기준"""
+        form_b = TestPaperInfo.objects.create(
+            name='Form B', subject=subject, total_score=10, passing_score=4, create_user=teacher_user
+        )
+        ExamPaperInfo.objects.create(exam=examination, paper=form_b)
+        TestScores.objects.create(
+            exam=examination,
+            user=student_user2.studentsinfo,
+            test_paper=form_b,
+            start_time=timezone.now() - timedelta(hours=2),
+            submit_time=timezone.now() - timedelta(hours=1),
+            is_submitted=True,
+            test_score=5,  # A형 기준 불합격, B형 기준 합격
+            time_used=60,
+        )
+        rebuild_statistics(examination.id)
+
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/statistics/')
+
+        assert response.status_code == 200
+        assert response.data['pass_count'] == 2
+        assert response.data['fail_count'] == 0
+        forms = {form['paper_name']: form for form in response.data['forms']}
+        assert forms['Form B']['submitted_count'] == 1
+        assert forms['Form B']['average_score'] == 5.0
+        assert forms['Form B']['pass_rate'] == 100.0
+        assert forms[submitted_score.test_paper.name]['highest_score'] == 15
+
+    def test_exam_statistics_reads_materialized_rows(
+        self, api_client, django_assert_max_num_queries, teacher_user, examination, student_user, submitted_score
+    ):
+        """통계는 누적 통계 행만 읽음 (제출 기록 집계 없음)"""
+        ExamStudentsInfo.objects.create(exam=examination, student=student_user.studentsinfo)
+        rebuild_statistics(examination.id)
+        TestScores.objects.filter(id=submitted_score.id).update(test_score=0)
+
+        api_client.force_authenticate(user=teacher_user)
+        api_client.get(f'/api/v1/scores/exam/{examination.id}/statistics/')
+        with django_assert_max_num_queries(3):
+            response = api_client.get(f'/api/v1/scores/exam/{examination.id}/statistics/')
+
+        assert response.data['submitted_count'] == 1
+        assert response.data['average_score'] == 15.0
+
     def test_exam_statistics_no_submissions(self, api_client, teacher_user, examination, student_user):
         """제출 없는 경우 통계"""
         ExamStudentsInfo.objects.create(exam=examination, student=student_user.studentsinfo)
@@ -291,6 +488,105 @@ class TestExamStatistics:
         assert response.status_code == 403
 
 
+@pytest.mark.django_db
+class TestScoreDistribution:
+    """시험 점수 분포 테스트"""
+
+    @pytest.fixture
+    def graded_scores(self, examination, test_paper):
+        """총점 15점 시험지 제출 점수 0, 5, 9, 12, 15, 15"""
+        scores = []
+        for index, score in enumerate((0, 5, 9, 12, 15, 15)):
+            user = UserProfile.objects.create_user(username=f'dist_student{index}', password='pass', user_type='student')
+            student = StudentsInfo.objects.create(user=user, student_name=f'Student {index}', student_id=f'2025090{index}')
+            scores.append(
+                TestScores.objects.create(
+                    exam=examination, user=student, test_paper=test_paper, is_submitted=True, test_score=score
+                )
+            )
+        return scores
+
+    def test_distribution(self, api_client, teacher_user, examination, graded_scores):
+        """히스토그램, 사분위수, 표준편차, 백분위수"""
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/distribution/?buckets=3&percentiles=10,90')
+
+        assert response.status_code == 200
+        data = response.data
+        assert data['count'] == 6
+        assert data['mean'] == 9.33
+        assert data['median'] == 10.5
+        assert data['stddev'] == 5.44
+        assert (data['lowest'], data['highest']) == (0, 15)
+        assert data['quartiles'] == {'q1': 6.0, 'q2': 10.5, 'q3': 14.25}
+        assert data['percentiles'] == {'10': 2.5, '25': 6.0, '50': 10.5, '75': 14.25, '90': 15.0}
+        assert [(bucket['lower'], bucket['upper'], bucket['count']) for bucket in data['histogram']] == [
+            (0.0, 5.0, 1),
+            (5.0, 10.0, 2),
+            (10.0, 15.0, 3),
+        ]
+
+    @pytest.mark.skipif(connection.vendor != 'postgresql', reason='PostgreSQL 집계 함수 사용')
+    def test_numpy_fallback_matches_sql(self, examination, graded_scores):
+        """SQLite 등에서 쓰는 NumPy 계산이 SQL 계산과 같은 결과"""
+        percentiles = [10, 25, 50, 75, 90]
+
+        expected = _postgres_distribution(examination.id, percentiles, 4)
+        result = _numpy_distribution(examination.id, percentiles, 4)
+
+        assert result.pop('bucket_counts') == expected.pop('bucket_counts') == {1: 1, 2: 1, 3: 1, 4: 3}
+        assert result == pytest.approx(expected)
+
+    def test_distribution_cached_until_next_submission(
+        self, api_client, teacher_user, examination, test_paper, graded_scores
+    ):
+        """다음 제출 전까지 캐시, 제출 후 갱신"""
+        api_client.force_authenticate(user=teacher_user)
+        url = f'/api/v1/scores/exam/{examination.id}/distribution/'
+        assert api_client.get(url).data['count'] == 6
+
+        TestScores.objects.filter(id=graded_scores[0].id).update(test_score=3)
+        assert api_client.get(url).data['lowest'] == 0
+
+        record_submissions(examination.id, test_paper.id, test_paper.passing_score, [7])
+        assert api_client.get(url).data['lowest'] == 3
+
+    def test_distribution_no_submissions(self, api_client, teacher_user, examination):
+        """제출이 없으면 빈 분포"""
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/distribution/')
+
+        assert response.status_code == 200
+        assert response.data['count'] == 0
+        assert response.data['histogram'] == []
+
+    def test_distribution_without_numpy(self, api_client, teacher_user, examination, graded_scores, monkeypatch):
+        """numpy가 없으면 PostgreSQL에서는 SQL로 계산, 그 외 DB는 400"""
+        monkeypatch.setitem(sys.modules, 'numpy', None)
+        api_client.force_authenticate(user=teacher_user)
+
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/distribution/')
+
+        if connection.vendor == 'postgresql':
+            assert (response.status_code, response.data['count']) == (200, 6)
+        else:
+            assert response.status_code == 400
+
+    def test_distribution_invalid_percentiles(self, api_client, teacher_user, examination):
+        """백분위수 범위 검증"""
+        api_client.force_authenticate(user=teacher_user)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/distribution/?percentiles=10,101')
+
+        assert response.status_code == 400
+
+    def test_distribution_not_creator(self, api_client, another_teacher, examination):
+        """시험 작성자가 아닌 교사는 조회 불가"""
+        api_client.force_authenticate(user=another_teacher)
+        response = api_client.get(f'/api/v1/scores/exam/{examination.id}/distribution/')
+
+        assert response.status_code == 403
+
+
 @pytest.mark.django_db
 class TestStudentScoreDetail:
     """개별 학생 성적 상세 조회 테스트"""
@@ -343,6 +639,109 @@ class TestManualGrade:
         assert submitted_score.detail_records[question_id_str]['score'] == 7
         assert submitted_score.detail_records[question_id_str]['manual_graded'] is True
 
+    def test_manual_grade_updates_statistics(
+        self, api_client, teacher_user, examination, submitted_score, multiple_choice_question
+    ):
+        """수동 채점 점수 차이가 시험 통계에 반영"""
+        rebuild_statistics(examination.id)
+        api_client.force_authenticate(user=teacher_user)
+
+        api_client.post(
+            f'/api/v1/scores/{submitted_score.id}/grade/',
+            {'question_id': multiple_choice_question.id, 'score': 0},
+            format='json',
+        )
+
+        stats = ExamStatistics.objects.get(exam=examination)
+        assert (stats.score_sum, stats.pass_count, stats.highest_score, stats.lowest_score) == (5, 0, 5, 5)
+
+    def test_manual_grade_keeps_other_entries(
+        self, api_client, teacher_user, submitted_score, multiple_choice_question, true_false_question
+    ):
+        """문제별 채점은 해당 문제 항목만 바꾸고 다른 문제 결과와 답안은 유지"""
+        api_client.force_authenticate(user=teacher_user)
+        url = f'/api/v1/scores/{submitted_score.id}/grade/'
+
+        api_client.post(url, {'question_id': multiple_choice_question.id, 'score': 7, 'comment': '부분 점수'}, format='json')
+        response = api_client.post(url, {'question_id': true_false_question.id, 'score': 2}, format='json')
+
+        assert response.data['new_total_score'] == 9  # 15 - 3 - 3
+        submitted_score.refresh_from_db()
+        assert submitted_score.test_score == 9
+        first = submitted_score.detail_records[str(multiple_choice_question.id)]
+        second = submitted_score.detail_records[str(true_false_question.id)]
+        assert (first['score'], first['comment'], first['answer']) == (7, '부분 점수', '2')
+        assert (second['score'], second['manual_graded'], second['answer']) == (2, True, '1')
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.skipif(connection.vendor != 'postgresql', reason='행 잠금 대기 필요')
+    def test_manual_grade_concurrent_teachers(self, submitted_score, multiple_choice_question, true_false_question):
+        """두 교사가 같은 응시 기록을 동시에 채점해도 서로의 결과를 덮어쓰지 않음"""
+        # 다른 교사는 첫 번째 채점이 반영되기 전에 읽은 응시 기록으로 채점
+        stale = TestScores.objects.select_related('test_paper').get(id=submitted_score.id)
+        waiting = threading.Event()
+
+        def grade_other_question():
+            try:
+                waiting.set()
+                grade_question(stale, true_false_question.id, 2)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=grade_other_question)
+        with transaction.atomic():
+            TestScores.objects.select_for_update().get(id=submitted_score.id)
+            thread.start()
+            waiting.wait()
+            time.sleep(0.2)  # 다른 교사의 채점이 행 잠금을 기다리는 동안 채점
+            grade_question(submitted_score, multiple_choice_question.id, 7)
+        thread.join()
+
+        submitted_score.refresh_from_db()
+        assert submitted_score.test_score == 9  # 15 - 3 - 3
+        assert submitted_score.detail_records[str(multiple_choice_question.id)]['score'] == 7
+        assert submitted_score.detail_records[str(true_false_question.id)]['score'] == 2
+
+    @pytest.mark.skipif(connection.vendor != 'postgresql', reason='PostgreSQL jsonb_set 경로')
+    def test_manual_grade_updates_entry_in_database(self, submitted_score, multiple_choice_question):
+        """detail_records 전체를 읽고 쓰지 않고 jsonb_set으로 문제 항목만 갱신"""
+        with CaptureQueriesContext(connection) as queries:
+            grade_question(submitted_score, multiple_choice_question.id, 7)
+
+        statements = [query['sql'] for query in queries.captured_queries]
+        locked = next(sql for sql in statements if sql.endswith('FOR UPDATE'))
+        update = next(sql for sql in statements if sql.startswith('UPDATE "testpaper_testscores"'))
+        assert locked.count('"detail_records"') == 1 and '#>>' in locked
+        assert 'jsonb_set' in update
+
+    def test_manual_grade_unanswered_question(
+        self, api_client, teacher_user, submitted_score, multiple_choice_question
+    ):
+        """문제 기록이 없는 응시 기록도 채점 가능"""
+        TestScores.objects.filter(id=submitted_score.id).update(detail_records={}, test_score=0)
+        api_client.force_authenticate(user=teacher_user)
+
+        response = api_client.post(
+            f'/api/v1/scores/{submitted_score.id}/grade/',
+            {'question_id': multiple_choice_question.id, 'score': 4},
+            format='json',
+        )
+
+        assert response.data['new_total_score'] == 4
+        submitted_score.refresh_from_db()
+        assert submitted_score.detail_records == {str(multiple_choice_question.id): {'score': 4, 'manual_graded': True}}
+
+    def test_grade_in_memory_fallback(self, submitted_score, multiple_choice_question):
+        """PostgreSQL 외 DB용 경로도 같은 결과"""
+        rows = TestScores.objects.filter(id=submitted_score.id)
+
+        assert _grade_in_memory(rows, multiple_choice_question.id, 7, '부분 점수') == (15, -3)
+
+        submitted_score.refresh_from_db()
+        assert submitted_score.test_score == 12
+        record = submitted_score.detail_records[str(multiple_choice_question.id)]
+        assert (record['score'], record['manual_graded'], record['comment']) == (7, True, '부분 점수')
+
     def test_manual_grade_exceeds_max_score(
         self, api_client, teacher_user, submitted_score, multiple_choice_question
     ):
@@ -383,6 +782,107 @@ class TestManualGrade:
         assert response.status_code == 400
 
 
+@pytest.mark.django_db
+class TestBulkManualGrade:
+    """일괄 수동 채점 테스트"""
+
+    @pytest.fixture
+    def second_score(self, examination, student_user2, test_paper, multiple_choice_question, true_false_question):
+        """객관식 오답, OX 정답 (5점)"""
+        return TestScores.objects.create(
+            exam=examination,
+            user=student_user2.studentsinfo,
+            test_paper=test_paper,
+            is_submitted=True,
+            test_score=5,
+            detail_records={
+                str(multiple_choice_question.id): {'answer': '1', 'is_correct': False, 'score': 0, 'max_score': 10},
+                str(true_false_question.id): {'answer': '1', 'is_correct': True, 'score': 5, 'max_score': 5},
+            },
+        )
+
+    def test_bulk_grade(
+        self,
+        api_client,
+        teacher_user,
+        examination,
+        submitted_score,
+        second_score,
+        multiple_choice_question,
+        true_false_question,
+        django_assert_max_num_queries,
+    ):
+        """여러 응시 기록/문제를 한 번에 채점하고 통계 반영"""
+        rebuild_statistics(examination.id)
+        api_client.force_authenticate(user=teacher_user)
+        grades = [
+            {'score_id': submitted_score.id, 'question_id': multiple_choice_question.id, 'score': 7, 'comment': '부분 점수'},
+            {'score_id': second_score.id, 'question_id': multiple_choice_question.id, 'score': 4},
+            {'score_id': second_score.id, 'question_id': true_false_question.id, 'score': 2},
+        ]
+
+        with django_assert_max_num_queries(10):
+            response = api_client.post(
+                f'/api/v1/scores/exam/{examination.id}/grade/', {'grades': grades}, format='json'
+            )
+
+        assert response.status_code == 200
+        assert response.data['graded'] == 2
+        submitted_score.refresh_from_db()
+        second_score.refresh_from_db()
+        assert (submitted_score.test_score, second_score.test_score) == (12, 6)
+        assert submitted_score.detail_records[str(multiple_choice_question.id)] == {
+            'answer': '2',
+            'is_correct': True,
+            'score': 7,
+            'max_score': 10,
+            'manual_graded': True,
+            'comment': '부분 점수',
+        }
+        stats = ExamStatistics.objects.get(exam=examination)
+        assert (stats.score_sum, stats.pass_count, stats.highest_score, stats.lowest_score) == (18, 1, 12, 6)
+
+    def test_bulk_grade_all_or_nothing(
+        self, api_client, teacher_user, examination, submitted_score, second_score, multiple_choice_question
+    ):
+        """잘못된 항목이 있으면 아무것도 반영하지 않음"""
+        api_client.force_authenticate(user=teacher_user)
+        grades = [
+            {'score_id': submitted_score.id, 'question_id': multiple_choice_question.id, 'score': 7},
+            {'score_id': second_score.id, 'question_id': multiple_choice_question.id, 'score': 11},
+            {'score_id': second_score.id, 'question_id': 99999, 'score': 1},
+            {'score_id': 99999, 'question_id': multiple_choice_question.id, 'score': 1},
+        ]
+
+        response = api_client.post(f'/api/v1/scores/exam/{examination.id}/grade/', {'grades': grades}, format='json')
+
+        assert response.status_code == 400
+        assert [error['index'] for error in response.data['errors']] == [1, 2, 3]
+        assert '배점은 최대 10점' in response.data['errors'][0]['detail']
+        submitted_score.refresh_from_db()
+        assert submitted_score.test_score == 15
+
+    def test_bulk_grade_duplicate_entries(self, api_client, teacher_user, examination, submitted_score):
+        """같은 문제 중복 채점 항목"""
+        api_client.force_authenticate(user=teacher_user)
+        grade = {'score_id': submitted_score.id, 'question_id': 1, 'score': 1}
+
+        response = api_client.post(
+            f'/api/v1/scores/exam/{examination.id}/grade/', {'grades': [grade, grade]}, format='json'
+        )
+
+        assert response.status_code == 400
+
+    def test_bulk_grade_not_creator(self, api_client, another_teacher, examination, submitted_score):
+        """시험 작성자가 아닌 교사는 채점 불가"""
+        api_client.force_authenticate(user=another_teacher)
+        grade = {'score_id': submitted_score.id, 'question_id': 1, 'score': 1}
+
+        response = api_client.post(f'/api/v1/scores/exam/{examination.id}/grade/', {'grades': [grade]}, format='json')
+
+        assert response.status_code == 403
+
+
 @pytest.mark.django_db
 class TestExceptionCases:
     """예외 상황 테스트"""
@@ -10,6 +10,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.api.pagination import KeysetPagination
 from core.api.permissions import IsTeacher, IsExamCreator
 from testpaper.api.filters import TestPaperFilter
 from testpaper.api.serializers import (
@@ -48,6 +49,7 @@ class TestPaperViewSet(viewsets.ModelViewSet):
     - 모든 인증된 사용자가 조회 가능 (추후 시험 연결로 제한)
     """
 
+    pagination_class = KeysetPagination
     filterset_class = TestPaperFilter
     search_fields = ['name']
     ordering_fields = ['create_time', 'total_score', 'question_count', 'edit_time']
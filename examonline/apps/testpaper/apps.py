@@ -5,3 +5,7 @@ class TestpaperConfig(AppConfig):
     name = 'testpaper'
     # admin에서 app 이름 바꾸기
     verbose_name = '시험지 정보（TP_Info）'
+
+    def ready(self):
+        # 정답표 캐시 무효화 signal 등록
+        from testpaper import signals  # noqa: F401
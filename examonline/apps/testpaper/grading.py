@@ -0,0 +1,179 @@
+"""
+Auto-grading engine.
+시험지 정답표(answer key)를 한 번에 조회한 뒤 답안 목록 전체를 메모리에서 채점.
+
+문제 유형(tq_type)별 채점 함수는 GRADERS에 등록 (register_grader).
+- 객관식/OX: 선택한 옵션 ID 집합이 정답 옵션 집합과 같아야 정답 (복수 정답은 쉼표로 구분)
+- 빈칸 채우기: 정답 옵션 텍스트(여러 개 가능) 중 하나와 정규화 후 일치하면 정답
+등록되지 않은 유형은 자동 채점하지 않음 (수동 채점 대상).
+
+submit, 재채점, 성적 상세 조회가 공통으로 사용.
+"""
+import re
+import unicodedata
+from collections import namedtuple
+
+from testpaper.models import TestPaperTestQ
+
+# 문제별 정답 정보
+# - score: 이 시험지에서의 배점
+# - correct_option_ids: 정답 옵션 ID 집합
+# - correct_answers: 정답 옵션 텍스트 (결과 화면용)
+# - accepted_answers: 정규화된 빈칸 정답 집합 (정답표 생성 시 한 번만 계산되어 함께 캐시)
+AnswerKeyEntry = namedtuple(
+    'AnswerKeyEntry',
+    ['question_id', 'score', 'order', 'tq_type', 'correct_option_ids', 'correct_answers', 'accepted_answers'],
+)
+
+# 채점 결과
+GradeResult = namedtuple('GradeResult', ['total_score', 'detail_records'])
+
+# 옵션 비교로 자동 채점하는 문제 유형 (객관식, OX)
+OPTION_GRADED_TYPES = ('xz', 'pd')
+
+# 정답 텍스트 비교로 자동 채점하는 문제 유형 (빈칸 채우기)
+FILL_IN_TYPES = ('tk',)
+
+# 문제 유형별 채점 함수 {tq_type: grader(entry, user_answer) -> 정답 여부}
+GRADERS = {}
+
+_WHITESPACE = re.compile(r'\s+')
+_TRIM_CHARS = ' .,;:!?\'"`'
+
+
+def register_grader(*tq_types):
+    """문제 유형별 채점 함수 등록 decorator"""
+
+    def decorator(grader):
+        for tq_type in tq_types:
+            GRADERS[tq_type] = grader
+        return grader
+
+    return decorator
+
+
+def normalize_fill_in(text):
+    """
+    빈칸 답안 정규화.
+    유니코드 NFKC(전각/반각 통일), 대소문자 무시, 연속 공백은 한 칸, 앞뒤 공백/문장부호 제거.
+    """
+    text = unicodedata.normalize('NFKC', str(text)).casefold()
+    return _WHITESPACE.sub(' ', text).strip(_TRIM_CHARS)
+
+
+def selected_option_ids(user_answer):
+    """선택한 옵션 ID 집합 ("3,5" 또는 [3, 5])"""
+    items = user_answer if isinstance(user_answer, (list, tuple)) else str(user_answer).split(',')
+    return {str(item).strip() for item in items if str(item).strip()}
+
+
+@register_grader(*OPTION_GRADED_TYPES)
+def grade_option_answer(entry, user_answer):
+    """선택한 옵션 집합과 정답 옵션 집합 일치 여부 (정답 옵션이 없으면 오답)"""
+    if not entry.correct_option_ids:
+        return False
+    return selected_option_ids(user_answer) == {str(option_id) for option_id in entry.correct_option_ids}
+
+
+@register_grader(*FILL_IN_TYPES)
+def grade_fill_in_answer(entry, user_answer):
+    """정규화한 답안이 허용 정답 중 하나와 일치하는지 여부"""
+    if isinstance(user_answer, (list, tuple)):
+        return False
+    return normalize_fill_in(user_answer) in entry.accepted_answers
+
+
+def build_answer_key(paper_id):
+    """
+    시험지 정답표 생성.
+
+    TestPaperTestQ - TestQuestionInfo - OptionInfo를 한 번의 JOIN 쿼리로 조회.
+    반환값: {question_id: AnswerKeyEntry} (문제 순서 유지)
+    """
+    rows = (
+        TestPaperTestQ.objects.filter(test_paper_id=paper_id)
+        .order_by('order', 'test_question_id', 'test_question__optioninfo__id')
+        .values_list(
+            'test_question_id',
+            'score',
+            'order',
+            'test_question__tq_type',
+            'test_question__optioninfo__id',
+            'test_question__optioninfo__option',
+            'test_question__optioninfo__is_right',
+        )
+    )
+
+    entries = {}
+    for question_id, score, order, tq_type, option_id, option_text, is_right in rows:
+        entry = entries.setdefault(
+            question_id,
+            {'score': score, 'order': order, 'tq_type': tq_type, 'option_ids': set(), 'answers': []},
+        )
+        if option_id is not None and is_right:
+            entry['option_ids'].add(option_id)
+            entry['answers'].append(option_text)
+
+    return {
+        question_id: AnswerKeyEntry(
+            question_id=question_id,
+            score=entry['score'],
+            order=entry['order'],
+            tq_type=entry['tq_type'],
+            correct_option_ids=frozenset(entry['option_ids']),
+            correct_answers=tuple(entry['answers']),
+            accepted_answers=(
+                frozenset(normalize_fill_in(answer) for answer in entry['answers'])
+                if entry['tq_type'] in FILL_IN_TYPES
+                else frozenset()
+            ),
+        )
+        for question_id, entry in entries.items()
+    }
+
+
+def is_answer_correct(entry, user_answer):
+    """
+    단일 문제 정답 여부 판정.
+    문제 유형에 등록된 채점 함수가 없으면 자동 채점 대상이 아니므로 False.
+    """
+    grader = GRADERS.get(entry.tq_type)
+    return grader is not None and grader(entry, user_answer)
+
+
+def grade_answers(answer_key, answers):
+    """
+    답안 목록 채점.
+
+    answers: [{'question_id': int, 'answer': str}, ...]
+    시험지에 없는 문제의 답안은 무시.
+    """
+    total_score = 0
+    detail_records = {}
+
+    for answer_item in answers:
+        question_id = answer_item['question_id']
+        entry = answer_key.get(question_id)
+        if entry is None:
+            continue
+
+        user_answer = answer_item.get('answer', '')
+        is_correct = is_answer_correct(entry, user_answer)
+        earned_score = entry.score if is_correct else 0
+        total_score += earned_score
+
+        detail_records[str(question_id)] = {
+            'answer': user_answer,
+            'is_correct': is_correct,
+            'score': earned_score,
+            'max_score': entry.score,
+        }
+
+    return GradeResult(total_score=total_score, detail_records=detail_records)
+
+
+def format_correct_answer(entry):
+    """결과 화면에 표시할 정답 텍스트 (자동 채점 문제만)"""
+    if entry is None or entry.tq_type not in GRADERS or not entry.correct_answers:
+        return None
+    return ', '.join(entry.correct_answers)
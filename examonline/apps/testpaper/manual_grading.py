@@ -0,0 +1,183 @@
+"""
+Manual grading.
+
+교사 수동 채점 결과를 detail_records와 총점에 반영.
+- grade_question: 응시 기록 1건의 문제 1개 채점 (manual_grade API)
+  PostgreSQL은 jsonb_set으로 해당 문제 항목만 DB에서 갱신하고 총점은 F() 차이로 갱신
+  (동시에 다른 문제를 채점해도 서로의 결과를 덮어쓰지 않고 detail_records 전체를 다시 쓰지 않음),
+  그 외 DB는 잠근 행을 읽어 메모리에서 반영한 뒤 두 필드만 저장
+- apply_manual_grade: 문제 1개의 채점 결과를 detail_records(dict)에 반영하고 총점 차이 반환
+- bulk_manual_grade: 한 시험의 여러 응시 기록/문제 채점을 한 번에 반영
+  응시 기록은 행 잠금으로 한 번에 읽고, 배점은 시험지 문제 목록 쿼리 1회로 읽어 검증한 뒤
+  메모리에서 반영하여 bulk_update (같은 트랜잭션에서 시험 통계 반영)
+"""
+import json
+
+from django.db import connection, transaction
+from django.db.models import F, IntegerField, JSONField
+from django.db.models.expressions import RawSQL
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast
+
+from examination.statistics import record_score_changes
+from testpaper.models import TestPaperTestQ, TestScores
+from testpaper.results import invalidate_results
+
+# 일괄 채점 한 번에 반영할 수 있는 최대 항목 수
+MAX_BULK_GRADES = 1000
+
+# 문제 항목(detail_records -> 문제 ID)에 채점 결과 병합, 다른 문제 항목은 그대로
+_DETAIL_RECORDS = TestScores._meta.get_field('detail_records').column
+_MERGE_RECORD_SQL = f"""
+jsonb_set(
+    CASE WHEN jsonb_typeof({_DETAIL_RECORDS}) = 'object' THEN {_DETAIL_RECORDS} ELSE '{{}}'::jsonb END,
+    %s::text[],
+    CASE WHEN jsonb_typeof({_DETAIL_RECORDS} -> %s) = 'object' THEN {_DETAIL_RECORDS} -> %s ELSE '{{}}'::jsonb END
+        || %s::jsonb
+)
+"""
+
+
+class ManualGradeError(Exception):
+    """일괄 채점 항목 검증 실패 (errors: [{'index', 'detail'}, ...])"""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def apply_manual_grade(detail_records, question_id, score, comment=''):
+    """
+    문제 1개 수동 채점 결과 반영.
+    반환값: 총점 차이 (새 점수 - 기존 점수)
+    """
+    record = detail_records.setdefault(str(question_id), {})
+    old_score = record.get('score', 0)
+    record['score'] = score
+    record['manual_graded'] = True
+    if comment:
+        record['comment'] = comment
+    return score - old_score
+
+
+def _grade_in_database(rows, question_id, score, comment):
+    """PostgreSQL: 해당 문제 항목만 jsonb_set으로 갱신, 반환값: (이전 총점, 총점 차이)"""
+    key = str(question_id)
+    # 총점과 해당 문제 점수만 읽고 행 잠금 (detail_records 전체는 읽지 않음)
+    old_total, old_score = (
+        rows.select_for_update()
+        .annotate(old_score=Cast(KT(f'detail_records__{key}__score'), IntegerField()))
+        .values_list('test_score', 'old_score')
+        .get()
+    )
+    delta = score - (old_score or 0)
+    patch = {'score': score, 'manual_graded': True}
+    if comment:
+        patch['comment'] = comment
+    rows.update(
+        detail_records=RawSQL(_MERGE_RECORD_SQL, ([key], key, key, json.dumps(patch)), output_field=JSONField()),
+        test_score=F('test_score') + delta,
+    )
+    return old_total, delta
+
+
+def _grade_in_memory(rows, question_id, score, comment):
+    """그 외 DB: 잠근 행을 읽어 반영 후 두 필드만 저장, 반환값: (이전 총점, 총점 차이)"""
+    locked = rows.select_for_update().only('test_score', 'detail_records').get()
+    old_total = locked.test_score
+    locked.detail_records = locked.detail_records or {}
+    delta = apply_manual_grade(locked.detail_records, question_id, score, comment)
+    locked.test_score = F('test_score') + delta
+    locked.save(update_fields=['test_score', 'detail_records'])
+    return old_total, delta
+
+
+def grade_question(test_score, question_id, score, comment=''):
+    """
+    응시 기록 1건의 문제 1개 수동 채점 (시험 통계, 결과 캐시 포함).
+    test_score의 detail_records/test_score 값은 사용하지 않고 DB의 현재 값 기준으로 반영.
+    반환값: (이전 총점, 새 총점)
+    """
+    grade = _grade_in_database if connection.vendor == 'postgresql' else _grade_in_memory
+    rows = TestScores.objects.filter(id=test_score.id)
+
+    with transaction.atomic():
+        old_total, delta = grade(rows, question_id, score, comment)
+        new_total = old_total + delta
+        if test_score.is_submitted and test_score.test_paper_id:
+            record_score_changes(
+                test_score.exam_id, test_score.test_paper_id, test_score.test_paper.passing_score,
+                [(old_total, new_total)],
+            )
+        invalidate_results(test_score.exam_id)
+
+    return old_total, new_total
+
+
+def _validate(grades, attempts, max_scores):
+    errors = []
+    for index, grade in enumerate(grades):
+        attempt = attempts.get(grade['score_id'])
+        if attempt is None:
+            errors.append({'index': index, 'detail': '이 시험의 응시 기록이 아닙니다.'})
+            continue
+        max_score = max_scores.get((attempt.test_paper_id, grade['question_id']))
+        if max_score is None:
+            errors.append({'index': index, 'detail': '시험지에 없는 문제입니다.'})
+        elif grade['score'] > max_score:
+            errors.append({'index': index, 'detail': f'배점은 최대 {max_score}점까지 가능합니다.'})
+    return errors
+
+
+def bulk_manual_grade(exam, grades, batch_size=500):
+    """
+    일괄 수동 채점.
+
+    grades: [{'score_id': int, 'question_id': int, 'score': int, 'comment': str}, ...]
+    항목 중 하나라도 잘못되면 ManualGradeError (아무것도 반영하지 않음).
+    반환값: 반영한 응시 기록 수
+    """
+    with transaction.atomic():
+        attempts = {
+            attempt.id: attempt
+            for attempt in TestScores.objects.select_for_update()
+            .filter(exam=exam, id__in={grade['score_id'] for grade in grades})
+            .only('id', 'exam_id', 'test_paper_id', 'test_score', 'detail_records', 'is_submitted')
+            .order_by('id')
+        }
+
+        # 시험지별 배점/합격점 (쿼리 1회)
+        max_scores = {}
+        passing_scores = {}
+        rows = TestPaperTestQ.objects.filter(
+            test_paper_id__in={attempt.test_paper_id for attempt in attempts.values()}
+        ).values_list('test_paper_id', 'test_question_id', 'score', 'test_paper__passing_score')
+        for paper_id, question_id, max_score, passing_score in rows:
+            max_scores[(paper_id, question_id)] = max_score
+            passing_scores[paper_id] = passing_score
+
+        errors = _validate(grades, attempts, max_scores)
+        if errors:
+            raise ManualGradeError(errors)
+
+        old_totals = {attempt.id: attempt.test_score for attempt in attempts.values()}
+        graded = {}
+        for grade in grades:
+            attempt = graded.setdefault(grade['score_id'], attempts[grade['score_id']])
+            if not attempt.detail_records:
+                attempt.detail_records = {}
+            attempt.test_score += apply_manual_grade(
+                attempt.detail_records, grade['question_id'], grade['score'], grade.get('comment', '')
+            )
+
+        TestScores.objects.bulk_update(list(graded.values()), ['test_score', 'detail_records'], batch_size=batch_size)
+
+        score_changes = {}
+        for attempt in graded.values():
+            if attempt.is_submitted:
+                score_changes.setdefault(attempt.test_paper_id, []).append((old_totals[attempt.id], attempt.test_score))
+        for paper_id, changes in score_changes.items():
+            record_score_changes(exam.id, paper_id, passing_scores[paper_id], changes)
+        invalidate_results(exam.id)
+
+    return len(graded)
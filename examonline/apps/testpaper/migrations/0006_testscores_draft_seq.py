@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testpaper', '0005_testscores_exam_testscores_is_submitted_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testscores',
+            name='draft_seq',
+            field=models.PositiveIntegerField(default=0, verbose_name='임시 저장 순번'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:51
+
+from django.db import migrations
+from django.db.models import Count, F
+
+
+def remove_duplicate_test_scores(apps, schema_editor):
+    """
+    (시험, 학생) 중복 응시 기록 정리.
+    제출한 기록 > 시작한 기록 > 먼저 생성된 기록 순으로 하나만 유지.
+    """
+    TestScores = apps.get_model('testpaper', 'TestScores')
+    duplicates = (
+        TestScores.objects.filter(exam__isnull=False)
+        .values('exam_id', 'user_id')
+        .annotate(row_count=Count('id'))
+        .filter(row_count__gt=1)
+    )
+    for row in duplicates:
+        rows = TestScores.objects.filter(exam_id=row['exam_id'], user_id=row['user_id'])
+        keep = rows.order_by('-is_submitted', F('start_time').asc(nulls_last=True), 'id').first()
+        rows.exclude(id=keep.id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        # 삭제 시 채점 작업(GradingJob)도 함께 삭제되도록
+        ('examination', '0005_gradingjob'),
+        ('testpaper', '0006_testscores_draft_seq'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_test_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testpaper', '0007_remove_duplicate_test_scores'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='testscores',
+            name='testpaper_t_exam_id_411bf2_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='testscores',
+            constraint=models.UniqueConstraint(fields=('exam', 'user'), name='unique_test_score_exam_user'),
+        ),
+    ]
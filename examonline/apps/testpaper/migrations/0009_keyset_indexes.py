@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('examination', '0011_itemanalysis'),
+        ('testpaper', '0008_testscores_unique_exam_user'),
+        ('user', '0003_alter_emailverifyrecord_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testpaperinfo',
+            index=models.Index(fields=['create_time', 'id'], name='testpaper_t_create__23481c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testscores',
+            index=models.Index(fields=['exam', 'is_submitted', 'test_score', 'id'], name='testpaper_t_exam_id_e237ef_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testscores',
+            index=models.Index(fields=['user', 'submit_time', 'id'], name='testpaper_t_user_id_abd422_idx'),
+        ),
+    ]
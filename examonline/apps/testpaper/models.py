@@ -22,6 +22,10 @@ class TestPaperInfo(models.Model):
     class Meta:
         verbose_name = '시험지 정보'
         verbose_name_plural = verbose_name
+        indexes = [
+            # 목록 keyset 페이지네이션 (-create_time, -id)
+            models.Index(fields=['create_time', 'id']),
+        ]
 
     def __str__(self):
         return self.name
@@ -58,13 +62,21 @@ class TestScores(models.Model):
     submit_time = models.DateTimeField(null=True, blank=True, verbose_name='제출 시간')
     is_submitted = models.BooleanField(default=False, verbose_name='제출 여부')
     time_used = models.IntegerField(default=0, verbose_name='소요 시간(분)')
+    draft_seq = models.PositiveIntegerField(default=0, verbose_name='임시 저장 순번')
 
     class Meta:
         verbose_name = '학생 성적 정보'
         verbose_name_plural = verbose_name
         indexes = [
             models.Index(fields=['user', 'test_paper']),
-            models.Index(fields=['exam', 'user']),
+            # 시험별 성적 목록 keyset 페이지네이션 (-is_submitted, -test_score, -id)
+            models.Index(fields=['exam', 'is_submitted', 'test_score', 'id']),
+            # 내 성적 목록 keyset 페이지네이션 (-submit_time, -id)
+            models.Index(fields=['user', 'submit_time', 'id']),
+        ]
+        constraints = [
+            # 시험당 학생별 응시 기록은 하나 (exam이 없는 기존 기록은 제외)
+            models.UniqueConstraint(fields=['exam', 'user'], name='unique_test_score_exam_user'),
         ]
 
     def __str__(self):
@@ -0,0 +1,68 @@
+"""
+Attempt result documents.
+
+응시 기록의 문제별 결과(학생 성적 상세, 교사용 학생 성적 상세)를 만들어 캐시.
+- 정답은 정답표 캐시(get_answer_key)에서, 문제 이름/유형/배점은 시험지 문제 목록 쿼리 1회로 조회
+- 제출된 기록의 결과는 (응시 기록, 시험지 버전, 시험 결과 버전) 키로 캐시
+  결과 공개 직후 같은 시험의 학생들이 몰려 조회해도 응시 기록당 한 번만 생성
+채점 결과가 바뀌는 경로(비동기 채점 완료, 재채점, 수동 채점)에서 invalidate_results로 시험 결과 버전 증가.
+미제출 기록은 임시 저장으로 계속 바뀌므로 캐시하지 않음.
+"""
+from django.conf import settings
+
+from core.cache import bump_version, get_or_build, get_version
+from testpaper.answer_keys import get_answer_key, get_paper_version
+from testpaper.grading import format_correct_answer
+from testpaper.models import TestPaperTestQ
+from testquestion.models import TestQuestionInfo
+
+RESULTS_VERSION_NAMESPACE = 'exam_results'
+
+_TQ_TYPE_DISPLAY = dict(TestQuestionInfo._meta.get_field('tq_type').choices)
+
+
+def invalidate_results(exam_id):
+    """시험 응시 기록 결과 캐시 무효화 (버전 증가)"""
+    if exam_id:
+        bump_version(RESULTS_VERSION_NAMESPACE, exam_id)
+
+
+def build_question_results(test_score):
+    """문제별 결과 목록 생성 (시험지 문제 순서)"""
+    if not test_score.detail_records:
+        return []
+
+    answer_key = get_answer_key(test_score.test_paper_id)
+    paper_questions = (
+        TestPaperTestQ.objects.filter(test_paper_id=test_score.test_paper_id)
+        .order_by('order')
+        .values_list('test_question_id', 'test_question__name', 'test_question__tq_type', 'score')
+    )
+
+    results = []
+    for question_id, name, tq_type, max_score in paper_questions:
+        record = test_score.detail_records.get(str(question_id), {})
+        results.append({
+            'question_id': question_id,
+            'question_name': name,
+            'question_type': tq_type,
+            'question_type_display': _TQ_TYPE_DISPLAY.get(tq_type, tq_type),
+            'user_answer': record.get('answer', ''),
+            'correct_answer': format_correct_answer(answer_key.get(question_id)),
+            'is_correct': record.get('is_correct'),
+            'score': record.get('score', 0),
+            'max_score': max_score,
+        })
+    return results
+
+
+def get_question_results(test_score):
+    """문제별 결과 조회 (제출된 기록은 캐시 우선)"""
+    if not test_score.is_submitted or not test_score.exam_id or not test_score.test_paper_id:
+        return build_question_results(test_score)
+
+    key = (
+        f'score_result:{test_score.id}:{get_paper_version(test_score.test_paper_id)}:'
+        f'{get_version(RESULTS_VERSION_NAMESPACE, test_score.exam_id)}'
+    )
+    return get_or_build(key, lambda: build_question_results(test_score), timeout=settings.SCORE_RESULT_CACHE_TIMEOUT)
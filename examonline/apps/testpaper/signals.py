@@ -0,0 +1,28 @@
+"""
+Test paper signals.
+시험지 내용(정답표, 문제 목록)에 영향을 주는 모델 변경 시 캐시 무효화.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from testpaper.answer_keys import invalidate_paper, invalidate_papers_for_question
+from testpaper.models import TestPaperTestQ
+from testquestion.models import OptionInfo, TestQuestionInfo
+
+
+@receiver([post_save, post_delete], sender=TestPaperTestQ)
+def paper_question_changed(sender, instance, **kwargs):
+    """시험지 문제 구성/배점 변경"""
+    invalidate_paper(instance.test_paper_id)
+
+
+@receiver([post_save, post_delete], sender=OptionInfo)
+def option_changed(sender, instance, **kwargs):
+    """선택지/정답 변경"""
+    invalidate_papers_for_question(instance.test_question_id)
+
+
+@receiver(post_save, sender=TestQuestionInfo)
+def question_changed(sender, instance, **kwargs):
+    """문제 유형 등 변경"""
+    invalidate_papers_for_question(instance.id)
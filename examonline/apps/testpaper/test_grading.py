@@ -0,0 +1,203 @@
+"""
+Grading Engine Tests.
+자동 채점 엔진 테스트.
+"""
+import pytest
+
+from testpaper.answer_keys import get_answer_key
+from testpaper.grading import GRADERS, build_answer_key, format_correct_answer, grade_answers, normalize_fill_in
+from testpaper.models import TestPaperInfo, TestPaperTestQ
+from testquestion.models import TestQuestionInfo, OptionInfo
+
+
+@pytest.fixture
+def paper_questions(make_question):
+    """객관식 2문제 + 빈칸 1문제"""
+    return [
+        (make_question('Question 1', tq_type='xz'), 10),
+        (make_question('Question 2', tq_type='pd'), 5),
+        (make_question('Question 3', tq_type='tk', options=()), 10),
+    ]
+
+
+@pytest.fixture
+def paper_with_questions(paper, paper_questions):
+    return paper, [question for question, _ in paper_questions]
+
+
+@pytest.mark.django_db
+class TestAnswerKey:
+    """정답표 생성 테스트"""
+
+    def test_build_answer_key_single_query(self, django_assert_num_queries, paper_with_questions):
+        """정답표는 문제 수와 무관하게 한 번의 쿼리로 생성"""
+        paper, questions = paper_with_questions
+
+        with django_assert_num_queries(1):
+            answer_key = build_answer_key(paper.id)
+
+        assert list(answer_key) == [q.id for q in questions]
+        right_option = OptionInfo.objects.get(test_question=questions[0], is_right=True)
+        assert answer_key[questions[0].id].correct_option_ids == frozenset({right_option.id})
+        assert answer_key[questions[0].id].score == 10
+        assert answer_key[questions[2].id].correct_option_ids == frozenset()
+
+    def test_format_correct_answer(self, paper_with_questions):
+        """옵션형 문제만 정답 텍스트 표시"""
+        paper, questions = paper_with_questions
+        answer_key = build_answer_key(paper.id)
+
+        assert format_correct_answer(answer_key[questions[0].id]) == 'right'
+        assert format_correct_answer(answer_key[questions[2].id]) is None
+        assert format_correct_answer(None) is None
+
+
+@pytest.mark.django_db
+class TestGradeAnswers:
+    """메모리 채점 테스트"""
+
+    def test_grade_answers(self, paper_with_questions):
+        """정답/오답/시험지 외 문제 채점"""
+        paper, questions = paper_with_questions
+        answer_key = build_answer_key(paper.id)
+        right_option = OptionInfo.objects.get(test_question=questions[0], is_right=True)
+        wrong_option = OptionInfo.objects.get(test_question=questions[1], is_right=False)
+
+        result = grade_answers(
+            answer_key,
+            [
+                {'question_id': questions[0].id, 'answer': str(right_option.id)},
+                {'question_id': questions[1].id, 'answer': str(wrong_option.id)},
+                {'question_id': questions[2].id, 'answer': 'text'},
+                {'question_id': 999999, 'answer': '1'},
+            ],
+        )
+
+        assert result.total_score == 10
+        assert set(result.detail_records) == {str(q.id) for q in questions}
+        assert result.detail_records[str(questions[0].id)] == {
+            'answer': str(right_option.id),
+            'is_correct': True,
+            'score': 10,
+            'max_score': 10,
+        }
+        assert result.detail_records[str(questions[1].id)]['is_correct'] is False
+        assert result.detail_records[str(questions[2].id)]['score'] == 0
+
+
+@pytest.mark.django_db
+class TestGraders:
+    """문제 유형별 채점 테스트"""
+
+    def _question(self, paper, tq_type, options, order=1, score=10):
+        question = TestQuestionInfo.objects.create(
+            name=f'Question {order}', subject=paper.subject, tq_type=tq_type, create_user=paper.create_user
+        )
+        for option, is_right in options:
+            OptionInfo.objects.create(test_question=question, option=option, is_right=is_right)
+        TestPaperTestQ.objects.create(test_paper=paper, test_question=question, score=score, order=order)
+        return question
+
+    @pytest.fixture
+    def paper(self, teacher_user, subject):
+        return TestPaperInfo.objects.create(name='Graders Paper', subject=subject, create_user=teacher_user)
+
+    def test_multi_answer_requires_exact_set(self, paper):
+        """복수 정답 객관식은 정답 옵션을 모두, 그리고 정답만 골라야 정답"""
+        question = self._question(paper, 'xz', [('A', True), ('B', True), ('C', False)])
+        a, b, c = OptionInfo.objects.filter(test_question=question).order_by('id').values_list('id', flat=True)
+        answer_key = build_answer_key(paper.id)
+
+        def score(answer):
+            return grade_answers(answer_key, [{'question_id': question.id, 'answer': answer}]).total_score
+
+        assert score(f'{a},{b}') == 10
+        assert score(f' {b} , {a} ') == 10
+        assert score([b, a]) == 10
+        assert score(str(a)) == 0
+        assert score(f'{a},{b},{c}') == 0
+
+    def test_fill_in_normalized_with_multiple_accepted(self, paper):
+        """빈칸 채우기는 정규화 후 허용 정답 중 하나와 일치하면 정답"""
+        question = self._question(paper, 'tk', [('Seoul', True), ('서울특별시', True), ('Busan', False)])
+        answer_key = build_answer_key(paper.id)
+
+        def is_correct(answer):
+            return grade_answers(answer_key, [{'question_id': question.id, 'answer': answer}]).detail_records[
+                str(question.id)
+            ]['is_correct']
+
+        assert answer_key[question.id].accepted_answers == frozenset({'seoul', '서울특별시'})
+        assert is_correct('  SEOUL. ')
+        assert is_correct('ｓｅｏｕｌ')
+        assert is_correct('서울특별시')
+        assert not is_correct('Busan')
+        assert not is_correct('')
+        assert format_correct_answer(answer_key[question.id]) == 'Seoul, 서울특별시'
+
+    def test_normalize_fill_in(self):
+        """공백/대소문자/전각 문자 정규화"""
+        assert normalize_fill_in('  New   York!  ') == 'new york'
+        assert normalize_fill_in('ＡＢＣ') == 'abc'
+
+    def test_unregistered_type_not_auto_graded(self, paper, monkeypatch):
+        """채점 함수가 없는 유형은 0점 (수동 채점 대상)"""
+        question = self._question(paper, 'tk', [('answer', True)])
+        monkeypatch.delitem(GRADERS, 'tk')
+        answer_key = build_answer_key(paper.id)
+
+        result = grade_answers(answer_key, [{'question_id': question.id, 'answer': 'answer'}])
+
+        assert result.total_score == 0
+        assert format_correct_answer(answer_key[question.id]) is None
+
+
+@pytest.mark.django_db
+class TestAnswerKeyCache:
+    """정답표 캐시 테스트"""
+
+    def test_cached_answer_key_skips_database(self, django_assert_num_queries, paper_with_questions):
+        """두 번째 조회부터는 DB 쿼리 없음"""
+        paper, questions = paper_with_questions
+        first = get_answer_key(paper.id)
+
+        with django_assert_num_queries(0):
+            second = get_answer_key(paper.id)
+
+        assert second == first
+
+    def test_option_change_invalidates_answer_key(self, paper_with_questions):
+        """정답 옵션 변경 시 캐시 무효화"""
+        paper, questions = paper_with_questions
+        get_answer_key(paper.id)
+
+        wrong_option = OptionInfo.objects.get(test_question=questions[0], is_right=False)
+        wrong_option.is_right = True
+        wrong_option.save()
+
+        answer_key = get_answer_key(paper.id)
+        assert wrong_option.id in answer_key[questions[0].id].correct_option_ids
+
+    def test_paper_question_change_invalidates_answer_key(self, paper_with_questions):
+        """배점 변경 및 문제 제거 시 캐시 무효화"""
+        paper, questions = paper_with_questions
+        get_answer_key(paper.id)
+
+        TestPaperTestQ.objects.get(test_paper=paper, test_question=questions[0]).delete()
+        paper_question = TestPaperTestQ.objects.get(test_paper=paper, test_question=questions[1])
+        paper_question.score = 7
+        paper_question.save()
+
+        answer_key = get_answer_key(paper.id)
+        assert questions[0].id not in answer_key
+        assert answer_key[questions[1].id].score == 7
+
+    def test_question_type_change_invalidates_answer_key(self, paper_with_questions):
+        """문제 유형 변경 시 캐시 무효화"""
+        paper, questions = paper_with_questions
+        get_answer_key(paper.id)
+
+        questions[1].tq_type = 'xz'
+        questions[1].save()
+
+        assert get_answer_key(paper.id)[questions[1].id].tq_type == 'xz'
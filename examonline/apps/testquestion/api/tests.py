@@ -2,8 +2,11 @@
 Question Management API tests.
 """
 
+from datetime import timedelta
+
 import pytest
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -99,6 +102,46 @@ class TestQuestionCRUD:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data['data']) >= 1
 
+    def test_list_questions_keyset_pages(self, api_client, teacher_user, subject):
+        """정렬 기준이 같은 문제가 많아도 커서로 빠짐없이 조회"""
+        for index in range(5):
+            TestQuestionInfo.objects.create(
+                name=f'Page Q{index}', subject=subject, score=index % 2, create_user=teacher_user
+            )
+        api_client.force_authenticate(user=teacher_user)
+
+        names = []
+        url = reverse('question-list') + '?ordering=score&page_size=2'
+        while url:
+            response = api_client.get(url)
+            names += [question['name'] for question in response.data['data']]
+            url = response.data['meta']['next']
+
+        assert names == ['Page Q0', 'Page Q2', 'Page Q4', 'Page Q1', 'Page Q3']
+
+    @pytest.mark.parametrize('ordering', ['create_time', '-create_time'])
+    def test_list_questions_keyset_sub_millisecond(self, api_client, teacher_user, subject, ordering):
+        """생성 시간이 1ms 안에서만 달라도 커서가 마이크로초까지 유지되어 빠짐없이 조회"""
+        base = timezone.now().replace(microsecond=0)
+        for index in range(6):
+            TestQuestionInfo.objects.create(
+                name=f'Time Q{index}', subject=subject, create_user=teacher_user,
+                create_time=base + timedelta(microseconds=500 + 100 * index),
+            )
+        api_client.force_authenticate(user=teacher_user)
+
+        names = []
+        url = reverse('question-list') + f'?ordering={ordering}&page_size=2'
+        for _ in range(4):
+            response = api_client.get(url)
+            names += [question['name'] for question in response.data['data']]
+            url = response.data['meta']['next']
+            if not url:
+                break
+
+        expected = [f'Time Q{index}' for index in range(6)]
+        assert names == (expected if ordering == 'create_time' else expected[::-1])
+
     def test_student_cannot_see_unshared_questions(self, api_client, student_user, question_with_options):
         """학생은 공유되지 않은 문제를 볼 수 없다"""
         api_client.force_authenticate(user=student_user)
@@ -9,6 +9,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.api.pagination import KeysetPagination
 from core.api.permissions import IsQuestionOwner, IsTeacher
 from testquestion.api.filters import QuestionFilter
 from testquestion.api.serializers import (
@@ -46,6 +47,7 @@ class QuestionViewSet(viewsets.ModelViewSet):
     - Soft Delete 적용 (is_del=True)
     """
 
+    pagination_class = KeysetPagination
     filterset_class = QuestionFilter
     search_fields = ['name']
     ordering_fields = ['create_time', 'score', 'tq_degree', 'edit_time']
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testquestion', '0005_rename_creat_user_testquestioninfo_create_user'),
+        ('user', '0003_alter_emailverifyrecord_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testquestioninfo',
+            index=models.Index(fields=['create_time', 'id'], name='testquestio_create__b36ff0_idx'),
+        ),
+    ]
@@ -28,6 +28,8 @@ class TestQuestionInfo(models.Model):
         indexes = [
             models.Index(fields=['subject', 'tq_type', 'tq_degree']),
             models.Index(fields=['is_del', 'is_share']),
+            # 목록 keyset 페이지네이션 (-create_time, -id)
+            models.Index(fields=['create_time', 'id']),
         ]
 
     def __str__(self):
@@ -100,6 +100,42 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache
+# 프로세스 로컬 LRU 계층 최대 항목 수
+LOCAL_CACHE_MAXSIZE = 256
+# 캐시 버전 키 유지 시간 (초, 데이터 캐시보다 길게). 만료되면 현재 시각 기반 새 버전으로 다시 시작
+CACHE_VERSION_TIMEOUT = 60 * 60 * 24 * 7
+# 정답표 캐시 유지 시간 (초)
+ANSWER_KEY_CACHE_TIMEOUT = 60 * 60 * 24
+# 학생용 시험 문제 payload 캐시 유지 시간 (초)
+EXAM_PAYLOAD_CACHE_TIMEOUT = 60 * 60 * 24
+# 시험별 등록 학생(응시 자격) 캐시 유지 시간 (초)
+EXAM_ENROLLMENT_CACHE_TIMEOUT = 60 * 60 * 24
+# 시험 점수 분포 캐시 유지 시간 (초, 점수가 바뀌면 버전 증가로 무효화)
+EXAM_DISTRIBUTION_CACHE_TIMEOUT = 60 * 60 * 24
+# 응시 기록 문제별 결과 캐시 유지 시간 (초, 채점 결과가 바뀌면 버전 증가로 무효화)
+SCORE_RESULT_CACHE_TIMEOUT = 60 * 60 * 24
+# Idempotency-Key 응답 보관 시간 (초)
+IDEMPOTENCY_KEY_TIMEOUT = 60 * 60 * 24
+# 같은 Idempotency-Key 요청의 처리 중 잠금 유지 시간 (초)
+IDEMPOTENCY_LOCK_TIMEOUT = 30
+
+# 시험 응시
+# 임시 저장 write-behind 모드 (Redis 버퍼 + flush_exam_drafts 명령으로 일괄 반영)
+EXAM_DRAFT_WRITE_BEHIND = os.getenv('EXAM_DRAFT_WRITE_BEHIND', 'False') == 'True'
+# 버퍼의 임시 답안 유지 시간 (초)
+EXAM_DRAFT_CACHE_TIMEOUT = 60 * 60 * 24
+# 종료 시간 이후 제출을 받는 유예 시간 (초, 네트워크 지연 허용). 이후 도착한 제출은 임시 답안으로 제출 처리
+EXAM_SUBMIT_GRACE_SECONDS = 30
+# 비동기 제출 모드 (답안 접수 후 grade_submissions 명령이 채점)
+EXAM_SUBMIT_ASYNC = os.getenv('EXAM_SUBMIT_ASYNC', 'False') == 'True'
+# 채점 작업 최대 시도 횟수
+GRADING_JOB_MAX_ATTEMPTS = 3
+# 처리 중 상태로 이 시간(초)이 지난 작업은 중단된 것으로 보고 재시도
+GRADING_JOB_STALE_SECONDS = 60 * 5
+# 처리 중 상태로 이 시간(초)이 지난 문항 분석 요청은 중단된 것으로 보고 재시도 (analyze_items 명령)
+ITEM_ANALYSIS_STALE_SECONDS = 60 * 10
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -0,0 +1,119 @@
+"""
+Shared pytest configuration.
+
+- local_cache: 모든 테스트에 프로세스 로컬 캐시 사용
+- 시험 fixture 체인: teacher_user → subject → question(s) → paper → exam
+  (모듈에서 paper_questions/questions를 재정의해 시험지 구성을 바꿈)
+"""
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from examination.deadlines import EXAM_STATE_FINISHED
+from examination.models import ExaminationInfo, ExamPaperInfo
+from testpaper.models import TestPaperInfo, TestPaperTestQ
+from testquestion.models import TestQuestionInfo, OptionInfo
+from user.models import UserProfile, SubjectInfo
+
+
+@pytest.fixture(autouse=True)
+def local_cache(settings):
+    """테스트마다 비어 있는 프로세스 로컬 캐시 사용 (개발용 Redis에 키를 남기지 않음)"""
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'examonline-tests',
+        }
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def teacher_user(db):
+    return UserProfile.objects.create_user(
+        username='teacher_exam', password='testpass123', user_type='teacher', nick_name='Exam Teacher'
+    )
+
+
+@pytest.fixture
+def subject(db):
+    return SubjectInfo.objects.create(subject_name='Exam Subject')
+
+
+@pytest.fixture
+def make_question(db, teacher_user, subject):
+    """문제 생성 (options: [(보기, 정답 여부)], 기본값은 오답/정답 보기 2개)"""
+
+    def make(name, tq_type='xz', options=(('wrong', False), ('right', True))):
+        question = TestQuestionInfo.objects.create(name=name, subject=subject, tq_type=tq_type, create_user=teacher_user)
+        for option, is_right in options:
+            OptionInfo.objects.create(test_question=question, option=option, is_right=is_right)
+        return question
+
+    return make
+
+
+@pytest.fixture
+def question(make_question):
+    """객관식 10점 문제"""
+    return make_question('Q1')
+
+
+@pytest.fixture
+def paper_questions(question):
+    """시험지 구성 [(문제, 배점)], 모듈에서 재정의"""
+    return [(question, 10)]
+
+
+@pytest.fixture
+def paper(db, teacher_user, subject, paper_questions):
+    """paper_questions로 구성한 시험지 (합격점: 총점의 60%)"""
+    total_score = sum(score for _, score in paper_questions)
+    paper = TestPaperInfo.objects.create(
+        name='Exam Paper',
+        subject=subject,
+        total_score=total_score,
+        passing_score=total_score * 6 // 10,
+        question_count=len(paper_questions),
+        create_user=teacher_user,
+    )
+    for order, (question, score) in enumerate(paper_questions, start=1):
+        TestPaperTestQ.objects.create(test_paper=paper, test_question=question, score=score, order=order)
+    return paper
+
+
+@pytest.fixture
+def make_exam(db, teacher_user, subject, paper):
+    """paper 시험지로 치르는 시험 생성"""
+
+    def make(start_time, end_time, exam_state='1'):
+        exam = ExaminationInfo.objects.create(
+            name='Exam',
+            subject=subject,
+            start_time=start_time,
+            end_time=end_time,
+            exam_state=exam_state,
+            create_user=teacher_user,
+        )
+        ExamPaperInfo.objects.create(exam=exam, paper=paper)
+        return exam
+
+    return make
+
+
+@pytest.fixture
+def exam(make_exam):
+    """진행 중인 시험 (1시간 전 시작, 1시간 후 종료)"""
+    now = timezone.now()
+    return make_exam(now - timedelta(hours=1), now + timedelta(hours=1))
+
+
+@pytest.fixture
+def finished_exam(make_exam):
+    """종료된 시험 (하루 전 1시간 동안 진행)"""
+    start_time = timezone.now() - timedelta(days=1)
+    return make_exam(start_time, start_time + timedelta(hours=1), EXAM_STATE_FINISHED)
@@ -3,13 +3,18 @@ Core API utilities.
 """
 
 from core.api.exceptions import custom_exception_handler
-from core.api.pagination import StandardResultsSetPagination
+from core.api.idempotency import idempotent
+from core.api.pagination import KeysetPagination, StandardResultsSetPagination
 from core.api.permissions import IsOwnerOrTeacher, IsStudent, IsTeacher
+from core.api.responses import raw_json_response
 
 __all__ = [
     'IsTeacher',
     'IsStudent',
     'IsOwnerOrTeacher',
     'StandardResultsSetPagination',
+    'KeysetPagination',
     'custom_exception_handler',
+    'raw_json_response',
+    'idempotent',
 ]
@@ -0,0 +1,76 @@
+"""
+Idempotency-Key support.
+재시도된 요청(같은 Idempotency-Key)에 처음 처리한 응답을 그대로 반환하여 중복 처리를 방지.
+
+응답은 CACHES['default']에 (scope, 사용자, 대상 ID, 키) 단위로 저장.
+"""
+import functools
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+def _cache_key(scope, request, pk, key):
+    return f'idempotency:{scope}:{request.user.pk}:{pk}:{key}'
+
+
+def idempotent(scope):
+    """
+    ViewSet action용 decorator.
+
+    - 헤더가 없으면 그대로 처리
+    - 저장된 응답이 있으면 재처리 없이 반환 (Idempotent-Replayed: true)
+    - 같은 키로 다른 본문을 보내면 422, 처리 중인 같은 키는 409
+    5xx 응답은 저장하지 않아 재시도 가능.
+    """
+
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(self, request, pk=None, *args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if not key:
+                return view_func(self, request, pk, *args, **kwargs)
+
+            if len(key) > 255:
+                return Response(
+                    {'detail': f'{IDEMPOTENCY_HEADER}는 255자 이하여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST
+                )
+
+            cache_key = _cache_key(scope, request, pk, key)
+            fingerprint = hashlib.sha256(request.body).hexdigest()
+
+            stored = cache.get(cache_key)
+            if stored is None:
+                lock_key = f'{cache_key}:lock'
+                if not cache.add(lock_key, 1, settings.IDEMPOTENCY_LOCK_TIMEOUT):
+                    return Response(
+                        {'detail': '같은 요청을 처리하고 있습니다. 잠시 후 다시 시도하세요.'},
+                        status=status.HTTP_409_CONFLICT,
+                    )
+                try:
+                    response = view_func(self, request, pk, *args, **kwargs)
+                    if response.status_code < 500:
+                        stored = {'fingerprint': fingerprint, 'status': response.status_code, 'data': response.data}
+                        cache.set(cache_key, stored, settings.IDEMPOTENCY_KEY_TIMEOUT)
+                    return response
+                finally:
+                    cache.delete(lock_key)
+
+            if stored['fingerprint'] != fingerprint:
+                return Response(
+                    {'detail': f'{IDEMPOTENCY_HEADER}가 다른 요청에 이미 사용되었습니다.'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+
+            response = Response(stored['data'], status=stored['status'])
+            response['Idempotent-Replayed'] = 'true'
+            return response
+
+        return wrapper
+
+    return decorator
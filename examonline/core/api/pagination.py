@@ -2,8 +2,19 @@
 Custom pagination classes.
 """
 
-from rest_framework.pagination import PageNumberPagination
+import datetime
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import reduce
+from operator import or_
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -30,3 +41,197 @@ class StandardResultsSetPagination(PageNumberPagination):
                 'previous': self.get_previous_link(),
             }
         })
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination.
+
+    Pages are selected with a WHERE condition on the ordering columns of the
+    last row instead of OFFSET, and no COUNT(*) is run, so every page costs the
+    same as the first one when an index matches the ordering. The primary key
+    is appended as a tiebreaker in the direction of the last ordering field.
+
+    Ordering fields must not be NULL. A total count is only returned when
+    requested with ?count=approx (PostgreSQL planner estimate).
+    """
+
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('-pk',)
+    invalid_cursor_message = '잘못된 커서입니다.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset, view)
+        cursor = self.decode_cursor(request)
+        self.approximate_count = (
+            self.get_approximate_count(queryset)
+            if request.query_params.get(self.count_query_param) == 'approx'
+            else None
+        )
+
+        reverse = cursor is not None and cursor['reverse']
+        ordering = [_reverse_field(field) for field in self.ordering] if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(_after(ordering, cursor['values']))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset, view):
+        """Queryset ordering (OrderingFilter or order_by), falling back to the view's ordering."""
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if not ordering:
+            ordering = list(getattr(view, 'ordering', None) or self.ordering)
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            ordering.append('-pk' if ordering[-1].startswith('-') else 'pk')
+        return ordering
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            values, reverse = cursor['v'], bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message) from None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return {'values': values, 'reverse': reverse}
+
+    def encode_cursor(self, instance, reverse):
+        values = [_field_value(instance, field.lstrip('-')) for field in self.ordering]
+        cursor = {'v': values, 'r': 1} if reverse else {'v': values}
+        encoded = urlsafe_b64encode(json.dumps(cursor, cls=_CursorEncoder).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, encoded)
+
+    def get_approximate_count(self, queryset):
+        """Planner row estimate on PostgreSQL (no scan), exact count elsewhere."""
+        if connection.vendor != 'postgresql':
+            return queryset.count()
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        if isinstance(plan, list):
+            plan = plan[0]
+        return int(plan['Plan']['Plan Rows'])
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_meta(self):
+        """Pagination metadata (also used by actions that wrap results in their own keys)."""
+        meta = {
+            'page_size': self.page_size,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+        if self.approximate_count is not None:
+            meta['approximate_count'] = self.approximate_count
+        return meta
+
+    def get_paginated_response(self, data):
+        return Response({'data': data, 'meta': self.get_meta()})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'data': schema,
+                'meta': {
+                    'type': 'object',
+                    'properties': {
+                        'page_size': {'type': 'integer'},
+                        'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                        'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                        'approximate_count': {'type': 'integer'},
+                    },
+                },
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': '다음/이전 페이지 커서 (meta.next, meta.previous)',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'페이지 크기 (최대 {self.max_page_size})',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'approx: 대략적인 전체 개수 포함',
+                'schema': {'type': 'string', 'enum': ['approx']},
+            },
+        ]
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """Keeps datetime microseconds (DjangoJSONEncoder truncates to milliseconds)."""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _reverse_field(field):
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+def _field_value(instance, field):
+    if field == 'pk':
+        return instance.pk
+    for name in field.split('__'):
+        instance = getattr(instance, name)
+    return instance
+
+
+def _after(ordering, values):
+    """Rows after the cursor: (a > x) OR (a = x AND b > y) OR ... per ordering direction."""
+    conditions = []
+    equal = {}
+    for field, value in zip(ordering, values, strict=True):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        conditions.append(Q(**equal, **{f'{name}__{lookup}': value}))
+        equal[name] = value
+    return reduce(or_, conditions)
@@ -0,0 +1,58 @@
+"""
+Pre-rendered JSON responses.
+캐시된 JSON bytes를 재직렬화 없이 응답 본문에 결합하고 ETag를 처리.
+"""
+import hashlib
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.renderers import JSONRenderer
+
+
+def _etag(content):
+    return quote_etag(hashlib.md5(content, usedforsecurity=False).hexdigest())
+
+
+def raw_json_response(request, data, raw_fields=None, raw_version=None):
+    """
+    JSON 응답 생성.
+
+    data: 요청마다 달라지는 부분 (일반 dict, JSONRenderer로 직렬화)
+    raw_fields: {필드명: 미리 렌더링된 JSON bytes 또는 bytes를 반환하는 함수}
+    raw_version: raw_fields 내용을 식별하는 문자열 (캐시 키 구성 요소)
+      있으면 ETag는 raw_version과 data로만 만들어, 304 응답에서는 raw_fields를 결합/해시하지 않음
+      없으면 전체 본문으로 ETag 생성
+    If-None-Match가 ETag와 일치하면 304 응답.
+    """
+    rendered = JSONRenderer().render(data)
+    etag = _etag(raw_version.encode('utf-8') + b'\n' + rendered) if raw_version is not None else None
+
+    body = None
+    if etag is None:
+        body = _combine(rendered, raw_fields)
+        etag = _etag(body)
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and (etag in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+        response = HttpResponseNotModified()
+    else:
+        if body is None:
+            body = _combine(rendered, raw_fields)
+        response = HttpResponse(body, content_type='application/json')
+
+    response.headers['ETag'] = etag
+    # 응시 상태가 포함되므로 공유 캐시 금지, 매번 재검증
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _combine(rendered, raw_fields):
+    """직렬화된 data에 미리 렌더링된 필드를 이어 붙임"""
+    if not raw_fields:
+        return rendered
+    members = b''.join(
+        b',' + JSONRenderer().render(name) + b':' + (raw() if callable(raw) else raw)
+        for name, raw in raw_fields.items()
+    )
+    return (rendered[:-1] + members + b'}') if rendered != b'{}' else (b'{' + members[1:] + b'}')
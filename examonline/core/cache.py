@@ -0,0 +1,106 @@
+"""
+Shared cache utilities.
+
+- 버전 키: 객체별 버전 번호를 Redis(CACHES['default'])에 저장, 무효화는 버전 증가로 처리
+- 로컬 LRU: 프로세스 내 메모리 캐시 계층 (Redis 역직렬화 비용 절감)
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+
+
+class LocalLRUCache:
+    """
+    프로세스 로컬 LRU 캐시.
+    키에 버전이 포함되므로 별도 무효화 없이 오래된 항목은 자연스럽게 밀려남.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return default
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def _version_key(namespace, obj_id):
+    return f'{namespace}:version:{obj_id}'
+
+
+def get_version(namespace, obj_id):
+    """
+    객체의 현재 캐시 버전 조회.
+
+    버전 키가 없으면 (최초 조회, 만료, eviction) 현재 시각 기반 값으로 초기화.
+    이전 세대의 버전 번호와 겹치지 않도록 하기 위함.
+    버전 키는 CACHE_VERSION_TIMEOUT 후 만료 (데이터 캐시보다 오래 유지).
+    """
+    key = _version_key(namespace, obj_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=settings.CACHE_VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace, obj_id):
+    """
+    캐시 버전 증가 (무효화).
+
+    즉시 증가시키고 트랜잭션 커밋 후 한 번 더 증가.
+    커밋 전에 다른 요청이 이전 데이터로 새 버전 캐시를 채우는 경우를 방지.
+    """
+    _incr_version(namespace, obj_id)
+    transaction.on_commit(lambda: _incr_version(namespace, obj_id))
+
+
+def _incr_version(namespace, obj_id):
+    key = _version_key(namespace, obj_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=settings.CACHE_VERSION_TIMEOUT)
+
+
+def get_or_build(key, builder, local_cache=None, timeout=DEFAULT_TIMEOUT):
+    """
+    캐시 조회.
+
+    로컬 LRU -> Redis -> builder() 순으로 조회하고 상위 계층을 채움.
+    key에는 get_version()으로 얻은 버전이 포함되어야 함.
+    """
+    if local_cache is not None:
+        value = local_cache.get(key)
+        if value is not None:
+            return value
+
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout)
+
+    if local_cache is not None:
+        local_cache.set(key, value)
+    return value
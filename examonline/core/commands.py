@@ -0,0 +1,42 @@
+"""
+Shared management command bases.
+
+- PollingCommand: --interval 주기로 반복 실행하는 worker 명령 (0이면 1회 실행)
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+
+class PollingCommand(BaseCommand):
+    """
+    주기 반복 worker 명령.
+    하위 클래스는 run_once()에서 1회 처리 후 처리 건수를 반환.
+
+    - 매 반복 시작 시 close_old_connections() 호출
+      (DB 재시작/failover, CONN_MAX_AGE 만료로 끊긴 연결을 버리고 재연결)
+      단, 호출자의 트랜잭션 안에서 실행된 경우(call_command 등)에는 연결을 유지
+    - drain=True: 처리 건수가 있으면 대기 없이 바로 다음 반복 (작업 큐 소비용)
+    """
+
+    interval_type = int
+    interval_help = '반복 주기 (초, 0이면 1회 실행)'
+    drain = False
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=self.interval_type, default=0, help=self.interval_help)
+
+    def run_once(self, **options):
+        raise NotImplementedError('PollingCommand 하위 클래스는 run_once()를 구현해야 합니다.')
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            if not connection.in_atomic_block:
+                close_old_connections()
+            count = self.run_once(**options)
+            if interval <= 0:
+                break
+            if not (self.drain and count):
+                time.sleep(interval)
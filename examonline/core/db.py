@@ -0,0 +1,21 @@
+"""
+Database expressions.
+PostgreSQL jsonb 연산을 ORM update()에서 사용하기 위한 표현식.
+"""
+from django.db.models import Func, JSONField
+
+
+def supports_jsonb(connection):
+    """jsonb 연산자 사용 가능 여부 (PostgreSQL)"""
+    return connection.vendor == 'postgresql'
+
+
+class JSONBConcat(Func):
+    """
+    jsonb 병합 (lhs || rhs).
+    같은 키는 rhs 값으로 덮어씀.
+    """
+
+    arg_joiner = ' || '
+    template = '(%(expressions)s)'
+    output_field = JSONField()